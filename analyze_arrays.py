@@ -0,0 +1,221 @@
+"""
+Vektorisierte Analyse der Tore und Ergebnisse über beliebig viele Ligen, Saisons und
+Spieltagsfenster.
+
+Eingabe sind Spielergebnisse im Spaltenformat von read_npz_result_columns (optional
+ergänzt um die Spalten liga und ligen, siehe ErgebnisArchiv.spalten). Alle Gruppen
+werden in einem Durchlauf mit np.bincount gezählt, statt je Spiel ein Dictionary und
+einen Counter zu aktualisieren.
+
+Der Bereich der Tor-Buckets wird aus den Daten gewählt: Der letzte Bucket fasst alle
+Toranzahlen ab der Obergrenze zusammen, die so gewählt wird, dass höchstens der Anteil
+1 - abdeckung aller Toranzahlen darüber liegt. Das Ergebnis lässt sich mit
+simulationsgewichte direkt an die Simulation übergeben.
+"""
+
+import numpy as np
+from utils import namen_array
+
+# Anteil der Toranzahlen, die einen eigenen Bucket erhalten sollen
+STANDARD_ABDECKUNG = 0.99
+
+# Spalten der Ergebnisverteilung (aus Sicht des Heimteams)
+ERGEBNISSE = ("Sieg", "Unentschieden", "Niederlage")
+
+# Gruppierbare Spalten und die Spalte mit den zugehörigen Namen
+GRUPPEN_NAMEN = {"liga": "ligen", "saison": "saisons"}
+
+
+def spalten_aus_ergebnissen(ergebnisse):
+    """
+    Bringt Ergebnisse im Format von normalize_results in das Spaltenformat.
+    Args:
+        ergebnisse (list of dict): Ergebnisse, optional mit den Schlüsseln Liga und
+        Saison (z.B. aus ErgebnisArchiv.ergebnisse).
+    Returns:
+        dict: Spalten wie bei read_npz_result_columns, zusätzlich liga und ligen.
+    """
+    teams, saisons, ligen = {}, {}, {}
+    zeilen = [
+        (
+            ligen.setdefault(e.get("Liga", ""), len(ligen)),
+            saisons.setdefault(e.get("Saison", ""), len(saisons)),
+            e["Spieltag"],
+            teams.setdefault(e["Heim"], len(teams)),
+            teams.setdefault(e["Auswaerts"], len(teams)),
+            e["Tore_Heim"],
+            e["Tore_Auswaerts"],
+        )
+        for e in ergebnisse
+    ]
+    werte = np.array(zeilen, dtype=np.int64).reshape(-1, 7)
+    return {
+        "liga": werte[:, 0].astype(np.int16),
+        "saison": werte[:, 1].astype(np.int16),
+        "spieltag": werte[:, 2].astype(np.int16),
+        "heim": werte[:, 3].astype(np.int16),
+        "auswaerts": werte[:, 4].astype(np.int16),
+        "tore_heim": werte[:, 5].astype(np.int8),
+        "tore_auswaerts": werte[:, 6].astype(np.int8),
+        "teams": namen_array(teams),
+        "saisons": namen_array(saisons),
+        "ligen": namen_array(ligen),
+    }
+
+
+def tor_obergrenze(tore, abdeckung=STANDARD_ABDECKUNG):
+    """
+    Wählt die Toranzahl des letzten Buckets aus den Daten.
+    Args:
+        tore (np.ndarray): Alle Toranzahlen (Heim- und Auswärtstore).
+        abdeckung (float): Anteil der Toranzahlen, die unterhalb der Obergrenze oder
+        genau auf ihr liegen sollen. 1.0 ergibt das beobachtete Maximum.
+    Returns:
+        int: Obergrenze; der letzte Bucket steht für "obergrenze oder mehr" Tore.
+    """
+    tore = np.asarray(tore)
+    if tore.size == 0:
+        raise ValueError("Keine Spielergebnisse für die Analyse vorhanden.")
+    if not 0 < abdeckung <= 1:
+        raise ValueError("Die Abdeckung muss zwischen 0 (exklusiv) und 1 liegen.")
+    haeufigkeiten = np.bincount(tore.astype(np.intp))
+    kumuliert = np.cumsum(haeufigkeiten) / tore.size
+    # Kleinste Toranzahl, bis zu der mindestens der Anteil abdeckung erreicht ist
+    return int(np.searchsorted(kumuliert, abdeckung - 1e-12))
+
+
+def gruppen(spalten, nach=("liga", "saison"), spieltag_fenster=None):
+    """
+    Ordnet jedem Spiel eine Gruppe zu.
+    Args:
+        spalten (dict): Ergebnisse im Spaltenformat.
+        nach (tuple): Spalten, nach denen gruppiert wird, z.B. ("liga", "saison") oder
+        () für eine einzige Gruppe. Fehlt die Spalte liga, wird sie ignoriert.
+        spieltag_fenster (list of tuple): Optionale, sich nicht überschneidende
+        Spieltagsfenster (von, bis) als zusätzliches Gruppenmerkmal. Spiele außerhalb
+        aller Fenster werden keiner Gruppe zugeordnet.
+    Returns:
+        tuple: (gruppe, schluessel) mit der Gruppe je Spiel (-1 für keine Gruppe) und
+        den Schlüsseln der Gruppen als Tupel aus Namen bzw. (von, bis).
+    """
+    anzahl = len(spalten["spieltag"])
+    merkmale, namen = [], []
+    for name in nach:
+        if name in spalten:
+            merkmale.append(spalten[name].astype(np.int64))
+            namen.append(spalten[GRUPPEN_NAMEN[name]])
+
+    gueltig = np.ones(anzahl, dtype=bool)
+    if spieltag_fenster:
+        fenster = sorted(spieltag_fenster)
+        starts = np.array([von for von, _ in fenster])
+        enden = np.array([bis for _, bis in fenster])
+        spieltage = spalten["spieltag"].astype(np.int64)
+        fenster_idx = np.searchsorted(starts, spieltage, side="right") - 1
+        gueltig = (fenster_idx >= 0) & (
+            spieltage <= enden[np.clip(fenster_idx, 0, None)]
+        )
+        merkmale.append(fenster_idx)
+        namen.append(fenster)
+
+    if not merkmale:
+        return np.zeros(anzahl, dtype=np.intp), [()]
+
+    # Alle Merkmale zu einem Code zusammenfassen, damit ein eindimensionales
+    # np.unique genügt
+    merkmale = [merkmal[gueltig] for merkmal in merkmale]
+    dimensionen = [len(liste) for liste in namen]
+    eindeutig, inverse = np.unique(
+        np.ravel_multi_index(merkmale, dimensionen), return_inverse=True
+    )
+    gruppe = np.full(anzahl, -1, dtype=np.intp)
+    gruppe[gueltig] = inverse.reshape(-1)
+    schluessel = [
+        tuple(
+            tuple(liste[wert]) if isinstance(liste, list) else str(liste[wert])
+            for liste, wert in zip(namen, zeile)
+        )
+        for zeile in zip(
+            *(idx.tolist() for idx in np.unravel_index(eindeutig, dimensionen))
+        )
+    ]
+    return gruppe, schluessel
+
+
+def analysieren(
+    spalten,
+    nach=("liga", "saison"),
+    spieltag_fenster=None,
+    max_tore=None,
+    abdeckung=STANDARD_ABDECKUNG,
+):
+    """
+    Zählt Heimtore, Auswärtstore und Ergebnisse je Gruppe in einem Durchlauf.
+    Args:
+        spalten (dict): Ergebnisse im Spaltenformat.
+        nach (tuple): Gruppierungsspalten (siehe gruppen).
+        spieltag_fenster (list of tuple): Optionale Spieltagsfenster (siehe gruppen).
+        max_tore (int): Optionale feste Obergrenze des letzten Buckets. Ohne Angabe wird
+        sie mit tor_obergrenze über alle ausgewählten Spiele bestimmt, damit alle
+        Gruppen dieselben Buckets haben.
+        abdeckung (float): Abdeckung für tor_obergrenze.
+    Returns:
+        dict: schluessel (Liste der Gruppenschlüssel), torverteilung (Liste der
+        Toranzahlen je Bucket), heimtore und auswaertstore (Häufigkeiten der Form
+        (gruppen, buckets)), ergebnisse (Häufigkeiten der Form (gruppen, 3) in der
+        Reihenfolge von ERGEBNISSE) sowie gewichte_heim und gewichte_auswaerts (relative
+        Häufigkeiten je Gruppe).
+    """
+    gruppe, schluessel = gruppen(spalten, nach, spieltag_fenster)
+    gueltig = gruppe >= 0
+    gruppe = gruppe[gueltig]
+    tore_heim = spalten["tore_heim"][gueltig].astype(np.intp)
+    tore_auswaerts = spalten["tore_auswaerts"][gueltig].astype(np.intp)
+
+    if max_tore is None:
+        max_tore = tor_obergrenze(
+            np.concatenate([tore_heim, tore_auswaerts]), abdeckung
+        )
+    buckets = max_tore + 1
+    anzahl_gruppen = len(schluessel)
+
+    def histogramm(werte, breite):
+        return np.bincount(
+            gruppe * breite + werte, minlength=anzahl_gruppen * breite
+        ).reshape(anzahl_gruppen, breite)
+
+    heimtore = histogramm(np.minimum(tore_heim, max_tore), buckets)
+    auswaertstore = histogramm(np.minimum(tore_auswaerts, max_tore), buckets)
+    ergebnisse = histogramm(1 - np.sign(tore_heim - tore_auswaerts), 3)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        gewichte_heim = heimtore / heimtore.sum(axis=1, keepdims=True)
+        gewichte_auswaerts = auswaertstore / auswaertstore.sum(axis=1, keepdims=True)
+    return {
+        "schluessel": schluessel,
+        "torverteilung": list(range(buckets)),
+        "heimtore": heimtore,
+        "auswaertstore": auswaertstore,
+        "ergebnisse": ergebnisse,
+        "gewichte_heim": gewichte_heim,
+        "gewichte_auswaerts": gewichte_auswaerts,
+    }
+
+
+def simulationsgewichte(analyse, gruppe=0):
+    """
+    Torverteilung und Gewichte einer Gruppe für die Simulation.
+    Args:
+        analyse (dict): Ergebnis von analysieren.
+        gruppe (int or tuple): Index oder Schlüssel der Gruppe.
+    Returns:
+        dict: torverteilung, torgewichte_heim und torgewichte_auswaerts, z.B. für
+        simulate_season_for_all_teams(**simulationsgewichte(analyse)).
+    """
+    if isinstance(gruppe, tuple):
+        gruppe = analyse["schluessel"].index(gruppe)
+    return {
+        "torverteilung": analyse["torverteilung"],
+        "torgewichte_heim": analyse["gewichte_heim"][gruppe].tolist(),
+        "torgewichte_auswaerts": analyse["gewichte_auswaerts"][gruppe].tolist(),
+    }
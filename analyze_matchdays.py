@@ -109,22 +109,19 @@ def print_results_separated(heimtore_counter, auswaertstore_counter, ergebnis_co
         print(f"{ergebnis:<13}: {anzahl:>3} Spiele ({prozent:.2f}%)")
 
 
-def berechne_gewichte(
-    counter,
-):  # currently hardcoded for 0-4 goals; should be dynamic based on the data
+def berechne_gewichte(counter, max_tore=4):
     """
     Berechnet die Gewichtungen für Tore basierend auf der Verteilung.
     Args:
         counter (Counter): Zählt die Anzahl der Tore pro Team.
+        max_tore (int): Toranzahl des letzten Buckets, der alle höheren Toranzahlen
+        enthält (siehe analyze_arrays.tor_obergrenze für eine Wahl aus den Daten).
     Returns:
-        list: Gewichtungen für Tore von 0 bis 4.
+        list: Gewichtungen für Tore von 0 bis max_tore.
     """
-    gewichte = [0] * 5
+    gewichte = [0] * (max_tore + 1)
     for tore, anzahl in counter.items():
-        if tore >= 4:
-            gewichte[4] += anzahl
-        else:
-            gewichte[tore] += anzahl
+        gewichte[min(tore, max_tore)] += anzahl
     gesamt = sum(gewichte)
     return [wert / gesamt for wert in gewichte]
 
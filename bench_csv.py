@@ -0,0 +1,130 @@
+"""
+Benchmark of the fixture and result CSV readers against the previous implementation
+based on ast.literal_eval.
+
+A multi-season history is simulated by repeating the rows of the given CSV files.
+"""
+
+import ast
+import csv
+import os
+import tempfile
+import time
+import tracemalloc
+import click
+from utils import (
+    extract_pairings_from_fixture_data,
+    read_csv_fixtures,
+    read_csv_result_columns,
+    read_csv_results,
+)
+
+
+def read_csv_fixtures_literal_eval(filepath):
+    """
+    Previous implementation of read_csv_fixtures.
+    """
+    fixture_data = []
+    with open(filepath, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            fixture_data.append(
+                {
+                    "Spieltag": int(row["Spieltag"]),
+                    "Paarungen": ast.literal_eval(row["Paarungen"]),
+                }
+            )
+    return extract_pairings_from_fixture_data(fixture_data)
+
+
+def read_csv_results_literal_eval(filepath):
+    """
+    Previous implementation of read_csv_results.
+    """
+    with open(filepath, encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    normalized = []
+    for row in rows:
+        for heim, auswaerts, tore_heim, tore_auswaerts in ast.literal_eval(
+            row["Ergebnisse"]
+        ):
+            normalized.append(
+                {
+                    "Spieltag": int(row["Spieltag"]),
+                    "Heim": heim,
+                    "Auswaerts": auswaerts,
+                    "Tore_Heim": int(tore_heim),
+                    "Tore_Auswaerts": int(tore_auswaerts),
+                }
+            )
+    return normalized
+
+
+def repeat_csv(source, target, times):
+    """
+    Write the rows of a CSV file several times to simulate a longer history.
+    """
+    with open(source, newline="", encoding="utf-8") as f:
+        header, *rows = list(csv.reader(f))
+    with open(target, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        for _ in range(times):
+            writer.writerows(rows)
+
+
+def measure(read, filepath, repeat):
+    """
+    Best time over several runs and peak memory of one run.
+    Returns:
+        tuple: (seconds, peak MiB, number of games).
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        games = read(filepath)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    read(filepath)
+    peak = tracemalloc.get_traced_memory()[1] / 1024**2
+    tracemalloc.stop()
+    return best, peak, len(games) if not isinstance(games, dict) else len(games["heim"])
+
+
+@click.command()
+@click.option(
+    "--results",
+    default="data/ergebnisse_spieltag_1_bis_29.csv",
+    help="Result CSV used as one season",
+)
+@click.option(
+    "--fixtures",
+    default="data/paarungen_ab_spieltag_31_2025-04-20_16-18-23.csv",
+    help="Fixture CSV used as one season",
+)
+@click.option("--seasons", default=50, help="Number of repetitions (Default: 50)")
+@click.option("--repeat", default=3, help="Runs per reader, best is reported")
+def main(results, fixtures, seasons, repeat):
+    """
+    Print load time and peak memory of old and new readers.
+    """
+    readers = [
+        ("fixtures", fixtures, "literal_eval", read_csv_fixtures_literal_eval),
+        ("fixtures", fixtures, "streaming", read_csv_fixtures),
+        ("results", results, "literal_eval", read_csv_results_literal_eval),
+        ("results", results, "streaming", read_csv_results),
+        ("results", results, "columns", read_csv_result_columns),
+    ]
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"{'file':<10}{'reader':<14}{'games':>8}{'ms':>10}{'peak MiB':>10}")
+        for name, source, label, read in readers:
+            target = os.path.join(directory, f"{name}.csv")
+            if not os.path.exists(target):
+                repeat_csv(source, target, seasons)
+            seconds, peak, games = measure(read, target, repeat)
+            print(
+                f"{name:<10}{label:<14}{games:>8}{seconds * 1000:>10.1f}{peak:>10.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
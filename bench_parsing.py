@@ -0,0 +1,111 @@
+"""
+Benchmark of the kicker.de parsers on a corpus of saved pages.
+
+The corpus is a directory of HTML files, e.g. the page cache filled by main.py
+(cache/pages). Table pages and matchday pages are recognized by their content. Each
+parser is measured with full-document parsing (the previous behaviour) and with targeted
+parsing, for every available BeautifulSoup backend.
+"""
+
+import glob
+import os
+import time
+from importlib.util import find_spec
+import click
+from scrape_league import (
+    MATCHDAY_CLASS,
+    TABLE_CLASS,
+    parse_fixtures,
+    parse_results,
+    parse_table,
+)
+
+
+def available_parsers():
+    """
+    BeautifulSoup backends that are installed.
+    """
+    parsers = ["html.parser"]
+    if find_spec("lxml") is not None:
+        parsers.append("lxml")
+    return parsers
+
+
+def load_corpus(directory):
+    """
+    Load saved pages and sort them into table and matchday pages.
+    Args:
+        directory (str): Directory with .html files.
+    Returns:
+        tuple: (table pages, matchday pages) as lists of str.
+    """
+    tables, matchdays = [], []
+    for path in sorted(glob.glob(os.path.join(directory, "*.html"))):
+        with open(path, encoding="utf-8") as file:
+            html = file.read()
+        if TABLE_CLASS in html:
+            tables.append(html)
+        elif MATCHDAY_CLASS in html:
+            matchdays.append(html)
+    return tables, matchdays
+
+
+def pages_per_second(parse, pages, parser, targeted, min_seconds):
+    """
+    Parse all pages repeatedly for at least min_seconds.
+    Returns:
+        float: Parsed pages per second.
+    """
+    parsed = 0
+    start = time.perf_counter()
+    while True:
+        for html in pages:
+            parse(html, parser=parser, targeted=targeted)
+        parsed += len(pages)
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            return parsed / elapsed
+
+
+@click.command()
+@click.option(
+    "--corpus",
+    default="cache/pages",
+    help="Directory with saved kicker.de pages (Default: cache/pages)",
+)
+@click.option(
+    "--seconds",
+    default=1.0,
+    help="Minimum measuring time per combination in seconds (Default: 1)",
+)
+def main(corpus, seconds):
+    """
+    Print pages/second for the table, fixtures and results parsers.
+    """
+    tables, matchdays = load_corpus(corpus)
+    if not tables and not matchdays:
+        raise click.ClickException(f"No kicker.de pages found in '{corpus}'.")
+    print(f"Corpus: {len(tables)} table pages, {len(matchdays)} matchday pages")
+
+    parsers = [
+        ("table", parse_table, tables),
+        ("fixtures", parse_fixtures, matchdays),
+        ("results", parse_results, matchdays),
+    ]
+    print(
+        f"{'parser':<10}{'backend':<13}{'full doc':>12}{'targeted':>12}{'speedup':>9}"
+    )
+    for name, parse, pages in parsers:
+        if not pages:
+            continue
+        for backend in available_parsers():
+            full = pages_per_second(parse, pages, backend, False, seconds)
+            targeted = pages_per_second(parse, pages, backend, True, seconds)
+            print(
+                f"{name:<10}{backend:<13}{full:>12.1f}{targeted:>12.1f}"
+                f"{targeted / full:>8.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,69 @@
+"""
+Benchmark of the cold-start time of the simulation path.
+
+Every measurement starts a fresh interpreter, so nothing is cached in sys.modules. The
+simulation-only path reads the sample CSVs from data/ and simulates 10,000 runs without
+plotting; it should stay well below the import time of pandas and matplotlib alone.
+"""
+
+import subprocess
+import sys
+import time
+import click
+
+# Target for the simulation-only path in seconds
+TARGET = 0.3
+
+SIMULATION = """
+from sim_season_all import simulate_platzierungsverteilung
+from utils import read_csv_table, read_csv_fixtures
+simulate_platzierungsverteilung(
+    read_csv_table("data/zweite_liga_tabelle_2025-04-20_16-18-22.csv"),
+    read_csv_fixtures("data/paarungen_ab_spieltag_31_2025-04-20_16-18-23.csv"),
+    runs=10_000,
+    engine="numpy",
+    seed=0,
+)
+"""
+
+CASES = [
+    ("python", "pass"),
+    ("sim_season_all", "import sim_season_all"),
+    ("simulation", SIMULATION),
+    ("results_archive", "import results_archive"),
+    ("pandas+pyplot", "import pandas, matplotlib.pyplot"),
+    ("heatmap", "import heatmap"),
+]
+
+
+def cold_start(code, repeat):
+    """
+    Best wall-clock time of running code in a fresh interpreter.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-c", code], check=True, stdout=subprocess.DEVNULL
+        )
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+@click.command()
+@click.option("--repeat", default=5, help="Runs per case, best is reported")
+def main(repeat):
+    """
+    Print the cold-start time of each case.
+    """
+    print(f"{'case':<18}{'ms':>10}")
+    times = {}
+    for name, code in CASES:
+        times[name] = cold_start(code, repeat)
+        print(f"{name:<18}{times[name] * 1000:>10.1f}")
+    status = "ok" if times["simulation"] <= TARGET else "too slow"
+    print(f"simulation target {TARGET * 1000:.0f} ms: {status}")
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,348 @@
+"""
+Headless Rendering der Heatmaps der Platzierungswahrscheinlichkeiten.
+
+Gerendert wird ohne pyplot direkt auf eine Agg-Zeichenfläche, es wird also nie ein
+Fenster geöffnet und nichts blockiert. Ein HeatmapRenderer legt je Anzahl an Teams
+einmal eine Figur mit Farbfeldern, Beschriftungen und Farbskala an und aktualisiert für
+jede weitere Heatmap nur die Daten, Texte und Farben.
+
+heatmaps_rendern verteilt viele Heatmaps auf mehrere Prozesse mit je einem eigenen
+Renderer und überspringt Heatmaps, deren Eingaben sich seit dem letzten Rendern nicht
+geändert haben. Dazu wird je Ausgabeverzeichnis ein Manifest mit einem Hash der
+Eingaben jeder Datei geführt.
+
+Aufruf als Skript rendert Heatmaps aus .npz-Dateien (siehe verteilung_speichern):
+    python heatmap.py daten/*.npz --output output --workers 4
+"""
+
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+import click
+import numpy as np
+import seaborn as sns
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from seaborn.utils import relative_luminance
+
+STANDARD_DPI = 300
+MANIFEST = "heatmaps.json"
+
+# Wird bei Änderungen am Layout erhöht, damit alle Heatmaps neu gerendert werden
+LAYOUT_VERSION = 2
+
+
+def heatmap_titel(gespielte_spieltage):
+    """
+    Titel der Heatmap nach einem Spieltag.
+    """
+    return f"Platzierungs-Wahrscheinlichkeiten nach Spieltag {gespielte_spieltage}"
+
+
+def _prozent(verteilung):
+    """
+    Wahrscheinlichkeiten (teams, plätze) als Prozentwerte (plätze, teams), gerundet wie
+    in verteilung_zu_dataframe.
+    """
+    return np.round(np.asarray(verteilung, dtype=np.float64).T * 100, 2)
+
+
+class HeatmapRenderer:
+    """
+    Rendert Heatmaps und verwendet Figuren samt Beschriftungen wieder.
+    """
+
+    def __init__(self, dpi=STANDARD_DPI):
+        """
+        Args:
+            dpi (int): Auflösung der PNG-Dateien.
+        """
+        self.dpi = dpi
+        self._figuren = {}
+
+    def _figur(self, anzahl_teams):
+        """
+        Figur für eine Anzahl an Teams, beim ersten Aufruf angelegt.
+        """
+        if anzahl_teams in self._figuren:
+            return self._figuren[anzahl_teams]
+
+        with sns.axes_style("darkgrid"), sns.plotting_context(
+            "notebook", font_scale=0.9
+        ):
+            figur = Figure(figsize=(max(12, anzahl_teams), 10))
+            FigureCanvasAgg(figur)
+            ax = figur.add_subplot()
+            felder = ax.pcolormesh(
+                np.zeros((anzahl_teams, anzahl_teams)),
+                cmap="rocket_r",
+                vmin=0,
+                vmax=100,
+                edgecolors="white",
+                linewidth=0.5,
+            )
+            ax.set_xlim(0, anzahl_teams)
+            ax.set_ylim(anzahl_teams, 0)
+            ax.grid(False)
+            mitten = np.arange(anzahl_teams) + 0.5
+            ax.set_xticks(mitten)
+            ax.set_yticks(mitten, labels=range(1, anzahl_teams + 1))
+            ax.tick_params(axis="x", labelrotation=90)
+            farbskala = figur.colorbar(felder, ax=ax)
+            farbskala.set_label("Wahrscheinlichkeit (%)")
+            farbskala.outline.set_linewidth(0)
+            texte = [
+                [
+                    ax.text(spalte, zeile, "", ha="center", va="center")
+                    for spalte in mitten
+                ]
+                for zeile in mitten
+            ]
+            titel = ax.set_title("", fontsize=16)
+            ax.set_xlabel("Team")
+            ax.set_ylabel("Platzierung")
+
+        self._figuren[anzahl_teams] = (figur, ax, felder, texte, titel)
+        return self._figuren[anzahl_teams]
+
+    def rendern(self, verteilung, teams, titel, pfad):
+        """
+        Rendert eine Heatmap in eine PNG-Datei.
+        Args:
+            verteilung (np.ndarray): Wahrscheinlichkeiten der Form (teams, plätze), z.B.
+            zaehlmatrix / runs.
+            teams (list): Teamnamen in Reihenfolge der Zeilen.
+            titel (str): Titel der Heatmap.
+            pfad (str): Zieldatei.
+        Returns:
+            Figure: Die verwendete Figur, die für dieselbe Anzahl an Teams
+            wiederverwendet wird.
+        """
+        werte = _prozent(verteilung)
+        if werte.shape != (len(teams), len(teams)):
+            raise ValueError("Die Verteilung muss die Form (teams, plätze) haben.")
+        figur, ax, felder, texte, titel_text = self._figur(len(teams))
+
+        felder.set_array(werte.ravel())
+        farben = felder.cmap(felder.norm(werte))
+        for zeile, zeilen_texte in enumerate(texte):
+            for spalte, text in enumerate(zeilen_texte):
+                text.set_text(f"{werte[zeile, spalte]:.2f}")
+                # Textfarbe wie bei seaborn: dunkel auf hellen, weiß auf dunklen Feldern
+                hell = relative_luminance(farben[zeile, spalte]) > 0.408
+                text.set_color(".15" if hell else "w")
+        ax.set_xticklabels(teams)
+        titel_text.set_text(titel)
+        figur.tight_layout()
+        figur.savefig(pfad, dpi=self.dpi)
+        return figur
+
+
+def heatmap_anzeigen(verteilung, teams, titel):
+    """
+    Zeigt eine Heatmap in einem Fenster an. Nur hierfür wird pyplot importiert.
+    Args:
+        verteilung (np.ndarray): Wahrscheinlichkeiten der Form (teams, plätze).
+        teams (list): Teamnamen in Reihenfolge der Zeilen.
+        titel (str): Titel der Heatmap.
+    """
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(max(12, len(teams)), 10))
+    sns.set(font_scale=0.9)
+    ax = sns.heatmap(
+        _prozent(verteilung),
+        annot=True,
+        fmt=".2f",
+        cmap="rocket_r",
+        linewidths=0.5,
+        vmin=0,
+        vmax=100,
+        xticklabels=teams,
+        yticklabels=range(1, len(teams) + 1),
+        cbar_kws={"label": "Wahrscheinlichkeit (%)"},
+    )
+    ax.set_title(titel, fontsize=16)
+    ax.set_xlabel("Team")
+    ax.set_ylabel("Platzierung")
+    plt.tight_layout()
+    plt.show()
+
+
+def eingabe_hash(auftrag, dpi=STANDARD_DPI):
+    """
+    Hash über alle Eingaben einer Heatmap.
+    Args:
+        auftrag (dict): Heatmap mit den Schlüsseln verteilung, teams, titel und pfad.
+        dpi (int): Auflösung.
+    Returns:
+        str: SHA-256-Hash als Hex-String.
+    """
+    inhalt = hashlib.sha256(_prozent(auftrag["verteilung"]).tobytes())
+    inhalt.update(
+        json.dumps(
+            [list(auftrag["teams"]), auftrag["titel"], dpi, LAYOUT_VERSION],
+            ensure_ascii=False,
+        ).encode("utf-8")
+    )
+    return inhalt.hexdigest()
+
+
+def _manifest_laden(verzeichnis):
+    """
+    Dateiname -> Hash der zuletzt gerenderten Heatmaps eines Verzeichnisses.
+    """
+    try:
+        with open(os.path.join(verzeichnis, MANIFEST), encoding="utf-8") as datei:
+            return json.load(datei)
+    except (OSError, ValueError):
+        return {}
+
+
+def _manifest_speichern(verzeichnis, manifest):
+    """
+    Schreibt das Manifest eines Verzeichnisses atomar.
+    """
+    ziel = os.path.join(verzeichnis, MANIFEST)
+    with open(f"{ziel}.tmp", "w", encoding="utf-8") as datei:
+        json.dump(manifest, datei, ensure_ascii=False, indent=1, sort_keys=True)
+    os.replace(f"{ziel}.tmp", ziel)
+
+
+# Renderer eines Worker-Prozesses, wird von _worker_starten angelegt
+_RENDERER = None
+
+
+def _worker_starten(dpi):
+    """
+    Legt den Renderer eines Worker-Prozesses an bzw. behält einen vorhandenen mit
+    derselben Auflösung.
+    """
+    global _RENDERER  # pylint: disable=global-statement
+    if _RENDERER is None or _RENDERER.dpi != dpi:
+        _RENDERER = HeatmapRenderer(dpi)
+
+
+def _worker_rendern(auftrag):
+    """
+    Rendert eine Heatmap mit dem Renderer des Worker-Prozesses.
+    """
+    _RENDERER.rendern(
+        auftrag["verteilung"], auftrag["teams"], auftrag["titel"], auftrag["pfad"]
+    )
+    return auftrag["pfad"]
+
+
+def heatmaps_rendern(auftraege, workers=1, dpi=STANDARD_DPI, erzwingen=False):
+    """
+    Rendert viele Heatmaps und überspringt unveränderte.
+    Args:
+        auftraege (list of dict): Heatmaps mit den Schlüsseln verteilung
+        (Wahrscheinlichkeiten der Form (teams, plätze)), teams, titel und pfad.
+        workers (int): Anzahl der Prozesse.
+        dpi (int): Auflösung der PNG-Dateien.
+        erzwingen (bool): Ob auch unveränderte Heatmaps neu gerendert werden sollen.
+    Returns:
+        list of str: Pfade der tatsächlich gerenderten Heatmaps.
+    """
+    if workers < 1:
+        raise ValueError("workers muss mindestens 1 sein.")
+
+    manifeste = {}
+    offen, hashes = [], []
+    for auftrag in auftraege:
+        verzeichnis, name = os.path.split(os.path.abspath(auftrag["pfad"]))
+        if verzeichnis not in manifeste:
+            os.makedirs(verzeichnis, exist_ok=True)
+            manifeste[verzeichnis] = _manifest_laden(verzeichnis)
+        wert = eingabe_hash(auftrag, dpi)
+        if (
+            not erzwingen
+            and manifeste[verzeichnis].get(name) == wert
+            and os.path.exists(auftrag["pfad"])
+        ):
+            continue
+        offen.append(auftrag)
+        hashes.append((verzeichnis, name, wert))
+
+    if workers == 1 or len(offen) <= 1:
+        _worker_starten(dpi)
+        gerendert = [_worker_rendern(auftrag) for auftrag in offen]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(offen)),
+            initializer=_worker_starten,
+            initargs=(dpi,),
+        ) as executor:
+            gerendert = list(
+                executor.map(
+                    _worker_rendern,
+                    offen,
+                    chunksize=max(1, len(offen) // (4 * workers)),
+                )
+            )
+
+    for verzeichnis, name, wert in hashes:
+        manifeste[verzeichnis][name] = wert
+    for verzeichnis in {verzeichnis for verzeichnis, _, _ in hashes}:
+        _manifest_speichern(verzeichnis, manifeste[verzeichnis])
+    return gerendert
+
+
+def verteilung_speichern(filepath, verteilung, teams, titel):
+    """
+    Speichert eine Verteilung als Eingabe für das Rendern per Skript.
+    Args:
+        filepath (str): Zieldatei (.npz).
+        verteilung (np.ndarray): Wahrscheinlichkeiten der Form (teams, plätze).
+        teams (list): Teamnamen in Reihenfolge der Zeilen.
+        titel (str): Titel der Heatmap.
+    """
+    np.savez(
+        filepath,
+        verteilung=np.asarray(verteilung, dtype=np.float64),
+        teams=np.array(teams, dtype=np.str_),
+        titel=np.array(titel, dtype=np.str_),
+    )
+
+
+def verteilung_laden(filepath):
+    """
+    Lädt eine mit verteilung_speichern geschriebene Verteilung.
+    Returns:
+        dict: verteilung, teams und titel.
+    """
+    with np.load(filepath, allow_pickle=False) as daten:
+        return {
+            "verteilung": daten["verteilung"],
+            "teams": daten["teams"].tolist(),
+            "titel": str(daten["titel"]),
+        }
+
+
+@click.command()
+@click.argument("eingaben", nargs=-1, required=True, type=click.Path(exists=True))
+@click.option("--output", default="output", help="Ausgabeverzeichnis (Default: output)")
+@click.option("--workers", default=1, help="Anzahl der Prozesse (Default: 1)")
+@click.option("--dpi", default=STANDARD_DPI, help="Auflösung (Default: 300)")
+@click.option("--force", is_flag=True, help="Auch unveränderte Heatmaps rendern")
+def main(eingaben, output, workers, dpi, force):
+    """
+    Rendert je .npz-Datei eine Heatmap als PNG mit gleichem Namen.
+    """
+    auftraege = []
+    for eingabe in eingaben:
+        auftrag = verteilung_laden(eingabe)
+        name = os.path.splitext(os.path.basename(eingabe))[0]
+        auftrag["pfad"] = os.path.join(output, f"{name}.png")
+        auftraege.append(auftrag)
+    gerendert = heatmaps_rendern(auftraege, workers=workers, dpi=dpi, erzwingen=force)
+    print(
+        f"{len(gerendert)} Heatmaps gerendert, "
+        f"{len(auftraege) - len(gerendert)} unverändert übersprungen."
+    )
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
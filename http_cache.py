@@ -0,0 +1,146 @@
+"""
+On-disk cache for raw kicker.de pages.
+
+Every page is stored as two files named after a hash of its path: the body and a small
+JSON file with the validators (ETag, Last-Modified), the time it was fetched and whether
+it is immutable. Pages of finished matchdays are marked immutable and are never
+requested again. Other pages are served from disk within a TTL and revalidated with a
+conditional request afterwards, so an unchanged page costs a 304 without a body.
+
+In offline mode no request is made at all and only cached pages are returned.
+"""
+
+import hashlib
+import json
+import os
+import time
+
+DEFAULT_CACHE_DIR = "cache/pages"
+DEFAULT_TTL = 300  # seconds a mutable page is served without revalidation
+
+
+class CachedPage:
+    """
+    A cached page together with its metadata.
+    """
+
+    __slots__ = ("text", "etag", "last_modified", "fetched_at", "immutable")
+
+    def __init__(
+        self, text, etag=None, last_modified=None, fetched_at=0.0, immutable=False
+    ):
+        self.text = text
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = fetched_at
+        self.immutable = immutable
+
+    def is_fresh(self, ttl):
+        """
+        Whether the page may be served without asking the server.
+        """
+        return self.immutable or time.time() - self.fetched_at < ttl
+
+    def conditional_headers(self):
+        """
+        Request headers to revalidate the page.
+        """
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class PageCache:
+    """
+    Directory of cached pages keyed by their path.
+    """
+
+    def __init__(
+        self,
+        directory: str = DEFAULT_CACHE_DIR,
+        ttl: float = DEFAULT_TTL,
+        offline: bool = False,
+    ):
+        """
+        Args:
+            directory (str): Directory the pages are stored in.
+            ttl (float): Seconds a mutable page is served without revalidation.
+            offline (bool): If True, pages are only served from the cache.
+        """
+        self.directory = directory
+        self.ttl = ttl
+        self.offline = offline
+        os.makedirs(directory, exist_ok=True)
+
+    def _files(self, path):
+        """
+        Body and metadata file of a path.
+        """
+        name = hashlib.sha256(path.encode("utf-8")).hexdigest()
+        base = os.path.join(self.directory, name)
+        return f"{base}.html", f"{base}.json"
+
+    def load(self, path: str):
+        """
+        Load a cached page.
+        Args:
+            path (str): Path relative to the base URL.
+        Returns:
+            CachedPage: The cached page, or None if it is not cached.
+        """
+        body_file, meta_file = self._files(path)
+        try:
+            with open(meta_file, encoding="utf-8") as file:
+                meta = json.load(file)
+            with open(body_file, encoding="utf-8") as file:
+                text = file.read()
+        except (OSError, ValueError):
+            return None
+        return CachedPage(
+            text,
+            meta.get("etag"),
+            meta.get("last_modified"),
+            meta.get("fetched_at", 0.0),
+            meta.get("immutable", False),
+        )
+
+    def _write(self, target, content):
+        """
+        Write a file atomically so concurrent readers never see partial content.
+        """
+        temp = f"{target}.{os.getpid()}.{id(content)}.tmp"
+        with open(temp, "w", encoding="utf-8") as file:
+            file.write(content)
+        os.replace(temp, target)
+
+    def store(self, path: str, page: CachedPage):
+        """
+        Store a page and its metadata.
+        Args:
+            path (str): Path relative to the base URL.
+            page (CachedPage): The page to store.
+        """
+        body_file, meta_file = self._files(path)
+        meta = {
+            "path": path,
+            "etag": page.etag,
+            "last_modified": page.last_modified,
+            "fetched_at": page.fetched_at,
+            "immutable": page.immutable,
+        }
+        self._write(body_file, page.text)
+        self._write(meta_file, json.dumps(meta))
+
+    def mark_immutable(self, path: str):
+        """
+        Mark a cached page as final, e.g. once all games of a matchday are finished.
+        Args:
+            path (str): Path relative to the base URL.
+        """
+        page = self.load(path)
+        if page is not None and not page.immutable:
+            page.immutable = True
+            self.store(path, page)
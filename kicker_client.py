@@ -0,0 +1,236 @@
+"""
+Pooled HTTP client for kicker.de with concurrent fetching, retries and rate limiting.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from requests.adapters import HTTPAdapter
+from http_cache import CachedPage
+
+BASE_URL = "https://www.kicker.de"
+
+HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/119.0.0.0 Safari/537.36"
+    )
+}
+
+DEFAULT_TIMEOUT = 10  # seconds for the server to respond
+DEFAULT_MAX_CONCURRENCY = 4
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.5  # seconds before the first retry, doubled for every further one
+DEFAULT_REQUESTS_PER_SECOND = 5.0
+
+# Status codes that are worth another attempt
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class RateLimiter:
+    """
+    Thread-safe limiter that spaces out requests evenly.
+    """
+
+    def __init__(self, requests_per_second):
+        """
+        Args:
+            requests_per_second (float): Maximum request rate. None or 0 disables the
+            limit.
+        """
+        self.interval = 1 / requests_per_second if requests_per_second else 0.0
+        self.next_slot = 0.0
+        self.lock = threading.Lock()
+
+    def wait(self):
+        """
+        Blocks until the next request may be sent.
+        """
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            slot = max(self.next_slot, now)
+            self.next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class KickerClient:
+    """
+    Keep-alive session that fetches pages concurrently with a bounded pool.
+    """
+
+    def __init__(
+        self,
+        base_url: str = BASE_URL,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        retries: int = DEFAULT_RETRIES,
+        backoff: float = DEFAULT_BACKOFF,
+        requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND,
+        timeout: float = DEFAULT_TIMEOUT,
+        cache=None,
+    ):
+        """
+        Args:
+            base_url (str): Scheme and host all paths are relative to. Point this at a
+            local server to test against saved pages.
+            max_concurrency (int): Maximum number of requests in flight.
+            retries (int): Additional attempts after a timeout, connection error or
+            retryable status code.
+            backoff (float): Seconds before the first retry, doubled for every further
+            one. A Retry-After header from the server takes precedence.
+            requests_per_second (float): Maximum request rate. None or 0 disables the
+            limit.
+            timeout (float): Seconds for the server to respond.
+            cache (PageCache): Optional on-disk cache for the fetched pages.
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1.")
+        self.base_url = base_url.rstrip("/")
+        self.max_concurrency = max_concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.cache = cache
+        self.rate_limiter = RateLimiter(requests_per_second)
+
+        self.session = requests.Session()
+        self.session.headers.update(HEADERS)
+        adapter = HTTPAdapter(
+            pool_connections=max_concurrency, pool_maxsize=max_concurrency
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """
+        Closes the session and its pooled connections.
+        """
+        self.session.close()
+
+    def _retry_delay(self, attempt, response=None):
+        """
+        Seconds to wait before the given retry attempt (starting at 0).
+        """
+        if response is not None:
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                return float(retry_after)
+        return self.backoff * 2**attempt
+
+    def fetch(self, path: str, label: str = None, headers: dict = None):
+        """
+        Fetch a single page, retrying transient failures.
+        Args:
+            path (str): Path relative to the base URL, e.g. "/bundesliga/tabelle".
+            label (str): Description used in error messages. Defaults to the path.
+            headers (dict): Additional request headers, e.g. for a conditional request.
+        Returns:
+            requests.Response: The response with status 200 (or 304 for a conditional
+            request), or None on failure.
+        """
+        label = label or path
+        url = f"{self.base_url}{path}"
+        for attempt in range(self.retries + 1):
+            self.rate_limiter.wait()
+            response = None
+            try:
+                response = self.session.get(url, headers=headers, timeout=self.timeout)
+                if response.status_code in (200, 304):
+                    return response
+                if response.status_code not in RETRY_STATUS:
+                    print(
+                        f"Fehler beim Laden von {label}: Status {response.status_code}"
+                    )
+                    return None
+                error = f"Status {response.status_code}"
+            except requests.exceptions.Timeout:
+                error = "Timeout"
+            except requests.exceptions.ConnectionError as e:
+                error = f"Verbindungsfehler: {e}"
+            except requests.exceptions.RequestException as e:
+                print(f"Allgemeiner Fehler bei {label}: {e}")
+                return None
+
+            if attempt < self.retries:
+                time.sleep(self._retry_delay(attempt, response))
+
+        print(
+            f"Fehler beim Laden von {label} nach {self.retries + 1} Versuchen: {error}"
+        )
+        return None
+
+    def get(self, path: str, label: str = None):
+        """
+        Fetch a single page as text, from the cache if possible.
+        Args:
+            path (str): Path relative to the base URL.
+            label (str): Description used in error messages.
+        Returns:
+            str: The page content, or None on failure.
+        """
+        if self.cache is None:
+            response = self.fetch(path, label)
+            return None if response is None else response.text
+
+        cached = self.cache.load(path)
+        if cached is not None and (
+            self.cache.offline or cached.is_fresh(self.cache.ttl)
+        ):
+            return cached.text
+        if self.cache.offline:
+            print(f"{label or path} ist nicht im Cache (Offline-Modus).")
+            return None
+
+        response = self.fetch(
+            path, label, cached.conditional_headers() if cached is not None else None
+        )
+        if response is None:
+            # Better a stale page than none at all
+            return None if cached is None else cached.text
+        if response.status_code == 304:
+            cached.fetched_at = time.time()
+            self.cache.store(path, cached)
+            return cached.text
+
+        page = CachedPage(
+            response.text,
+            response.headers.get("ETag"),
+            response.headers.get("Last-Modified"),
+            time.time(),
+        )
+        self.cache.store(path, page)
+        return page.text
+
+    def mark_final(self, path: str):
+        """
+        Mark a cached page as immutable so it is never requested again.
+        Args:
+            path (str): Path relative to the base URL.
+        """
+        if self.cache is not None:
+            self.cache.mark_immutable(path)
+
+    def get_many(self, paths, labels=None):
+        """
+        Fetch several pages concurrently, at most max_concurrency at a time.
+        Args:
+            paths (list of str): Paths relative to the base URL.
+            labels (list of str): Optional descriptions used in error messages.
+        Returns:
+            list: The page contents in the order of paths, None for failed pages.
+        """
+        labels = labels or [None] * len(paths)
+        if self.max_concurrency == 1 or len(paths) <= 1:
+            return [self.get(path, label) for path, label in zip(paths, labels)]
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+            return list(pool.map(self.get, paths, labels))
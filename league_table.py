@@ -0,0 +1,234 @@
+"""
+Kompakte Tabellendarstellung mit ganzzahligen Team-IDs.
+
+Die Tabelle wird einmal aus den eingelesenen bzw. gescrapten Zeilen aufgebaut. Alle
+Kennzahlen liegen danach als Listen mit einem Eintrag je Team-ID vor, sodass eine Kopie
+oder ein Zurücksetzen pro Simulation nur noch einige Listen-Kopien kostet.
+"""
+
+import numpy as np
+
+
+class LeagueTable:
+    """
+    Tabelle einer Liga mit Team-IDs in Tabellenreihenfolge (ID 0 = erste Zeile).
+    """
+
+    __slots__ = (
+        "teams",
+        "team_ids",
+        "spiele",
+        "siege",
+        "unentschieden",
+        "niederlagen",
+        "tore",
+        "gegentore",
+        "punkte",
+    )
+
+    KENNZAHLEN = (
+        "spiele",
+        "siege",
+        "unentschieden",
+        "niederlagen",
+        "tore",
+        "gegentore",
+        "punkte",
+    )
+
+    def __init__(
+        self,
+        teams,
+        spiele,
+        siege,
+        unentschieden,
+        niederlagen,
+        tore,
+        gegentore,
+        punkte,
+    ):
+        """
+        Args:
+            teams (list): Teamnamen in Tabellenreihenfolge.
+            spiele, siege, unentschieden, niederlagen, tore, gegentore, punkte (list):
+            Kennzahlen je Team in derselben Reihenfolge.
+        """
+        self.teams = list(teams)
+        self.team_ids = {team: i for i, team in enumerate(self.teams)}
+        if len(self.team_ids) != len(self.teams):
+            raise ValueError("Die Tabelle enthält doppelte Teamnamen.")
+        self.spiele = list(spiele)
+        self.siege = list(siege)
+        self.unentschieden = list(unentschieden)
+        self.niederlagen = list(niederlagen)
+        self.tore = list(tore)
+        self.gegentore = list(gegentore)
+        self.punkte = list(punkte)
+
+    @classmethod
+    def aus_tabelle(cls, table_raw):
+        """
+        Baut die Tabelle aus der Ausgabe von read_csv_table oder get_current_table auf.
+        Args:
+            table_raw (list of dict): Tabelle mit den Spalten Team, Spiele, Siege,
+            Unentschieden, Niederlagen, Tore ("x:y") und Punkte.
+        Returns:
+            LeagueTable: Die geparste Tabelle.
+        """
+        tore = [row["Tore"].split(":") for row in table_raw]
+        return cls(
+            teams=[row["Team"] for row in table_raw],
+            spiele=[int(row["Spiele"]) for row in table_raw],
+            siege=[int(row["Siege"]) for row in table_raw],
+            unentschieden=[int(row["Unentschieden"]) for row in table_raw],
+            niederlagen=[int(row["Niederlagen"]) for row in table_raw],
+            tore=[int(t[0]) for t in tore],
+            gegentore=[int(t[1]) for t in tore],
+            punkte=[int(row["Punkte"]) for row in table_raw],
+        )
+
+    def __len__(self):
+        return len(self.teams)
+
+    @property
+    def differenz(self):
+        """
+        list: Tordifferenz je Team.
+        """
+        return [t - g for t, g in zip(self.tore, self.gegentore)]
+
+    def team_id(self, team):
+        """
+        Liefert die ID eines Teams.
+        Args:
+            team (str): Teamname.
+        Returns:
+            int: Die Team-ID.
+        """
+        try:
+            return self.team_ids[team]
+        except KeyError:
+            raise ValueError(f"Unbekanntes Team: '{team}'") from None
+
+    def paarungen_indizes(self, fixtures):
+        """
+        Übersetzt Spielpaarungen in Team-IDs. Unbekannte Teamnamen werden abgelehnt,
+        statt wie in update_table stillschweigend übersprungen zu werden.
+        Args:
+            fixtures (list of tuples): Liste von (Heim, Auswärts)-Tupeln.
+        Returns:
+            np.ndarray: int64-Array der Form (spiele, 2) mit Heim- und Auswärts-ID.
+        """
+        unbekannt = sorted(
+            {
+                team
+                for paarung in fixtures
+                for team in paarung
+                if team not in self.team_ids
+            }
+        )
+        if unbekannt:
+            raise ValueError(
+                f"Teams aus den Spielpaarungen fehlen in der Tabelle: {unbekannt}"
+            )
+        indizes = np.array(
+            [
+                (self.team_ids[heim], self.team_ids[auswaerts])
+                for heim, auswaerts in fixtures
+            ],
+            dtype=np.int64,
+        )
+        return indizes.reshape(-1, 2)
+
+    def kopie(self):
+        """
+        Returns:
+            LeagueTable: Eine unabhängige Kopie der Tabelle.
+        """
+        neu = LeagueTable.__new__(LeagueTable)
+        neu.teams = self.teams
+        neu.team_ids = self.team_ids
+        for name in self.KENNZAHLEN:
+            setattr(neu, name, getattr(self, name)[:])
+        return neu
+
+    def zuruecksetzen(self, basis):
+        """
+        Setzt alle Kennzahlen in-place auf die Werte einer anderen Tabelle zurück.
+        Args:
+            basis (LeagueTable): Tabelle mit denselben Teams.
+        """
+        for name in self.KENNZAHLEN:
+            getattr(self, name)[:] = getattr(basis, name)
+
+    def spiel_eintragen(self, heim, auswaerts, tore_heim, tore_auswaerts):
+        """
+        Trägt ein Spielergebnis ein (wie update_table, aber über Team-IDs).
+        Args:
+            heim (int): ID des Heimteams.
+            auswaerts (int): ID des Auswärtsteams.
+            tore_heim (int): Die Tore des Heimteams.
+            tore_auswaerts (int): Die Tore des Auswärtsteams.
+        """
+        self.spiele[heim] += 1
+        self.spiele[auswaerts] += 1
+        self.tore[heim] += tore_heim
+        self.gegentore[heim] += tore_auswaerts
+        self.tore[auswaerts] += tore_auswaerts
+        self.gegentore[auswaerts] += tore_heim
+
+        if tore_heim > tore_auswaerts:
+            self.punkte[heim] += 3
+            self.siege[heim] += 1
+            self.niederlagen[auswaerts] += 1
+        elif tore_heim < tore_auswaerts:
+            self.punkte[auswaerts] += 3
+            self.siege[auswaerts] += 1
+            self.niederlagen[heim] += 1
+        else:
+            self.punkte[heim] += 1
+            self.punkte[auswaerts] += 1
+            self.unentschieden[heim] += 1
+            self.unentschieden[auswaerts] += 1
+
+    def rangfolge(self):
+        """
+        Sortiert die Teams nach Punkten, Tordifferenz und Toren. Bei Gleichstand bleibt
+        die ursprüngliche Tabellenreihenfolge erhalten.
+        Returns:
+            list: Team-IDs von Platz 1 bis zum letzten Platz.
+        """
+        punkte, tore, gegentore = self.punkte, self.tore, self.gegentore
+        return sorted(
+            range(len(self.teams)),
+            key=lambda i: (punkte[i], tore[i] - gegentore[i], tore[i]),
+            reverse=True,
+        )
+
+    def hat_gleichstand(self, rangfolge):
+        """
+        Prüft, ob zwei Teams nach Punkten, Tordifferenz und Toren gleichauf liegen.
+        Args:
+            rangfolge (list): Team-IDs wie von rangfolge() geliefert.
+        Returns:
+            bool: True, wenn benachbarte Teams identische Kennzahlen haben.
+        """
+        punkte, tore, gegentore = self.punkte, self.tore, self.gegentore
+        return any(
+            punkte[i] == punkte[j]
+            and tore[i] - gegentore[i] == tore[j] - gegentore[j]
+            and tore[i] == tore[j]
+            for i, j in zip(rangfolge, rangfolge[1:])
+        )
+
+    def als_arrays(self):
+        """
+        Returns:
+            tuple: (punkte, differenz, tore) als int64-Arrays.
+        """
+        tore = np.array(self.tore, dtype=np.int64)
+        return (
+            np.array(self.punkte, dtype=np.int64),
+            tore - np.array(self.gegentore, dtype=np.int64),
+            tore,
+        )
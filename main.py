@@ -4,10 +4,22 @@ constituting the entire process of scraping and analyzing league data to simulat
 league outcomes.
 """
 
-from scrape_league import get_current_table, get_fixtures, get_matchday_results
-from analyze_matchdays import analyze_goals_separated, berechne_gewichte
+import datetime
+from http_cache import PageCache
+from kicker_client import KickerClient
+from scrape_league import (
+    get_current_table,
+    get_matchdays,
+    fixtures_from_matchdays,
+    results_from_matchdays,
+)
+from analyze_arrays import analysieren, simulationsgewichte, spalten_aus_ergebnissen
 from utils import normalize_results, extract_pairings_from_fixture_data
-from sim_season_all import simulate_season_for_all_teams
+from sim_season_all import plot_platzierungsverteilung, simulate_platzierungsverteilung
+from sim_cache import SimulationsCache
+from sim_poisson import PoissonModell
+from sim_elo import EloBewertung, elo_pfad
+from results_archive import ErgebnisArchiv
 
 # USER INPUTS
 LEAGUE = "bundesliga"  # league name as per the kicker URL, e.g. "bundesliga"
@@ -16,6 +28,38 @@ FINAL_MATCHDAY = 34  # last matchday of the season (integer)
 SEASON = "2024-25"  # season string as per kicker URL, e.g. "2024-25"
 SIMULATION_RUNS = 1000000  # number of simulation runs (integer)
 EXPORT = True  # whether to export the resulting plot or not (boolean)
+SHOW_PLOT = True  # whether to show the resulting plot in a window (boolean)
+ENGINE = "numpy"  # simulation engine, "numpy" (vectorized), "python" or "exact"
+WORKERS = 1  # number of processes the simulation runs are split across (integer)
+SEED = None  # master seed for reproducible results (integer or None)
+TOLERANCE = None  # target precision in percentage points, e.g. 0.05 (float or None)
+USE_CACHE = True  # whether to reuse and store simulation results on disk (boolean)
+OFFLINE = False  # whether to use only previously downloaded kicker pages (boolean)
+MODEL = "realgoals"  # scoreline model, "realgoals", "poisson" or "elo" (ratings)
+TIEBREAK = True  # whether ties are broken by head-to-head results (boolean)
+USE_ARCHIVE = True  # whether to store all scraped results in a local archive (boolean)
+STORE_TABLES = False  # whether to store every simulated final table on disk (boolean)
+HISTORY_SEASONS = []  # earlier seasons added to the goal weights, e.g. ["2023-24"]
+
+
+def engine_options(engine, tiebreak, model, results):
+    """
+    Keyword arguments of simulate_platzierungsverteilung that select the engine. The
+    exact engine supports neither head-to-head tiebreaks nor team-strength models, so
+    these combinations are rejected instead of silently simulating with "numpy".
+    Args:
+        engine (str): "numpy", "python" or "exact".
+        tiebreak (bool): Whether ties are broken by head-to-head results.
+        model (str): "realgoals", "poisson" or "elo".
+        results (list of dict): Normalized results of the season so far.
+    Returns:
+        dict: engine and ergebnisse (None without tiebreak).
+    """
+    if engine == "exact" and (tiebreak or model != "realgoals"):
+        raise ValueError(
+            "ENGINE 'exact' requires TIEBREAK = False and MODEL = 'realgoals'."
+        )
+    return {"engine": engine, "ergebnisse": results if tiebreak else None}
 
 
 # Check if the inputs are valid
@@ -31,57 +75,135 @@ if not isinstance(SIMULATION_RUNS, int) or SIMULATION_RUNS < 1:
     raise ValueError("SIMULATION_RUNS must be a positive integer.")
 if not isinstance(EXPORT, bool):
     raise ValueError("EXPORT must be a boolean value.")
+if not isinstance(SHOW_PLOT, bool):
+    raise ValueError("SHOW_PLOT must be a boolean value.")
+if ENGINE not in ("numpy", "python", "exact"):
+    raise ValueError("ENGINE must be one of 'numpy', 'python' or 'exact'.")
+if not isinstance(WORKERS, int) or WORKERS < 1:
+    raise ValueError("WORKERS must be a positive integer.")
+if SEED is not None and not isinstance(SEED, int):
+    raise ValueError("SEED must be an integer or None.")
+if TOLERANCE is not None and (
+    not isinstance(TOLERANCE, (int, float)) or TOLERANCE <= 0
+):
+    raise ValueError("TOLERANCE must be a positive number or None.")
+if not isinstance(USE_CACHE, bool):
+    raise ValueError("USE_CACHE must be a boolean value.")
+if not isinstance(OFFLINE, bool):
+    raise ValueError("OFFLINE must be a boolean value.")
+if MODEL not in ("realgoals", "poisson", "elo"):
+    raise ValueError("MODEL must be one of 'realgoals', 'poisson' or 'elo'.")
+if not isinstance(STORE_TABLES, bool):
+    raise ValueError("STORE_TABLES must be a boolean value.")
+if not isinstance(USE_ARCHIVE, bool):
+    raise ValueError("USE_ARCHIVE must be a boolean value.")
+if not isinstance(HISTORY_SEASONS, list) or not all(
+    isinstance(season, str) and len(season) == 7 and season[4] == "-"
+    for season in HISTORY_SEASONS
+):
+    raise ValueError(
+        "HISTORY_SEASONS must be a list of strings in the format 'YYYY-YY'."
+    )
+if HISTORY_SEASONS and not USE_ARCHIVE:
+    raise ValueError("HISTORY_SEASONS requires USE_ARCHIVE.")
+if not isinstance(TIEBREAK, bool):
+    raise ValueError("TIEBREAK must be a boolean value.")
+engine_options(ENGINE, TIEBREAK, MODEL, None)
+
 
-# Check for warnings based on the inputs
-if SIMULATION_RUNS > 1000000:
-    print("Warning: A high number of simulation runs may take a long time to complete.")
-if PLAYED_MATCHDAYS < 10:
-    print(
-        "Warning: A low number of played matchdays may not provide a reliable simulation."
+def main():
+    """
+    Scrape the league, simulate the remaining matchdays and plot the heatmap.
+    """
+    # Check for warnings based on the inputs
+    if SIMULATION_RUNS > 1000000 and TOLERANCE is None:
+        print(
+            "Warning: A high number of simulation runs may take a long time to complete."
+        )
+    if PLAYED_MATCHDAYS < 10:
+        print(
+            "Warning: A low number of played matchdays may not provide a reliable simulation."
+        )
+
+    # Scrape all matchday pages once, reusing one pooled client for all pages.
+    # Finished matchdays are served from the page cache after the first download.
+    client = KickerClient(cache=PageCache(offline=OFFLINE))
+    matchdays = get_matchdays(
+        1, FINAL_MATCHDAY, league=LEAGUE, season=SEASON, client=client
+    )
+    results_raw = results_from_matchdays(
+        [matchday for matchday in matchdays if matchday["Spieltag"] <= PLAYED_MATCHDAYS]
     )
 
-# Scrape already played matchday results
-results_raw = get_matchday_results(
-    1, PLAYED_MATCHDAYS, league=LEAGUE, season=SEASON, export=False
-)
+    # Normalize the results
+    results = normalize_results(results_raw)
 
-# Normalize the results
-results = normalize_results(results_raw)
-
-# Analyze the results
-home_goals, away_goals, results_distribution = analyze_goals_separated(results)
-
-# Get the goal distribution and weights for home and away teams
-torverteilung = [
-    0,
-    1,
-    2,
-    3,
-    4,
-]  # Currently hardcoded, could be dynamic based on the data
-torgewichte_heim = berechne_gewichte(home_goals)
-torgewichte_auswaerts = berechne_gewichte(away_goals)
-
-# Scrape the current table and fixtures
-current_table = get_current_table(league=LEAGUE, export=False)
-fixtures_raw = get_fixtures(
-    PLAYED_MATCHDAYS + 1,
-    end_matchday=FINAL_MATCHDAY,
-    league=LEAGUE,
-    season=SEASON,
-    export=False,
-)
-fixtures = extract_pairings_from_fixture_data(fixtures_raw)
-
-# Simulate the remaining matchdays and generate the heatmap
-simulate_season_for_all_teams(
-    tabelle_path=None,
-    spiele_path=None,
-    table_raw=current_table,
-    fixtures=fixtures,
-    runs=SIMULATION_RUNS,
-    export=EXPORT,
-    torverteilung=torverteilung,
-    torgewichte_heim=torgewichte_heim,
-    torgewichte_auswaerts=torgewichte_auswaerts,
-)
+    # Archive the scraped matchdays and add earlier seasons from the archive. Only
+    # matchdays of earlier seasons that are not archived yet are downloaded.
+    analysis_results = results
+    if USE_ARCHIVE:
+        with ErgebnisArchiv() as archive:
+            archive.spieltage_importieren(LEAGUE, SEASON, matchdays)
+            for history_season in HISTORY_SEASONS:
+                archive.aktualisieren(
+                    LEAGUE, history_season, FINAL_MATCHDAY, client=client
+                )
+            if HISTORY_SEASONS:
+                analysis_results = results + archive.ergebnisse(LEAGUE, HISTORY_SEASONS)
+
+    # Get the goal distribution and weights for home and away teams. The number of goal
+    # buckets is chosen from the data.
+    analysis = analysieren(spalten_aus_ergebnissen(analysis_results), nach=())
+    goal_weights = simulationsgewichte(analysis)
+
+    # Scrape the current table and take the fixtures from the matchday pages
+    current_table = get_current_table(league=LEAGUE, export=False, client=client)
+    client.close()
+    fixtures_raw = fixtures_from_matchdays(
+        [matchday for matchday in matchdays if matchday["Spieltag"] > PLAYED_MATCHDAYS]
+    )
+    fixtures = extract_pairings_from_fixture_data(fixtures_raw)
+
+    # Build the team-strength model if one is selected
+    model = None
+    if MODEL == "poisson":
+        model = PoissonModell.anpassen(results)
+    elif MODEL == "elo":
+        # Only games that are not in the stored ratings yet are ingested
+        elo = EloBewertung.laden(elo_pfad(LEAGUE))
+        elo.ergebnisse_eintragen(results, SEASON)
+        elo.speichern(elo_pfad(LEAGUE))
+        model = elo.als_modell([row["Team"] for row in current_table])
+
+    # Simulate the remaining matchdays and generate the heatmap. Stored final tables can
+    # be opened later with sim_store.Endtabellen without simulating again. The plotting
+    # libraries are only imported if the heatmap is exported or shown.
+    tables_path = None
+    if STORE_TABLES:
+        timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        tables_path = (
+            f"output/endtabellen_{LEAGUE}_{SEASON}_nach_spieltag_{PLAYED_MATCHDAYS}_"
+            f"{timestamp}"
+        )
+    cache = SimulationsCache() if USE_CACHE else None
+    outcome = simulate_platzierungsverteilung(
+        current_table,
+        fixtures,
+        runs=SIMULATION_RUNS,
+        **goal_weights,
+        **engine_options(ENGINE, TIEBREAK, MODEL, results),
+        workers=WORKERS,
+        seed=SEED,
+        toleranz=TOLERANCE,
+        cache=cache,
+        modell=model,
+        endtabellen=tables_path,
+    )
+    if cache is not None:
+        cache.close()
+    if EXPORT or SHOW_PLOT:
+        plot_platzierungsverteilung(outcome, export=EXPORT, anzeigen=SHOW_PLOT)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,407 @@
+"""
+Lokales Archiv historischer Spielergebnisse in einer SQLite-Datei.
+
+Gespeichert werden Ligen, Saisons, Spieltage und Spiele. Der Primärschlüssel der Spiele
+beginnt mit (liga, saison, spieltag) und dient als Index für Abfragen über Saisons und
+Spieltagsfenster; zusätzliche Indizes auf Heim- und Auswärtsteam beschleunigen Abfragen
+für einzelne Teams.
+
+Der Import ist idempotent: Ein Spiel wird über (liga, saison, spieltag, heim)
+identifiziert, erneut importierte Spiele überschreiben nur geänderte Tore. Spieltage,
+deren Spiele alle beendet sind, werden als abgeschlossen markiert und beim
+inkrementellen Aktualisieren nicht erneut geladen.
+
+Die Abfragen liefern Ergebnisse im Format von normalize_results bzw. die Zähler von
+analyze_goals_separated, sodass z.B. die Torgewichte über zehn Saisons eine einzige
+Abfrage über den Index sind.
+"""
+
+import os
+import sqlite3
+from collections import Counter
+import numpy as np
+
+STANDARD_ARCHIV_PFAD = "cache/ergebnisse.sqlite"
+
+
+def _als_liste(wert):
+    """
+    Erlaubt einen einzelnen Wert oder eine Liste von Werten als Filter.
+    """
+    if wert is None or isinstance(wert, (list, tuple, set)):
+        return wert
+    return [wert]
+
+
+class ErgebnisArchiv:
+    """
+    SQLite-Archiv für Spielergebnisse mehrerer Ligen und Saisons.
+    """
+
+    def __init__(self, pfad=STANDARD_ARCHIV_PFAD):
+        """
+        Args:
+            pfad (str): Pfad zur SQLite-Datei. ":memory:" für ein flüchtiges Archiv.
+        """
+        if pfad != ":memory:" and os.path.dirname(pfad):
+            os.makedirs(os.path.dirname(pfad), exist_ok=True)
+        self.verbindung = sqlite3.connect(pfad)
+        self.verbindung.executescript("""
+            CREATE TABLE IF NOT EXISTS spieltage (
+                liga TEXT NOT NULL,
+                saison TEXT NOT NULL,
+                spieltag INTEGER NOT NULL,
+                abgeschlossen INTEGER NOT NULL,
+                PRIMARY KEY (liga, saison, spieltag)
+            );
+            CREATE TABLE IF NOT EXISTS spiele (
+                liga TEXT NOT NULL,
+                saison TEXT NOT NULL,
+                spieltag INTEGER NOT NULL,
+                heim TEXT NOT NULL,
+                auswaerts TEXT NOT NULL,
+                tore_heim INTEGER NOT NULL,
+                tore_auswaerts INTEGER NOT NULL,
+                PRIMARY KEY (liga, saison, spieltag, heim)
+            );
+            CREATE INDEX IF NOT EXISTS spiele_heim ON spiele (heim, liga, saison);
+            CREATE INDEX IF NOT EXISTS spiele_auswaerts
+                ON spiele (auswaerts, liga, saison);
+            """)
+        self.verbindung.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """
+        Schließt die Datenbankverbindung.
+        """
+        self.verbindung.close()
+
+    def importieren(self, liga, saison, ergebnisse_roh, abgeschlossen=True):
+        """
+        Importiert Ergebnisse im Format von get_matchday_results.
+        Args:
+            liga (str): Liga laut kicker-URL, z.B. "2-bundesliga".
+            saison (str): Saison, z.B. "2024-25".
+            ergebnisse_roh (list of dict): Einträge mit Spieltag und Ergebnisse
+            (Liste von (Heim, Auswärts, Tore Heim, Tore Auswärts)).
+            abgeschlossen (bool): Ob die Spieltage vollständig sind. Da
+            get_matchday_results nur beendete Spiele enthält, sollte bei laufenden
+            Spieltagen False übergeben werden.
+        Returns:
+            int: Anzahl der neuen oder geänderten Spiele.
+        """
+        neu = 0
+        for eintrag in ergebnisse_roh:
+            neu += self._spieltag_schreiben(
+                liga, saison, int(eintrag["Spieltag"]), eintrag["Ergebnisse"]
+            )
+            self._spieltag_markieren(
+                liga, saison, int(eintrag["Spieltag"]), abgeschlossen
+            )
+        self.verbindung.commit()
+        return neu
+
+    def spieltage_importieren(self, liga, saison, spieltage):
+        """
+        Importiert Spieltage im Format von get_matchdays. Ein Spieltag gilt als
+        abgeschlossen, wenn alle seine Spiele beendet sind.
+        Args:
+            liga (str): Liga laut kicker-URL.
+            saison (str): Saison, z.B. "2024-25".
+            spieltage (list of dict): Einträge mit Spieltag und Spiele.
+        Returns:
+            int: Anzahl der neuen oder geänderten Spiele.
+        """
+        # Der Scraper (requests, bs4) wird nur für den Import gebraucht, nicht für
+        # Abfragen
+        from scrape_league import STATUS_FINISHED, final_scores
+
+        neu = 0
+        for eintrag in spieltage:
+            spiele = eintrag["Spiele"]
+            spieltag = int(eintrag["Spieltag"])
+            neu += self._spieltag_schreiben(
+                liga, saison, spieltag, final_scores(spiele)
+            )
+            self._spieltag_markieren(
+                liga,
+                saison,
+                spieltag,
+                bool(spiele)
+                and all(spiel["Status"] == STATUS_FINISHED for spiel in spiele),
+            )
+        self.verbindung.commit()
+        return neu
+
+    def _spieltag_schreiben(self, liga, saison, spieltag, spiele):
+        """
+        Schreibt die Spiele eines Spieltags. Unveränderte Spiele werden nicht angefasst.
+        Returns:
+            int: Anzahl der neuen oder geänderten Spiele.
+        """
+        vorher = self.verbindung.total_changes
+        self.verbindung.executemany(
+            "INSERT INTO spiele VALUES (?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (liga, saison, spieltag, heim) DO UPDATE SET "
+            "auswaerts = excluded.auswaerts, tore_heim = excluded.tore_heim, "
+            "tore_auswaerts = excluded.tore_auswaerts "
+            "WHERE auswaerts != excluded.auswaerts "
+            "OR tore_heim != excluded.tore_heim "
+            "OR tore_auswaerts != excluded.tore_auswaerts",
+            [
+                (liga, saison, spieltag, heim, auswaerts, int(th), int(ta))
+                for heim, auswaerts, th, ta in spiele
+            ],
+        )
+        return self.verbindung.total_changes - vorher
+
+    def _spieltag_markieren(self, liga, saison, spieltag, abgeschlossen):
+        """
+        Vermerkt einen Spieltag. Ein abgeschlossener Spieltag bleibt abgeschlossen.
+        """
+        self.verbindung.execute(
+            "INSERT INTO spieltage VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (liga, saison, spieltag) DO UPDATE SET "
+            "abgeschlossen = excluded.abgeschlossen "
+            "WHERE abgeschlossen = 0 AND excluded.abgeschlossen = 1",
+            (liga, saison, spieltag, int(abgeschlossen)),
+        )
+
+    def fehlende_spieltage(self, liga, saison, bis_spieltag, von_spieltag=1):
+        """
+        Spieltage eines Fensters, die noch nicht abgeschlossen im Archiv liegen.
+        Args:
+            liga (str): Liga laut kicker-URL.
+            saison (str): Saison, z.B. "2024-25".
+            bis_spieltag (int): Letzter Spieltag des Fensters.
+            von_spieltag (int): Erster Spieltag des Fensters.
+        Returns:
+            list of int: Aufsteigend sortierte Spieltage.
+        """
+        vorhanden = {
+            zeile[0]
+            for zeile in self.verbindung.execute(
+                "SELECT spieltag FROM spieltage WHERE liga = ? AND saison = ? "
+                "AND spieltag BETWEEN ? AND ? AND abgeschlossen = 1",
+                (liga, saison, von_spieltag, bis_spieltag),
+            )
+        }
+        return [
+            spieltag
+            for spieltag in range(von_spieltag, bis_spieltag + 1)
+            if spieltag not in vorhanden
+        ]
+
+    def aktualisieren(self, liga, saison, bis_spieltag, client=None):
+        """
+        Lädt nur die Spieltage von kicker.de, die noch nicht abgeschlossen sind, und
+        importiert sie. Zusammenhängende Spieltage werden gemeinsam geladen.
+        Args:
+            liga (str): Liga laut kicker-URL.
+            saison (str): Saison, z.B. "2024-25".
+            bis_spieltag (int): Letzter zu archivierender Spieltag.
+            client (KickerClient): Optionaler Client für Session, Limits und Cache.
+        Returns:
+            int: Anzahl der neuen oder geänderten Spiele.
+        """
+        from scrape_league import get_matchdays
+
+        fehlend = self.fehlende_spieltage(liga, saison, bis_spieltag)
+        bereiche = []
+        for spieltag in fehlend:
+            if bereiche and bereiche[-1][1] == spieltag - 1:
+                bereiche[-1][1] = spieltag
+            else:
+                bereiche.append([spieltag, spieltag])
+        neu = 0
+        for von, bis in bereiche:
+            spieltage = get_matchdays(
+                von, bis, league=liga, season=saison, client=client
+            )
+            neu += self.spieltage_importieren(liga, saison, spieltage)
+        return neu
+
+    def _filter(self, ligen, saisons, von_spieltag, bis_spieltag, team):
+        """
+        WHERE-Klausel und Parameter für die Abfragen.
+        """
+        bedingungen, parameter = [], []
+        for spalte, werte in (("liga", ligen), ("saison", saisons)):
+            werte = _als_liste(werte)
+            if werte is not None:
+                bedingungen.append(f"{spalte} IN ({', '.join('?' * len(werte))})")
+                parameter.extend(werte)
+        if von_spieltag is not None:
+            bedingungen.append("spieltag >= ?")
+            parameter.append(von_spieltag)
+        if bis_spieltag is not None:
+            bedingungen.append("spieltag <= ?")
+            parameter.append(bis_spieltag)
+        if team is not None:
+            bedingungen.append("(heim = ? OR auswaerts = ?)")
+            parameter.extend([team, team])
+        klausel = f" WHERE {' AND '.join(bedingungen)}" if bedingungen else ""
+        return klausel, parameter
+
+    def ergebnisse(
+        self,
+        ligen=None,
+        saisons=None,
+        von_spieltag=None,
+        bis_spieltag=None,
+        team=None,
+    ):
+        """
+        Liefert archivierte Ergebnisse, z.B. für PoissonModell.anpassen oder
+        EloBewertung.ergebnisse_eintragen.
+        Args:
+            ligen (str or list): Optionale Liga oder Ligen.
+            saisons (str or list): Optionale Saison oder Saisons.
+            von_spieltag (int): Optionaler erster Spieltag je Saison.
+            bis_spieltag (int): Optionaler letzter Spieltag je Saison.
+            team (str): Optional nur Spiele dieses Teams.
+        Returns:
+            list of dict: Ergebnisse im Format von normalize_results, ergänzt um Liga und
+            Saison, sortiert nach Liga, Saison und Spieltag.
+        """
+        klausel, parameter = self._filter(
+            ligen, saisons, von_spieltag, bis_spieltag, team
+        )
+        zeilen = self.verbindung.execute(
+            "SELECT liga, saison, spieltag, heim, auswaerts, tore_heim, tore_auswaerts "
+            f"FROM spiele{klausel} ORDER BY liga, saison, spieltag, rowid",
+            parameter,
+        )
+        return [
+            {
+                "Liga": liga,
+                "Saison": saison,
+                "Spieltag": spieltag,
+                "Heim": heim,
+                "Auswaerts": auswaerts,
+                "Tore_Heim": tore_heim,
+                "Tore_Auswaerts": tore_auswaerts,
+            }
+            for liga, saison, spieltag, heim, auswaerts, tore_heim, tore_auswaerts in (
+                zeilen
+            )
+        ]
+
+    def spalten(
+        self,
+        ligen=None,
+        saisons=None,
+        von_spieltag=None,
+        bis_spieltag=None,
+        team=None,
+    ):
+        """
+        Liefert archivierte Ergebnisse im Spaltenformat, z.B. für analyze_arrays.
+        Args:
+            Wie ergebnisse.
+        Returns:
+            dict: Spalten wie bei read_npz_result_columns, zusätzlich liga und ligen.
+            Namen werden alphabetisch nummeriert.
+        """
+        klausel, parameter = self._filter(
+            ligen, saisons, von_spieltag, bis_spieltag, team
+        )
+        zeilen = self.verbindung.execute(
+            "SELECT liga, saison, spieltag, heim, auswaerts, tore_heim, tore_auswaerts "
+            f"FROM spiele{klausel} ORDER BY liga, saison, spieltag, rowid",
+            parameter,
+        ).fetchall()
+        liga, saison, spieltag, heim, auswaerts, tore_heim, tore_auswaerts = (
+            zip(*zeilen) if zeilen else ((),) * 7
+        )
+        ligen_namen, liga_ids = np.unique(
+            np.array(liga, dtype=np.str_), return_inverse=True
+        )
+        saison_namen, saison_ids = np.unique(
+            np.array(saison, dtype=np.str_), return_inverse=True
+        )
+        teams, team_ids = np.unique(
+            np.array(heim + auswaerts, dtype=np.str_), return_inverse=True
+        )
+        team_ids = team_ids.reshape(2, -1).astype(np.int16)
+        return {
+            "liga": liga_ids.reshape(-1).astype(np.int16),
+            "saison": saison_ids.reshape(-1).astype(np.int16),
+            "spieltag": np.array(spieltag, dtype=np.int16),
+            "heim": team_ids[0],
+            "auswaerts": team_ids[1],
+            "tore_heim": np.array(tore_heim, dtype=np.int8),
+            "tore_auswaerts": np.array(tore_auswaerts, dtype=np.int8),
+            "teams": teams,
+            "saisons": saison_namen,
+            "ligen": ligen_namen,
+        }
+
+    def torhaeufigkeiten(
+        self,
+        ligen=None,
+        saisons=None,
+        von_spieltag=None,
+        bis_spieltag=None,
+        team=None,
+    ):
+        """
+        Zählt Heimtore, Auswärtstore und Ergebnisse in der Datenbank, ohne die Spiele
+        einzeln zu laden.
+        Args:
+            Wie ergebnisse.
+        Returns:
+            tuple: (heimtore_counter, auswaertstore_counter, ergebnis_counter) wie bei
+            analyze_goals_separated, z.B. als Eingabe für berechne_gewichte.
+        """
+        klausel, parameter = self._filter(
+            ligen, saisons, von_spieltag, bis_spieltag, team
+        )
+        heimtore, auswaertstore, ergebnis = Counter(), Counter(), Counter()
+        for tore_heim, tore_auswaerts, anzahl in self.verbindung.execute(
+            "SELECT tore_heim, tore_auswaerts, COUNT(*) "
+            f"FROM spiele{klausel} GROUP BY tore_heim, tore_auswaerts",
+            parameter,
+        ):
+            heimtore[tore_heim] += anzahl
+            auswaertstore[tore_auswaerts] += anzahl
+            if tore_heim > tore_auswaerts:
+                ergebnis["Sieg"] += anzahl
+            elif tore_heim < tore_auswaerts:
+                ergebnis["Niederlage"] += anzahl
+            else:
+                ergebnis["Unentschieden"] += anzahl
+        return heimtore, auswaertstore, ergebnis
+
+    def ligen(self):
+        """
+        Returns:
+            list of str: Alle Ligen im Archiv.
+        """
+        return [
+            zeile[0]
+            for zeile in self.verbindung.execute(
+                "SELECT DISTINCT liga FROM spieltage ORDER BY liga"
+            )
+        ]
+
+    def saisons(self, liga):
+        """
+        Args:
+            liga (str): Liga laut kicker-URL.
+        Returns:
+            list of str: Alle Saisons der Liga im Archiv, aufsteigend.
+        """
+        return [
+            zeile[0]
+            for zeile in self.verbindung.execute(
+                "SELECT DISTINCT saison FROM spieltage WHERE liga = ? ORDER BY saison",
+                (liga,),
+            )
+        ]
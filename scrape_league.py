@@ -3,66 +3,119 @@ Scrape data such as the current table, remaining fixtures, and matchday results
 """
 
 import re
-import requests
-from bs4 import BeautifulSoup
+from importlib.util import find_spec
+from bs4 import BeautifulSoup, FeatureNotFound
+from kicker_client import KickerClient
 from utils import export_data
 
-BASE_URL = "https://www.kicker.de"
+# lxml parses several times faster than the built-in parser but is optional
+DEFAULT_PARSER = "lxml" if find_spec("lxml") is not None else "html.parser"
 
+TABLE_CLASS = (
+    "kick__table kick__table--ranking kick__table--alternate kick__table--resptabelle"
+)
+MATCHDAY_CLASS = "kick__data-grid__main"
 
-def get_current_table(league: str = "2-bundesliga", export: bool = False):
+# Status of a game on a matchday page
+STATUS_SCHEDULED = "geplant"
+STATUS_LIVE = "live"
+STATUS_FINISHED = "beendet"
+
+
+def fetch_pages(paths, labels, client: KickerClient = None):
     """
-    Scrape a current table from kicker.de for a given league.
+    Fetch pages with the given client, or with a temporary one if none is given.
     Args:
-        league (str): The league to scrape. Naming according to the kicker url.
-        Default is "2-bundesliga".
-        export (bool): If True, export the data to a CSV file.
+        paths (list of str): Paths relative to the kicker base URL.
+        labels (list of str): Descriptions used in error messages.
+        client (KickerClient): Optional client whose session and limits are reused.
     Returns:
-        list: A list of dictionaries containing the table data.
+        list: The page contents in the order of paths, None for failed pages.
+    """
+    if client is not None:
+        return client.get_many(paths, labels)
+    with KickerClient() as own_client:
+        return own_client.get_many(paths, labels)
+
+
+def matchday_path(league: str, season: str, matchday: int):
+    """
+    Path of a matchday page relative to the kicker base URL.
+    """
+    return f"/{league}/spieltag/{season}/{matchday}"
+
+
+def make_soup(html: str, parser: str = None):
+    """
+    Parse HTML with the given backend, falling back to the built-in parser.
+    Args:
+        html (str): The HTML to parse.
+        parser (str): BeautifulSoup backend, e.g. "lxml". Defaults to DEFAULT_PARSER.
+    Returns:
+        BeautifulSoup: The parsed document.
     """
-    url = f"{BASE_URL}/{league}/tabelle"
-    headers = {
-        "User-Agent": (
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/119.0.0.0 Safari/537.36"
-        )
-    }
     try:
-        res = requests.get(
-            url, headers=headers, timeout=10
-        )  # 10s for the server to respond
-        if res.status_code != 200:
-            print(f"Fehler beim Laden der Tabelle: Status {res.status_code}")
-            return []
-    except requests.exceptions.Timeout:
-        print("Timeout beim Laden der Tabelle")
-        return []
-    except requests.exceptions.RequestException as e:
-        print(f"Allgemeiner Fehler beim Laden der Tabelle: {e}")
-        return []
+        return BeautifulSoup(html, parser or DEFAULT_PARSER)
+    except FeatureNotFound:
+        return BeautifulSoup(html, "html.parser")
 
-    soup = BeautifulSoup(res.text, "html.parser")
 
-    table_data = []
-    table = soup.find(
-        "table",
-        class_="kick__table kick__table--ranking kick__table--alternate kick__table--resptabelle",
-    )
-    if not table:
-        print("Table not found")
-        return table_data
+def find_region(
+    html: str, tag: str, css_class: str, parser: str = None, targeted: bool = True
+):
+    """
+    Find the element holding the data of a page without parsing the whole document.
+    The element is cut out of the raw HTML first, so only a small part of the page
+    (without head, scripts and ads) is parsed. If that fails, the whole document is
+    parsed as before.
+    Args:
+        html (str): The page.
+        tag (str): Tag name of the element, e.g. "main".
+        css_class (str): Exact class attribute of the element.
+        parser (str): BeautifulSoup backend. Defaults to DEFAULT_PARSER.
+        targeted (bool): If False, always parse the whole document.
+    Returns:
+        bs4.element.Tag: The element, or None if the page does not contain it.
+    """
+    if targeted:
+        start = re.search(rf'<{tag}\b[^>]*class="{re.escape(css_class)}"', html)
+        end = html.find(f"</{tag}>", start.end()) if start else -1
+        if end != -1:
+            region = make_soup(html[start.start() : end + len(tag) + 3], parser)
+            element = region.find(tag, class_=css_class)
+            if element is not None:
+                return element
+    return make_soup(html, parser).find(tag, class_=css_class)
+
+
+def extract_cell_text(td):
+    """
+    Text of a table cell, preferring the desktop version if there is one.
+    """
+    # Prüfe, ob eine Desktop-Version existiert
+    desktop_span = td.find("span", class_="kick__table--show-desktop")
+    if desktop_span:
+        return desktop_span.get_text(strip=True)
+    return td.get_text(strip=True)
 
-    rows = table.select("tbody tr")
 
-    def extract_cell_text(td):
-        # Prüfe, ob eine Desktop-Version existiert
-        desktop_span = td.find("span", class_="kick__table--show-desktop")
-        if desktop_span:
-            return desktop_span.get_text(strip=True)
-        return td.get_text(strip=True)
+def parse_table(html: str, parser: str = None, targeted: bool = True):
+    """
+    Parse the ranking table of a kicker.de table page.
+    Args:
+        html (str): The page.
+        parser (str): BeautifulSoup backend. Defaults to DEFAULT_PARSER.
+        targeted (bool): If False, parse the whole document instead of the table only.
+    Returns:
+        list: A list of dictionaries containing the table data, or None if the page
+        has no table.
+    """
+    table = find_region(html, "table", TABLE_CLASS, parser, targeted)
+    if not table:
+        return None
 
-    for row in rows:
+    table_data = []
+    for row in table.select("tbody tr"):
         cols = row.find_all("td")
         if not cols or len(cols) < 10:
             continue  # Skipp Header-Zeilen oder unvollständige Einträge
@@ -98,93 +151,258 @@ def get_current_table(league: str = "2-bundesliga", export: bool = False):
             print(f"Fehler beim Parsen einer Zeile: {e}")
             continue
 
+    return table_data
+
+
+def game_status(cell, scores):
+    """
+    Status of a game cell: scheduled without score, live while a live marker is
+    shown, finished otherwise.
+    """
+    if len(scores) < 2:
+        return STATUS_SCHEDULED
+    if cell.find(class_=lambda classes: classes and "--live" in classes):
+        return STATUS_LIVE
+    return STATUS_FINISHED
+
+
+def parse_matchday(html: str, parser: str = None, targeted: bool = True):
+    """
+    Parse pairings, scores and status of all games of a kicker.de matchday page in
+    one pass.
+    Args:
+        html (str): The page.
+        parser (str): BeautifulSoup backend. Defaults to DEFAULT_PARSER.
+        targeted (bool): If False, parse the whole document instead of the game list.
+    Returns:
+        list: One dictionary per game with the keys Heim, Auswaerts, Tore_Heim,
+        Tore_Auswaerts (str, None while scheduled) and Status, or None if the page
+        has no game list.
+    """
+    main_section = find_region(html, "main", MATCHDAY_CLASS, parser, targeted)
+    if not main_section:
+        return None
+
+    games = []
+    match_blocks = main_section.find_all(
+        "div", class_="kick__v100-gameList kick__module-margin"
+    )
+    for block in match_blocks:
+        for cell in block.find_all(
+            "div", class_="kick__v100-gameList__gameRow__gameCell"
+        ):
+            team_tags = cell.find_all("a", class_="kick__v100-gameCell__team")
+            if len(team_tags) != 2:
+                continue
+            team1 = team_tags[0].find("div", class_="kick__v100-gameCell__team__name")
+            team2 = team_tags[1].find("div", class_="kick__v100-gameCell__team__name")
+            if not (team1 and team2):
+                continue
+            scores = cell.find_all(
+                "div", class_="kick__v100-scoreBoard__scoreHolder__score"
+            )
+            status = game_status(cell, scores)
+            games.append(
+                {
+                    "Heim": team1.get_text(strip=True),
+                    "Auswaerts": team2.get_text(strip=True),
+                    "Tore_Heim": (
+                        None
+                        if status == STATUS_SCHEDULED
+                        else scores[0].get_text(strip=True)
+                    ),
+                    "Tore_Auswaerts": (
+                        None
+                        if status == STATUS_SCHEDULED
+                        else scores[1].get_text(strip=True)
+                    ),
+                    "Status": status,
+                }
+            )
+    return games
+
+
+def parse_fixtures(html: str, parser: str = None, targeted: bool = True):
+    """
+    Parse the pairings of a kicker.de matchday page.
+    Args:
+        html (str): The page.
+        parser (str): BeautifulSoup backend. Defaults to DEFAULT_PARSER.
+        targeted (bool): If False, parse the whole document instead of the game list.
+    Returns:
+        list: [Heim, Auswärts] per game, or None if the page has no game list.
+    """
+    games = parse_matchday(html, parser, targeted)
+    if games is None:
+        return None
+    return pairings(games)
+
+
+def parse_results(html: str, parser: str = None, targeted: bool = True):
+    """
+    Parse the scores of a kicker.de matchday page.
+    Args:
+        html (str): The page.
+        parser (str): BeautifulSoup backend. Defaults to DEFAULT_PARSER.
+        targeted (bool): If False, parse the whole document instead of the game list.
+    Returns:
+        tuple: ([Heim, Auswärts, Tore Heim, Tore Auswärts] per finished game, number
+        of games on the page), or None if the page has no game list.
+    """
+    games = parse_matchday(html, parser, targeted)
+    if games is None:
+        return None
+    return final_scores(games), len(games)
+
+
+def pairings(games):
+    """
+    [Heim, Auswärts] of every game as returned by parse_matchday.
+    """
+    return [[game["Heim"], game["Auswaerts"]] for game in games]
+
+
+def final_scores(games):
+    """
+    [Heim, Auswärts, Tore Heim, Tore Auswärts] of every finished game as returned by
+    parse_matchday.
+    """
+    return [
+        [game["Heim"], game["Auswaerts"], game["Tore_Heim"], game["Tore_Auswaerts"]]
+        for game in games
+        if game["Status"] == STATUS_FINISHED
+    ]
+
+
+def get_current_table(
+    league: str = "2-bundesliga", export: bool = False, client: KickerClient = None
+):
+    """
+    Scrape a current table from kicker.de for a given league.
+    Args:
+        league (str): The league to scrape. Naming according to the kicker url.
+        Default is "2-bundesliga".
+        export (bool): If True, export the data to a CSV file.
+        client (KickerClient): Optional client to reuse its session and limits.
+    Returns:
+        list: A list of dictionaries containing the table data.
+    """
+    (html,) = fetch_pages([f"/{league}/tabelle"], ["der Tabelle"], client)
+    if html is None:
+        return []
+
+    table_data = parse_table(html)
+    if table_data is None:
+        print("Table not found")
+        return []
+
     if export:
         export_data(table_data, f"{league}_tabelle")
 
     return table_data
 
 
-def get_fixtures(
+def get_matchdays(
     start_matchday: int,
-    end_matchday: int = 34,
+    end_matchday: int,
     league: str = "2-bundesliga",
     season: str = "2024-25",
-    export: bool = False,
+    client: KickerClient = None,
 ):
     """
-    Scrape fixtures from kicker.de for a given league.
+    Scrape pairings, scores and status of a range of matchdays, fetching and parsing
+    every matchday page exactly once.
     Args:
         start_matchday (int): The matchday to start scraping from.
-        end_matchday (int): The last matchday to scrape. Default is 34.
+        end_matchday (int): The matchday to end scraping at.
         league (str): The league to scrape. Naming according to the kicker url.
         Default is "2-bundesliga".
         season (str): The season to scrape. Default is "2024-25".
-        export (bool): If True, export the data to a CSV file.
+        client (KickerClient): Optional client to reuse its session and limits. The
+        matchdays are fetched concurrently.
     Returns:
-        list: A list of dictionaries containing the fixtures data.
+        list: A list of dictionaries with the keys Spieltag and Spiele (see
+        parse_matchday). Matchdays that could not be loaded are skipped.
     """
+    matchdays = []
 
-    fixtures = []
-
-    for matchday in range(start_matchday, end_matchday + 1):
-        # Adjust the URL for the current season
-        url = f"{BASE_URL}/{league}/spieltag/{season}/{matchday}"
-        headers = {
-            "User-Agent": (
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/119.0.0.0 Safari/537.36"
-            )
-        }
+    numbers = list(range(start_matchday, end_matchday + 1))
+    pages = fetch_pages(
+        [matchday_path(league, season, matchday) for matchday in numbers],
+        [f"Spieltag {matchday}" for matchday in numbers],
+        client,
+    )
 
-        try:
-            res = requests.get(
-                url, headers=headers, timeout=10
-            )  # 10s for the server to respond
-            if res.status_code != 200:
-                print(
-                    f"Fehler beim Laden von Spieltag {matchday}: Status {res.status_code}"
-                )
-                continue
-        except requests.exceptions.Timeout:
-            print(f"Timeout beim Laden von Spieltag {matchday}")
-            continue
-        except requests.exceptions.RequestException as e:
-            print(f"Allgemeiner Fehler bei Spieltag {matchday}: {e}")
+    for matchday, html in zip(numbers, pages):
+        if html is None:
             continue
 
-        soup = BeautifulSoup(res.text, "html.parser")
-        main_section = soup.find("main", class_="kick__data-grid__main")
-        if not main_section:
+        games = parse_matchday(html)
+        if games is None:
             print(f"Keine Spieldaten für Spieltag {matchday} gefunden.")
             continue
 
-        match_blocks = main_section.find_all(
-            "div", class_="kick__v100-gameList kick__module-margin"
-        )
-        matchday_fixtures = []
+        # A matchday whose games are all finished never changes again
+        if (
+            client is not None
+            and games
+            and all(game["Status"] == STATUS_FINISHED for game in games)
+        ):
+            client.mark_final(matchday_path(league, season, matchday))
 
-        for block in match_blocks:
-            game_cells = block.find_all(
-                "div", class_="kick__v100-gameList__gameRow__gameCell"
-            )
-            for cell in game_cells:
-                team_tags = cell.find_all("a", class_="kick__v100-gameCell__team")
-                if len(team_tags) == 2:
-                    team1 = team_tags[0].find(
-                        "div", class_="kick__v100-gameCell__team__name"
-                    )
-                    team2 = team_tags[1].find(
-                        "div", class_="kick__v100-gameCell__team__name"
-                    )
-                    if team1 and team2:
-                        team_names = [
-                            team1.get_text(strip=True),
-                            team2.get_text(strip=True),
-                        ]
-                        matchday_fixtures.append(team_names)
-
-        fixtures.append({"Spieltag": matchday, "Paarungen": matchday_fixtures})
+        matchdays.append({"Spieltag": matchday, "Spiele": games})
+
+    return matchdays
+
+
+def fixtures_from_matchdays(matchdays):
+    """
+    View of get_matchdays in the format of get_fixtures.
+    """
+    return [
+        {"Spieltag": matchday["Spieltag"], "Paarungen": pairings(matchday["Spiele"])}
+        for matchday in matchdays
+    ]
+
+
+def results_from_matchdays(matchdays):
+    """
+    View of get_matchdays in the format of get_matchday_results.
+    """
+    return [
+        {
+            "Spieltag": matchday["Spieltag"],
+            "Ergebnisse": final_scores(matchday["Spiele"]),
+        }
+        for matchday in matchdays
+    ]
+
+
+def get_fixtures(
+    start_matchday: int,
+    end_matchday: int = 34,
+    league: str = "2-bundesliga",
+    season: str = "2024-25",
+    export: bool = False,
+    client: KickerClient = None,
+):
+    """
+    Scrape fixtures from kicker.de for a given league.
+    Args:
+        start_matchday (int): The matchday to start scraping from.
+        end_matchday (int): The last matchday to scrape. Default is 34.
+        league (str): The league to scrape. Naming according to the kicker url.
+        Default is "2-bundesliga".
+        season (str): The season to scrape. Default is "2024-25".
+        export (bool): If True, export the data to a CSV file.
+        client (KickerClient): Optional client to reuse its session and limits. The
+        matchdays are fetched concurrently.
+    Returns:
+        list: A list of dictionaries containing the fixtures data.
+    """
+    fixtures = fixtures_from_matchdays(
+        get_matchdays(start_matchday, end_matchday, league, season, client)
+    )
 
     if export:
         export_data(
@@ -201,6 +419,7 @@ def get_matchday_results(
     league: str = "2-bundesliga",
     season: str = "2024-25",
     export: bool = False,
+    client: KickerClient = None,
 ):
     """
     Scrape the matchday results from kicker.de for a given league.
@@ -211,76 +430,15 @@ def get_matchday_results(
         Default is "2-bundesliga".
         season (str): The season to scrape. Default is "2024-25".
         export (bool): If True, export the data to a CSV file.
+        client (KickerClient): Optional client to reuse its session and limits. The
+        matchdays are fetched concurrently.
     Returns:
-        list: A list of dictionaries containing the matchday results data.
+        list: A list of dictionaries containing the matchday results data. Only
+        finished games are included.
     """
-
-    results = []
-
-    for matchday in range(start_matchday, end_matchday + 1):
-        url = f"{BASE_URL}/{league}/spieltag/{season}/{matchday}"
-        headers = {
-            "User-Agent": (
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/119.0.0.0 Safari/537.36"
-            )
-        }
-
-        try:
-            res = requests.get(
-                url, headers=headers, timeout=10
-            )  # 10s for the server to respond
-            if res.status_code != 200:
-                print(
-                    f"Fehler beim Laden von Spieltag {matchday}: Status {res.status_code}"
-                )
-                continue
-        except requests.exceptions.Timeout:
-            print(f"Timeout beim Laden von Spieltag {matchday}")
-            continue
-        except requests.exceptions.RequestException as e:
-            print(f"Allgemeiner Fehler bei Spieltag {matchday}: {e}")
-            continue
-
-        soup = BeautifulSoup(res.text, "html.parser")
-        main_section = soup.find("main", class_="kick__data-grid__main")
-        if not main_section:
-            print(f"Keine Spieldaten für Spieltag {matchday} gefunden.")
-            continue
-
-        match_blocks = main_section.find_all(
-            "div", class_="kick__v100-gameList kick__module-margin"
-        )
-        matchday_results = []
-
-        for block in match_blocks:
-            game_cells = block.find_all(
-                "div", class_="kick__v100-gameList__gameRow__gameCell"
-            )
-            for cell in game_cells:
-                team_tags = cell.find_all("a", class_="kick__v100-gameCell__team")
-                scores = cell.find_all(
-                    "div", class_="kick__v100-scoreBoard__scoreHolder__score"
-                )
-
-                if len(team_tags) == 2 and len(scores) >= 2:
-                    team1 = team_tags[0].find(
-                        "div", class_="kick__v100-gameCell__team__name"
-                    )
-                    team2 = team_tags[1].find(
-                        "div", class_="kick__v100-gameCell__team__name"
-                    )
-                    if team1 and team2:
-                        game_results = [
-                            team1.get_text(strip=True),
-                            team2.get_text(strip=True),
-                            scores[0].get_text(strip=True),
-                            scores[1].get_text(strip=True),
-                        ]
-                        matchday_results.append(game_results)
-
-        results.append({"Spieltag": matchday, "Ergebnisse": matchday_results})
+    results = results_from_matchdays(
+        get_matchdays(start_matchday, end_matchday, league, season, client)
+    )
 
     if export:
         export_data(
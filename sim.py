@@ -2,7 +2,30 @@
 Simulationsmodul für die Simulation von Fußballspielen und Aktualisierung der Tabelle.
 """
 
+import bisect
+import functools
+import itertools
 import random
+import numpy as np
+
+# Gewichtete Wahrscheinlichkeiten für Tore (z.B. 1 Tor häufiger als 3+ Tore)
+STANDARD_TORVERTEILUNG = [0, 1, 2, 3, 4]  # mögliche Tore
+# Gewichtungen für Heimtore
+STANDARD_TORGEWICHTE_HEIM = [
+    54 / 261,
+    87 / 261,
+    61 / 261,
+    40 / 261,
+    19 / 261,
+]
+# Gewichtungen für Auswärtstore
+STANDARD_TORGEWICHTE_AUSWAERTS = [
+    76 / 261,
+    80 / 261,
+    61 / 261,
+    25 / 261,
+    19 / 261,
+]
 
 
 def simulate_game_randint(
@@ -26,62 +49,188 @@ def simulate_game_randint(
     )
 
 
+class AliasTabelle:
+    """
+    Alias-Tabelle (Verfahren nach Vose) für das Ziehen aus einer diskreten Verteilung
+    in konstanter Zeit je Ziehung.
+    """
+
+    __slots__ = ("wahrscheinlichkeit", "alias")
+
+    def __init__(self, gewichte):
+        """
+        Args:
+            gewichte (list): Nicht-negative Gewichte der Werte 0..n-1.
+        """
+        gewichte = np.asarray(gewichte, dtype=np.float64)
+        anzahl = len(gewichte)
+        skaliert = gewichte / gewichte.sum() * anzahl
+        self.wahrscheinlichkeit = np.ones(anzahl)
+        self.alias = np.arange(anzahl)
+
+        klein = [i for i in range(anzahl) if skaliert[i] < 1.0]
+        gross = [i for i in range(anzahl) if skaliert[i] >= 1.0]
+        while klein and gross:
+            k = klein.pop()
+            g = gross.pop()
+            self.wahrscheinlichkeit[k] = skaliert[k]
+            self.alias[k] = g
+            skaliert[g] += skaliert[k] - 1.0
+            (klein if skaliert[g] < 1.0 else gross).append(g)
+
+    def ziehen(self, groesse, rng):
+        """
+        Zieht Indizes gemäß der Verteilung.
+        Args:
+            groesse (int or tuple): Form des Ergebnisses.
+            rng (np.random.Generator): Zufallsgenerator.
+        Returns:
+            np.ndarray: Gezogene Indizes.
+        """
+        anzahl = len(self.wahrscheinlichkeit)
+        u = rng.random(groesse) * anzahl
+        index = np.minimum(u.astype(np.intp), anzahl - 1)
+        return np.where(
+            u - index < self.wahrscheinlichkeit[index], index, self.alias[index]
+        )
+
+
+class TorSampler:
+    """
+    Zieht Heim- und Auswärtstore aus einer festen Torverteilung. Gewichte werden einmalig
+    geprüft und als kumulierte Summen (Einzelziehung) bzw. Alias-Tabellen
+    (Massenziehung) vorberechnet, z.B. aus den Ergebnissen von
+    analyze_matchdays.berechne_gewichte.
+    """
+
+    __slots__ = (
+        "torverteilung",
+        "_kumuliert_heim",
+        "_kumuliert_auswaerts",
+        "_tore",
+        "_alias_heim",
+        "_alias_auswaerts",
+    )
+
+    def __init__(
+        self,
+        torverteilung: list = None,
+        torgewichte_heim: list = None,
+        torgewichte_auswaerts: list = None,
+    ):
+        """
+        Args:
+            torverteilung (list): Liste der möglichen Toranzahlen eines Teams.
+            torgewichte_heim (list): Gewichtungen der Toranzahlen für Heimtore.
+            torgewichte_auswaerts (list): Gewichtungen der Toranzahlen für Auswärtstore.
+        """
+        if torverteilung is None:
+            torverteilung = STANDARD_TORVERTEILUNG
+        if torgewichte_heim is None:
+            torgewichte_heim = STANDARD_TORGEWICHTE_HEIM
+        else:
+            # Stelle sicher, dass die Gewichtungen die gleiche Länge wie die Torverteilung haben
+            if len(torgewichte_heim) != len(torverteilung):
+                raise ValueError(
+                    "Die Liste der Gewichtungen für Heimtore muss die gleiche Länge wie die Torverteilung haben."
+                )
+        if torgewichte_auswaerts is None:
+            torgewichte_auswaerts = STANDARD_TORGEWICHTE_AUSWAERTS
+        else:
+            # Stelle sicher, dass die Gewichtungen die gleiche Länge wie die Torverteilung haben
+            if len(torgewichte_auswaerts) != len(torverteilung):
+                raise ValueError(
+                    "Die Liste der Gewichtungen für Auswärtstore muss die gleiche Länge wie die Torverteilung haben."
+                )
+
+        self.torverteilung = list(torverteilung)
+        # Gleiche kumulierte Summen wie in random.choices, damit ein gegebener
+        # Zufallsgenerator dieselben Tore liefert
+        self._kumuliert_heim = list(itertools.accumulate(torgewichte_heim))
+        self._kumuliert_auswaerts = list(itertools.accumulate(torgewichte_auswaerts))
+        self._tore = np.asarray(torverteilung)
+        self._alias_heim = AliasTabelle(torgewichte_heim)
+        self._alias_auswaerts = AliasTabelle(torgewichte_auswaerts)
+
+    def ziehen(self, rng: random.Random = None):
+        """
+        Simuliert ein einzelnes Spiel.
+        Args:
+            rng (random.Random): Optionaler Zufallsgenerator, sonst das globale random-Modul.
+        Returns:
+            tuple: Ein Tupel mit den Toren des Heim- und Auswärtsteams.
+        """
+        if rng is None:
+            rng = random
+        kumuliert_heim = self._kumuliert_heim
+        kumuliert_auswaerts = self._kumuliert_auswaerts
+        tore_heim = self.torverteilung[
+            bisect.bisect(
+                kumuliert_heim,
+                rng.random() * kumuliert_heim[-1],
+                0,
+                len(kumuliert_heim) - 1,
+            )
+        ]
+        tore_auswaerts = self.torverteilung[
+            bisect.bisect(
+                kumuliert_auswaerts,
+                rng.random() * kumuliert_auswaerts[-1],
+                0,
+                len(kumuliert_auswaerts) - 1,
+            )
+        ]
+        return tore_heim, tore_auswaerts
+
+    def ziehen_bulk(self, groesse, rng: np.random.Generator = None):
+        """
+        Simuliert viele Spiele auf einmal.
+        Args:
+            groesse (int or tuple): Anzahl bzw. Form der zu simulierenden Spiele.
+            rng (np.random.Generator): Optionaler Zufallsgenerator.
+        Returns:
+            tuple: (tore_heim, tore_auswaerts) als Arrays der Form groesse.
+        """
+        if rng is None:
+            rng = np.random.default_rng()
+        return (
+            self._tore[self._alias_heim.ziehen(groesse, rng)],
+            self._tore[self._alias_auswaerts.ziehen(groesse, rng)],
+        )
+
+
+@functools.lru_cache(maxsize=32)
+def _sampler(torverteilung, torgewichte_heim, torgewichte_auswaerts):
+    """
+    Liefert einen zwischengespeicherten TorSampler für unveränderliche Parameter.
+    """
+    return TorSampler(torverteilung, torgewichte_heim, torgewichte_auswaerts)
+
+
 def simulate_game_realgoals(
     torverteilung: list = None,
     torgewichte_heim: list = None,
     torgewichte_auswaerts: list = None,
+    rng: random.Random = None,
 ):
     """
     Simuliert ein Spiel zwischen zwei Teams basierend auf
-    realistischeren Ergebniswahrscheinlichkeiten.
+    realistischeren Ergebniswahrscheinlichkeiten. Dünner Wrapper um TorSampler; für
+    viele Spiele mit denselben Gewichten besser direkt einen TorSampler verwenden.
     Args:
         torverteilung (list): Liste der möglichen Toranzahlen eines Teams.
         torgewichte_heim (list): Gewichtungen der Toranzahlen für Heimtore.
         torgewichte_auswaerts (list): Gewichtungen der Toranzahlen für Auswärtstore.
+        rng (random.Random): Optionaler Zufallsgenerator, sonst das globale random-Modul.
     Returns:
         tuple: Ein Tupel mit den Toren des Heim- und Auswärtsteams.
     """
-
-    if torverteilung is None:
-        # Gewichtete Wahrscheinlichkeiten für Tore (z.B. 1 Tor häufiger als 3+ Tore)
-        torverteilung = [0, 1, 2, 3, 4]  # mögliche Tore
-    if torgewichte_heim is None:
-        # Gewichtungen für Heimtore
-        torgewichte_heim = [
-            54 / 261,
-            87 / 261,
-            61 / 261,
-            40 / 261,
-            19 / 261,
-        ]
-    else:
-        # Stelle sicher, dass die Gewichtungen die gleiche Länge wie die Torverteilung haben
-        if len(torgewichte_heim) != len(torverteilung):
-            raise ValueError(
-                "Die Liste der Gewichtungen für Heimtore muss die gleiche Länge wie die Torverteilung haben."
-            )
-    if torgewichte_auswaerts is None:
-        # Gewichtungen für Auswärtstore
-        torgewichte_auswaerts = [
-            76 / 261,
-            80 / 261,
-            61 / 261,
-            25 / 261,
-            19 / 261,
-        ]
-    else:
-        # Stelle sicher, dass die Gewichtungen die gleiche Länge wie die Torverteilung haben
-        if len(torgewichte_auswaerts) != len(torverteilung):
-            raise ValueError(
-                "Die Liste der Gewichtungen für Auswärtstore muss die gleiche Länge wie die Torverteilung haben."
-            )
-
-    tore_heim = random.choices(torverteilung, weights=torgewichte_heim, k=1)[0]
-    tore_auswaerts = random.choices(torverteilung, weights=torgewichte_auswaerts, k=1)[
-        0
-    ]
-
-    return tore_heim, tore_auswaerts
+    sampler = _sampler(
+        None if torverteilung is None else tuple(torverteilung),
+        None if torgewichte_heim is None else tuple(torgewichte_heim),
+        None if torgewichte_auswaerts is None else tuple(torgewichte_auswaerts),
+    )
+    return sampler.ziehen(rng)
 
 
 def update_table(table_dict, home, away, home_goals, away_goals):
@@ -0,0 +1,67 @@
+"""
+Adaptive Anzahl an Simulationen mit Abbruch über Konfidenzintervalle.
+
+Es wird blockweise simuliert. Nach jedem Block wird für jede geschätzte
+Platzierungswahrscheinlichkeit die halbe Breite des Wilson-Konfidenzintervalls
+berechnet. Sobald die größte halbe Breite unter der gewünschten Toleranz liegt oder das
+Budget an Runs aufgebraucht ist, wird abgebrochen.
+"""
+
+import numpy as np
+
+# Quantil der Standardnormalverteilung für ein 95%-Konfidenzintervall
+STANDARD_Z = 1.96
+
+
+def wilson_halbbreite(anzahl, runs, z=STANDARD_Z):
+    """
+    Berechnet die halbe Breite des Wilson-Intervalls für geschätzte Anteile. Anders als
+    beim einfachen Standardfehler ist sie auch für Anteile von 0 oder 1 größer als 0.
+    Args:
+        anzahl (np.ndarray): Beobachtete Häufigkeiten.
+        runs (int): Anzahl der Simulationen.
+        z (float): Quantil der Standardnormalverteilung.
+    Returns:
+        np.ndarray: Halbe Intervallbreite je Anteil (als Anteil, nicht in Prozent).
+    """
+    anteil = np.asarray(anzahl, dtype=np.float64) / runs
+    standardfehler = np.sqrt(anteil * (1 - anteil) / runs + z**2 / (4 * runs**2))
+    return z * standardfehler / (1 + z**2 / runs)
+
+
+def simulate_adaptive(simuliere_block, toleranz, max_runs, blockgroesse, z=STANDARD_Z):
+    """
+    Simuliert blockweise, bis die gewünschte Genauigkeit erreicht ist.
+    Args:
+        simuliere_block (callable): Funktion, die für eine Anzahl an Runs ein Array mit
+        Häufigkeiten (z.B. eine Zählmatrix teams x plätze) zurückgibt.
+        toleranz (float): Gewünschte maximale halbe Intervallbreite in Prozentpunkten.
+        max_runs (int): Maximale Anzahl an Simulationen.
+        blockgroesse (int): Anzahl der Simulationen je Block.
+        z (float): Quantil der Standardnormalverteilung.
+    Returns:
+        tuple: (zaehlung, runs, halbbreite) mit den summierten Häufigkeiten, der Anzahl
+        tatsächlich durchgeführter Simulationen und der erreichten größten halben
+        Intervallbreite in Prozentpunkten.
+    """
+    if toleranz <= 0:
+        raise ValueError("Die Toleranz muss größer als 0 sein.")
+    if max_runs < 1:
+        raise ValueError("max_runs muss mindestens 1 sein.")
+    if blockgroesse < 1:
+        raise ValueError("Die Blockgröße muss mindestens 1 sein.")
+
+    zaehlung = None
+    runs = 0
+    halbbreite = float("inf")
+    while runs < max_runs:
+        block = min(blockgroesse, max_runs - runs)
+        ergebnis = simuliere_block(block)
+        zaehlung = ergebnis if zaehlung is None else zaehlung + ergebnis
+        runs += block
+
+        halbbreite = float(wilson_halbbreite(zaehlung, runs, z).max() * 100)
+        if halbbreite <= toleranz:
+            break
+
+    return zaehlung, runs, halbbreite
@@ -0,0 +1,258 @@
+"""
+Persistenter Cache für Simulationsergebnisse.
+
+Gespeichert wird die Zählmatrix (teams x plätze) in einer SQLite-Datei. Der Schlüssel
+ist ein Hash über die normalisierte Tabelle, die Spielpaarungen, die Torgewichte, das
+Modell und den Seed; die Anzahl der Runs wird zusätzlich zum Schlüssel abgelegt.
+
+Ohne Seed sind Treffer additiv: Liegt für denselben Schlüssel ein Ergebnis mit weniger
+Runs vor, wird nur die Differenz simuliert und zur gespeicherten Zählmatrix addiert.
+Mit Seed wird nur ein exakter Treffer verwendet, damit das Ergebnis für einen Seed
+nicht vom Inhalt des Caches abhängt.
+
+Überschreiten die gespeicherten Matrizen die maximale Größe, werden die am längsten
+nicht mehr genutzten Einträge verdrängt (LRU).
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import numpy as np
+from league_table import LeagueTable
+from sim import (
+    STANDARD_TORVERTEILUNG,
+    STANDARD_TORGEWICHTE_HEIM,
+    STANDARD_TORGEWICHTE_AUSWAERTS,
+)
+
+STANDARD_CACHE_PFAD = "cache/simulationen.sqlite"
+
+# Maximale Gesamtgröße der gespeicherten Zählmatrizen in Bytes
+STANDARD_MAX_BYTES = 64 * 1024**2
+
+
+def _normalisierte_gewichte(gewichte, standard):
+    """
+    Normalisiert Gewichte auf Wahrscheinlichkeiten, damit z.B. absolute Häufigkeiten
+    und relative Anteile denselben Schlüssel ergeben.
+    """
+    if gewichte is None:
+        gewichte = standard
+    summe = float(sum(gewichte))
+    return [round(float(gewicht) / summe, 12) for gewicht in gewichte]
+
+
+def cache_bezeichnung(gewichte, engine, workers, seed=None):
+    """
+    Bezeichnung des Modells für cache_schluessel. Ohne Seed sind alle Engines gleich
+    verteilt und teilen sich die Einträge, mit Seed hängen die Ergebnisse zusätzlich von
+    der Engine und der Anzahl der Worker ab.
+    Args:
+        gewichte (dict): Gewichte der Simulation, optional mit modell (PoissonModell).
+        engine (str): "python" oder "numpy".
+        workers (int): Anzahl der Prozesse.
+        seed (int): Optionaler Seed.
+    Returns:
+        str: Bezeichnung, z.B. "realgoals" oder "poisson-numpy-4".
+    """
+    bezeichnung = "realgoals" if gewichte.get("modell") is None else "poisson"
+    if seed is None:
+        return bezeichnung
+    return f"{bezeichnung}-{engine}-{workers}"
+
+
+def cache_schluessel(table_raw, fixtures, gewichte, modell, seed=None):
+    """
+    Berechnet den Cache-Schlüssel einer Simulation.
+    Args:
+        table_raw (list of dict): Eingelesene Tabelle.
+        fixtures (list of tuples): Liste von (Heim, Auswärts)-Tupeln.
+        gewichte (dict): torverteilung, torgewichte_heim, torgewichte_auswaerts und
+        optional vergleich (DirekterVergleich) und modell (PoissonModell).
+        modell (str): Bezeichnung des Modells (bzw. der Engine), mit dem simuliert wird.
+        seed (int): Optionaler Seed.
+    Returns:
+        str: SHA-256-Hash als Hex-String.
+    """
+    tabelle = LeagueTable.aus_tabelle(table_raw)
+    torverteilung = gewichte.get("torverteilung")
+    inhalt = {
+        "tabelle": [tabelle.teams]
+        + [getattr(tabelle, name) for name in LeagueTable.KENNZAHLEN],
+        "paarungen": [list(paarung) for paarung in fixtures],
+        "torverteilung": list(
+            STANDARD_TORVERTEILUNG if torverteilung is None else torverteilung
+        ),
+        "torgewichte_heim": _normalisierte_gewichte(
+            gewichte.get("torgewichte_heim"), STANDARD_TORGEWICHTE_HEIM
+        ),
+        "torgewichte_auswaerts": _normalisierte_gewichte(
+            gewichte.get("torgewichte_auswaerts"), STANDARD_TORGEWICHTE_AUSWAERTS
+        ),
+        "modell": modell,
+        "seed": seed,
+    }
+    vergleich = gewichte.get("vergleich")
+    if vergleich is not None:
+        inhalt["direkter_vergleich"] = [
+            getattr(vergleich, name).tolist() for name in vergleich.__slots__
+        ]
+    poisson_modell = gewichte.get("modell")
+    if poisson_modell is not None:
+        inhalt["poisson_modell"] = [
+            poisson_modell.teams,
+            poisson_modell.angriff.tolist(),
+            poisson_modell.abwehr.tolist(),
+            poisson_modell.heimvorteil,
+            poisson_modell.rho,
+        ]
+    kodiert = json.dumps(inhalt, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(kodiert).hexdigest()
+
+
+class SimulationsCache:
+    """
+    SQLite-Cache für Zählmatrizen mit LRU-Verdrängung und Größenbeschränkung.
+    """
+
+    def __init__(self, pfad=STANDARD_CACHE_PFAD, max_bytes=STANDARD_MAX_BYTES):
+        """
+        Args:
+            pfad (str): Pfad zur SQLite-Datei. ":memory:" für einen flüchtigen Cache.
+            max_bytes (int): Maximale Gesamtgröße der gespeicherten Matrizen.
+        """
+        if pfad != ":memory:" and os.path.dirname(pfad):
+            os.makedirs(os.path.dirname(pfad), exist_ok=True)
+        self.max_bytes = max_bytes
+        self.verbindung = sqlite3.connect(pfad)
+        self.verbindung.execute("""
+            CREATE TABLE IF NOT EXISTS ergebnisse (
+                schluessel TEXT NOT NULL,
+                runs INTEGER NOT NULL,
+                anzahl_teams INTEGER NOT NULL,
+                zaehlmatrix BLOB NOT NULL,
+                zugriff REAL NOT NULL,
+                PRIMARY KEY (schluessel, runs)
+            )
+            """)
+        self.verbindung.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """
+        Schließt die Datenbankverbindung.
+        """
+        self.verbindung.close()
+
+    def laden(self, schluessel, runs, additiv=False):
+        """
+        Sucht ein gespeichertes Ergebnis.
+        Args:
+            schluessel (str): Cache-Schlüssel (siehe cache_schluessel).
+            runs (int): Gewünschte Anzahl an Runs.
+            additiv (bool): Ob auch ein Ergebnis mit weniger Runs geliefert werden darf.
+        Returns:
+            tuple: (runs, zaehlmatrix) des größten passenden Eintrags oder None.
+        """
+        if additiv:
+            zeile = self.verbindung.execute(
+                "SELECT runs, anzahl_teams, zaehlmatrix FROM ergebnisse "
+                "WHERE schluessel = ? AND runs <= ? ORDER BY runs DESC LIMIT 1",
+                (schluessel, runs),
+            ).fetchone()
+        else:
+            zeile = self.verbindung.execute(
+                "SELECT runs, anzahl_teams, zaehlmatrix FROM ergebnisse "
+                "WHERE schluessel = ? AND runs = ?",
+                (schluessel, runs),
+            ).fetchone()
+        if zeile is None:
+            return None
+
+        gespeicherte_runs, anzahl_teams, daten = zeile
+        self.verbindung.execute(
+            "UPDATE ergebnisse SET zugriff = ? WHERE schluessel = ? AND runs = ?",
+            (time.time(), schluessel, gespeicherte_runs),
+        )
+        self.verbindung.commit()
+        zaehlmatrix = np.frombuffer(daten, dtype=np.int64).reshape(
+            anzahl_teams, anzahl_teams
+        )
+        return gespeicherte_runs, zaehlmatrix.copy()
+
+    def speichern(self, schluessel, runs, zaehlmatrix, ersetzen=False):
+        """
+        Speichert eine Zählmatrix und verdrängt bei Bedarf alte Einträge.
+        Args:
+            schluessel (str): Cache-Schlüssel (siehe cache_schluessel).
+            runs (int): Anzahl der Runs, auf denen die Zählmatrix beruht.
+            zaehlmatrix (np.ndarray): Zählmatrix der Form (teams, plätze).
+            ersetzen (bool): Ob Einträge desselben Schlüssels mit weniger Runs gelöscht
+            werden sollen, weil sie im neuen Eintrag enthalten sind.
+        """
+        daten = np.ascontiguousarray(zaehlmatrix, dtype=np.int64).tobytes()
+        if ersetzen:
+            self.verbindung.execute(
+                "DELETE FROM ergebnisse WHERE schluessel = ? AND runs < ?",
+                (schluessel, runs),
+            )
+        self.verbindung.execute(
+            "INSERT OR REPLACE INTO ergebnisse VALUES (?, ?, ?, ?, ?)",
+            (schluessel, runs, len(zaehlmatrix), daten, time.time()),
+        )
+        self._verdraengen()
+        self.verbindung.commit()
+
+    def _verdraengen(self):
+        """
+        Löscht die am längsten nicht genutzten Einträge, bis die Größe eingehalten wird.
+        """
+        groesse = self.verbindung.execute(
+            "SELECT COALESCE(SUM(LENGTH(zaehlmatrix)), 0) FROM ergebnisse"
+        ).fetchone()[0]
+        while groesse > self.max_bytes:
+            schluessel, runs, laenge = self.verbindung.execute(
+                "SELECT schluessel, runs, LENGTH(zaehlmatrix) FROM ergebnisse "
+                "ORDER BY zugriff ASC LIMIT 1"
+            ).fetchone()
+            self.verbindung.execute(
+                "DELETE FROM ergebnisse WHERE schluessel = ? AND runs = ?",
+                (schluessel, runs),
+            )
+            groesse -= laenge
+
+
+def simulate_gecacht(cache, schluessel, runs, simuliere, additiv=True):
+    """
+    Liefert die Zählmatrix aus dem Cache und simuliert nur fehlende Runs.
+    Args:
+        cache (SimulationsCache): Der Cache.
+        schluessel (str): Cache-Schlüssel (siehe cache_schluessel).
+        runs (int): Gewünschte Anzahl an Runs.
+        simuliere (callable): Funktion, die für eine Anzahl an Runs eine Zählmatrix
+        zurückgibt.
+        additiv (bool): Ob ein Ergebnis mit weniger Runs aufgestockt werden darf. Nur
+        sinnvoll, wenn nicht mit festem Seed simuliert wird.
+    Returns:
+        tuple: (zaehlmatrix, runs_aus_cache) mit der Zählmatrix für runs Simulationen
+        und der Anzahl der Runs, die aus dem Cache stammen.
+    """
+    treffer = cache.laden(schluessel, runs, additiv=additiv)
+    if treffer is not None and treffer[0] == runs:
+        return treffer[1], runs
+
+    runs_aus_cache = 0
+    zaehlmatrix = simuliere(runs if treffer is None else runs - treffer[0])
+    if treffer is not None:
+        runs_aus_cache, gespeichert = treffer
+        zaehlmatrix = zaehlmatrix + gespeichert
+
+    cache.speichern(schluessel, runs, zaehlmatrix, ersetzen=additiv)
+    return zaehlmatrix, runs_aus_cache
@@ -0,0 +1,293 @@
+"""
+Persistente Elo-Bewertungen je Liga, die spieltagsweise fortgeschrieben werden.
+
+Statt ein Modell der Teamstärken jede Woche aus allen Ergebnissen seit dem ersten
+Spieltag neu zu schätzen, werden die Bewertungen gespeichert und beim Eintragen nur um
+die neuen Spiele ergänzt. Der Aufwand hängt damit nur von der Anzahl der neuen Spiele
+ab. Bereits eingetragene Spiele der laufenden Saison werden über (Spieltag, Heimteam)
+erkannt und übersprungen, sodass mehrfaches Eintragen derselben Ergebnisse nichts
+verändert und die übrigen Spiele eines teilweise gespielten Spieltags nachgetragen
+werden.
+
+Zeitlicher Verfall: Vor jedem Spieltag rücken alle Bewertungen um einen festen Faktor
+zum Mittelwert, zu Beginn einer neuen Saison zusätzlich um einen größeren Anteil. Alte
+Ergebnisse verlieren so mit der Zeit an Gewicht.
+
+Für die Simulation wird die Bewertungsdifferenz in erwartete Tore übersetzt:
+    Heim:     tore_auswaerts_mittel * heimvorteil * 10 ** ((R_heim - R_auswaerts) / skala)
+    Auswärts: tore_auswaerts_mittel * 10 ** ((R_auswaerts - R_heim) / skala)
+Das entspricht einem PoissonModell (siehe sim_poisson), dessen Angriffs- und
+Abwehrwerte sich aus den Bewertungen ergeben. Die Ergebnismatrizen je Paarung und das
+Ziehen in den Engines werden von dort übernommen.
+"""
+
+import json
+import math
+import os
+from sim_poisson import PoissonModell
+
+STANDARD_ELO_VERZEICHNIS = "cache/elo"
+
+STANDARD_STARTWERT = 1500.0
+# Maximale Änderung je Spiel bei einem Sieg mit einem Tor Unterschied
+STANDARD_K = 20.0
+# Elo-Punkte, um die das Heimteam bei der Erwartung bevorzugt wird
+STANDARD_ELO_HEIMVORTEIL = 60.0
+# Anzahl der Spieltage, nach denen sich der Abstand zum Mittelwert halbiert
+STANDARD_HALBWERTSZEIT = 68
+# Anteil des Abstands zum Mittelwert, der beim Saisonwechsel verloren geht
+STANDARD_SAISON_REGRESSION = 1 / 3
+# Bewertungsdifferenz, bei der sich die erwarteten Tore um den Faktor 10 unterscheiden
+STANDARD_TORSKALA = 800.0
+
+
+def elo_pfad(liga, verzeichnis=STANDARD_ELO_VERZEICHNIS):
+    """
+    Liefert den Speicherort der Bewertungen einer Liga.
+    Args:
+        liga (str): Liga wie in der kicker-URL, z.B. "bundesliga".
+        verzeichnis (str): Verzeichnis, in dem die Bewertungen liegen.
+    Returns:
+        str: Pfad zur JSON-Datei.
+    """
+    return os.path.join(verzeichnis, f"{liga}.json")
+
+
+def _tordifferenz_faktor(differenz):
+    """
+    Gewichtet ein Ergebnis nach der Tordifferenz (wie in der World Football Elo).
+    """
+    differenz = abs(differenz)
+    if differenz <= 1:
+        return 1.0
+    if differenz == 2:
+        return 1.5
+    return (11 + differenz) / 8
+
+
+class EloBewertung:
+    """
+    Elo-Bewertungen aller Teams einer Liga samt Stand der eingetragenen Spieltage.
+    """
+
+    def __init__(
+        self,
+        k=STANDARD_K,
+        heimvorteil=STANDARD_ELO_HEIMVORTEIL,
+        halbwertszeit=STANDARD_HALBWERTSZEIT,
+        saison_regression=STANDARD_SAISON_REGRESSION,
+        startwert=STANDARD_STARTWERT,
+    ):
+        """
+        Args:
+            k (float): Maximale Änderung je Spiel bei knappem Ergebnis.
+            heimvorteil (float): Elo-Punkte Vorteil für das Heimteam.
+            halbwertszeit (float): Spieltage, nach denen sich der Abstand zum
+            Mittelwert halbiert. None schaltet den Verfall ab.
+            saison_regression (float): Anteil des Abstands zum Mittelwert, der beim
+            Saisonwechsel verloren geht.
+            startwert (float): Bewertung neuer Teams.
+        """
+        self.k = k
+        self.heimvorteil = heimvorteil
+        self.halbwertszeit = halbwertszeit
+        self.saison_regression = saison_regression
+        self.startwert = startwert
+        self.bewertungen = {}
+        self.saison = None
+        self.spieltag = 0
+        # (Spieltag, Heimteam) der eingetragenen Spiele der laufenden Saison
+        self.eingetragen = set()
+        # Tore aller eingetragenen Spiele für die Umrechnung in erwartete Tore
+        self.spiele = 0
+        self.tore_heim = 0
+        self.tore_auswaerts = 0
+
+    def __len__(self):
+        return len(self.bewertungen)
+
+    def bewertung(self, team):
+        """
+        Liefert die Bewertung eines Teams; unbekannte Teams haben den Startwert.
+        """
+        return self.bewertungen.get(team, self.startwert)
+
+    def _verfall(self, anteil):
+        """
+        Rückt alle Bewertungen um einen Anteil ihres Abstands zum Mittelwert heran.
+        """
+        if not self.bewertungen or anteil == 0:
+            return
+        mittel = sum(self.bewertungen.values()) / len(self.bewertungen)
+        for team, wert in self.bewertungen.items():
+            self.bewertungen[team] = wert - anteil * (wert - mittel)
+
+    def _spieltag_beginnen(self, saison, spieltag):
+        """
+        Wendet den zeitlichen Verfall bis zum Beginn eines Spieltags an.
+        """
+        if saison != self.saison:
+            if self.saison is not None:
+                self._verfall(self.saison_regression)
+            self.saison = saison
+            self.spieltag = 0
+            self.eingetragen = set()
+        if self.halbwertszeit:
+            self._verfall(1 - 0.5 ** ((spieltag - self.spieltag) / self.halbwertszeit))
+        self.spieltag = spieltag
+
+    def spiel_eintragen(self, heim, auswaerts, tore_heim, tore_auswaerts):
+        """
+        Aktualisiert die Bewertungen beider Teams nach einem Spiel. Die Summe der
+        Bewertungen bleibt dabei gleich.
+        Args:
+            heim (str): Name des Heimteams.
+            auswaerts (str): Name des Auswärtsteams.
+            tore_heim (int): Die Tore des Heimteams.
+            tore_auswaerts (int): Die Tore des Auswärtsteams.
+        """
+        bewertung_heim = self.bewertung(heim)
+        bewertung_auswaerts = self.bewertung(auswaerts)
+        erwartung = 1 / (
+            1 + 10 ** ((bewertung_auswaerts - bewertung_heim - self.heimvorteil) / 400)
+        )
+        if tore_heim > tore_auswaerts:
+            ergebnis = 1.0
+        elif tore_heim < tore_auswaerts:
+            ergebnis = 0.0
+        else:
+            ergebnis = 0.5
+        aenderung = (
+            self.k
+            * _tordifferenz_faktor(tore_heim - tore_auswaerts)
+            * (ergebnis - erwartung)
+        )
+        self.bewertungen[heim] = bewertung_heim + aenderung
+        self.bewertungen[auswaerts] = bewertung_auswaerts - aenderung
+
+        self.spiele += 1
+        self.tore_heim += tore_heim
+        self.tore_auswaerts += tore_auswaerts
+
+    def ergebnisse_eintragen(self, ergebnisse, saison):
+        """
+        Trägt alle Spiele ein, die noch nicht eingetragen sind. Nachgeholte Spiele
+        früherer Spieltage werden ohne erneuten Verfall eingetragen.
+        Args:
+            ergebnisse (list of dict): Ergebnisse im Format von normalize_results. Es
+            genügt, nur die neuen Spiele zu übergeben.
+            saison (str): Saison der Ergebnisse, z.B. "2024-25". Ergebnisse einer
+            älteren Saison werden ignoriert.
+        Returns:
+            int: Anzahl der eingetragenen Spiele.
+        """
+        if self.saison is not None and saison < self.saison:
+            return 0
+        eingetragen = self.eingetragen if saison == self.saison else set()
+        neu = sorted(
+            (e for e in ergebnisse if (e["Spieltag"], e["Heim"]) not in eingetragen),
+            key=lambda e: e["Spieltag"],
+        )
+        for ergebnis in neu:
+            if saison != self.saison or ergebnis["Spieltag"] > self.spieltag:
+                self._spieltag_beginnen(saison, ergebnis["Spieltag"])
+            self.eingetragen.add((ergebnis["Spieltag"], ergebnis["Heim"]))
+            self.spiel_eintragen(
+                ergebnis["Heim"],
+                ergebnis["Auswaerts"],
+                ergebnis["Tore_Heim"],
+                ergebnis["Tore_Auswaerts"],
+            )
+        return len(neu)
+
+    def als_modell(self, teams=None, skala=STANDARD_TORSKALA):
+        """
+        Übersetzt die Bewertungen in ein Modell der erwarteten Tore je Paarung.
+        Args:
+            teams (list): Teams des Modells. Standardmäßig alle bewerteten Teams;
+            unbekannte Teams erhalten den Startwert.
+            skala (float): Bewertungsdifferenz, bei der sich die erwarteten Tore um den
+            Faktor 10 unterscheiden.
+        Returns:
+            PoissonModell: Modell für die Simulation (siehe sim_poisson).
+        """
+        if not self.spiele:
+            raise ValueError("Es wurden noch keine Ergebnisse eingetragen.")
+        if teams is None:
+            teams = sorted(self.bewertungen)
+        mittel = sum(self.bewertung(team) for team in teams) / len(teams)
+        tore_auswaerts = max(self.tore_auswaerts, 1) / self.spiele
+        heimvorteil = max(self.tore_heim, 1) / max(self.tore_auswaerts, 1)
+
+        staerke = [10 ** ((self.bewertung(team) - mittel) / skala) for team in teams]
+        return PoissonModell(
+            teams,
+            [math.sqrt(tore_auswaerts) * wert for wert in staerke],
+            [math.sqrt(tore_auswaerts) / wert for wert in staerke],
+            heimvorteil,
+        )
+
+    def als_dict(self):
+        """
+        Returns:
+            dict: Zustand und Parameter als JSON-taugliches Dictionary.
+        """
+        return {
+            "parameter": {
+                "k": self.k,
+                "heimvorteil": self.heimvorteil,
+                "halbwertszeit": self.halbwertszeit,
+                "saison_regression": self.saison_regression,
+                "startwert": self.startwert,
+            },
+            "saison": self.saison,
+            "spieltag": self.spieltag,
+            "eingetragen": sorted(self.eingetragen),
+            "spiele": self.spiele,
+            "tore_heim": self.tore_heim,
+            "tore_auswaerts": self.tore_auswaerts,
+            "bewertungen": self.bewertungen,
+        }
+
+    @classmethod
+    def aus_dict(cls, daten):
+        """
+        Stellt die Bewertungen aus als_dict wieder her.
+        """
+        bewertung = cls(**daten["parameter"])
+        for name in ("saison", "spieltag", "spiele", "tore_heim", "tore_auswaerts"):
+            setattr(bewertung, name, daten[name])
+        bewertung.eingetragen = {
+            (spieltag, heim) for spieltag, heim in daten["eingetragen"]
+        }
+        bewertung.bewertungen = dict(daten["bewertungen"])
+        return bewertung
+
+    def speichern(self, pfad):
+        """
+        Schreibt die Bewertungen atomar als JSON-Datei.
+        Args:
+            pfad (str): Zielpfad, z.B. elo_pfad("bundesliga").
+        """
+        if os.path.dirname(pfad):
+            os.makedirs(os.path.dirname(pfad), exist_ok=True)
+        temp = f"{pfad}.tmp"
+        with open(temp, "w", encoding="utf-8") as datei:
+            json.dump(self.als_dict(), datei, ensure_ascii=False, indent=2)
+        os.replace(temp, pfad)
+
+    @classmethod
+    def laden(cls, pfad, **parameter):
+        """
+        Lädt gespeicherte Bewertungen. Gibt es die Datei noch nicht, werden leere
+        Bewertungen mit den übergebenen Parametern angelegt.
+        Args:
+            pfad (str): Pfad zur JSON-Datei.
+            **parameter: Parameter für neue Bewertungen (siehe __init__).
+        Returns:
+            EloBewertung: Die Bewertungen.
+        """
+        if not os.path.exists(pfad):
+            return cls(**parameter)
+        with open(pfad, encoding="utf-8") as datei:
+            return cls.aus_dict(json.load(datei))
@@ -0,0 +1,242 @@
+"""
+Exakte Berechnung der Platzierungswahrscheinlichkeiten für die letzten Spieltage.
+
+Statt Saisons zu ziehen, werden die Ergebniswahrscheinlichkeiten der verbleibenden
+Spiele (Torverteilung wie in simulate_game_realgoals) exakt ausgewertet. Für jedes Team
+wird über die Ergebnisse seiner eigenen Spiele summiert. Danach zerfallen die übrigen
+Spiele in unabhängige Gruppen, deren Beitrag zur Anzahl der Teams vor diesem Team
+getrennt aufgezählt und anschließend gefaltet wird. Teams, die unabhängig vom Ausgang
+ihrer Spiele sicher vor oder hinter dem Team landen, werden samt ihren Spielen
+übersprungen.
+
+Wird der Zustandsraum zu groß, gibt simulate_season_exact None zurück
+und der Aufrufer kann auf die Simulation ausweichen.
+"""
+
+import itertools
+import numpy as np
+from league_table import LeagueTable
+from sim_vectorized import (
+    ergebnis_tabelle,
+    schluessel_deltas,
+    basis_schluessel,
+)
+
+# Maximale Anzahl an Ergebniskombinationen, die insgesamt aufgezählt werden
+STANDARD_MAX_ZUSTAENDE = 100_000_000
+
+
+def _vor(schluessel_j, j, schluessel_i, i):
+    """
+    Prüft (auch elementweise), ob Team j in der Tabelle vor Team i steht. Bei komplettem
+    Gleichstand entscheidet wie bei sorted() die ursprüngliche Tabellenreihenfolge.
+    """
+    return (schluessel_j > schluessel_i) | ((schluessel_j == schluessel_i) & (j < i))
+
+
+def _gruppen(offen, spiele):
+    """
+    Fasst offene Teams, die über verbleibende Spiele verbunden sind, zu Gruppen zusammen.
+    Args:
+        offen (set): Indizes der Teams, deren Position relativ zum betrachteten Team offen ist.
+        spiele (list of tuples): Verbleibende Spiele als (spiel_index, heim, auswaerts).
+    Returns:
+        list: Pro Gruppe ein Tupel (teams, spiele).
+    """
+    eltern = {team: team for team in offen}
+
+    def wurzel(team):
+        while eltern[team] != team:
+            eltern[team] = eltern[eltern[team]]
+            team = eltern[team]
+        return team
+
+    for _, heim, auswaerts in spiele:
+        if heim in offen and auswaerts in offen:
+            eltern[wurzel(heim)] = wurzel(auswaerts)
+
+    gruppen = {}
+    for team in offen:
+        gruppen.setdefault(wurzel(team), ([], []))[0].append(team)
+    for spiel in spiele:
+        _, heim, auswaerts = spiel
+        beteiligt = heim if heim in offen else auswaerts
+        if beteiligt in offen:
+            gruppen[wurzel(beteiligt)][1].append(spiel)
+    return list(gruppen.values())
+
+
+def _spannweiten(spiele, anzahl_teams, delta_grenzen):
+    """
+    Berechnet je Team die kleinste und größte mögliche Änderung des Sortierschlüssels
+    durch die übergebenen Spiele.
+    Returns:
+        tuple: (minimum, maximum) als int64-Arrays.
+    """
+    minimum = np.zeros(anzahl_teams, dtype=np.int64)
+    maximum = np.zeros(anzahl_teams, dtype=np.int64)
+    for _, heim, auswaerts in spiele:
+        minimum[heim] += delta_grenzen["heim"][0]
+        maximum[heim] += delta_grenzen["heim"][1]
+        minimum[auswaerts] += delta_grenzen["auswaerts"][0]
+        maximum[auswaerts] += delta_grenzen["auswaerts"][1]
+    return minimum, maximum
+
+
+def _aufwand(i, spiele, gesamt_min, gesamt_max, anzahl_ergebnisse):
+    """
+    Schätzt nach oben ab, wie viele Ergebniskombinationen für Team i aufgezählt werden.
+    Ohne Kenntnis der eigenen Ergebnisse ist jedes Team offen, dessen Spannweite sich
+    mit der von Team i überschneidet. Nach dem Festlegen der eigenen Ergebnisse sind die
+    Gruppen höchstens so groß wie diese.
+    Returns:
+        int: Obergrenze der aufzuzählenden Kombinationen.
+    """
+    alle = np.arange(len(gesamt_min))
+    eigene = [spiel for spiel in spiele if i in spiel[1:]]
+    kandidaten = set(
+        np.flatnonzero(
+            (alle != i)
+            & _vor(gesamt_max, alle, gesamt_min[i], i)
+            & ~_vor(gesamt_min, alle, gesamt_max[i], i)
+        ).tolist()
+    )
+    relevante_spiele = [
+        spiel for spiel in spiele if i not in spiel[1:] and set(spiel[1:]) & kandidaten
+    ]
+    return anzahl_ergebnisse ** len(eigene) * sum(
+        anzahl_ergebnisse ** len(gruppen_spiele)
+        for _, gruppen_spiele in _gruppen(kandidaten, relevante_spiele)
+    )
+
+
+def _gruppen_verteilung(teams, spiele, schluessel, i, wahrscheinlichkeiten, deltas):
+    """
+    Zählt alle Ergebniskombinationen einer Gruppe auf und berechnet die Verteilung der
+    Anzahl ihrer Teams, die vor Team i landen.
+    Returns:
+        np.ndarray: Wahrscheinlichkeit für 0..len(teams) Teams vor Team i.
+    """
+    anzahl_ergebnisse = len(wahrscheinlichkeiten)
+
+    delta_heim, delta_auswaerts = deltas
+    kombinationen = np.indices((anzahl_ergebnisse,) * len(spiele)).reshape(
+        len(spiele), -1
+    )
+    prob = np.ones(kombinationen.shape[1])
+    team_schluessel = {
+        team: np.full(kombinationen.shape[1], schluessel[team]) for team in teams
+    }
+    for ergebnisse, (_, heim, auswaerts) in zip(kombinationen, spiele):
+        prob *= wahrscheinlichkeiten[ergebnisse]
+        if heim in team_schluessel:
+            team_schluessel[heim] += delta_heim[ergebnisse]
+        if auswaerts in team_schluessel:
+            team_schluessel[auswaerts] += delta_auswaerts[ergebnisse]
+
+    anzahl_vor = np.zeros(kombinationen.shape[1], dtype=np.int64)
+    for team, werte in team_schluessel.items():
+        anzahl_vor += _vor(werte, team, schluessel[i], i)
+    return np.bincount(anzahl_vor, weights=prob, minlength=len(teams) + 1)
+
+
+def simulate_season_exact(
+    table_raw,
+    fixtures,
+    torverteilung=None,
+    torgewichte_heim=None,
+    torgewichte_auswaerts=None,
+    max_zustaende=STANDARD_MAX_ZUSTAENDE,
+):
+    """
+    Berechnet die exakte Verteilung der Platzierungen aller Teams.
+    Args:
+        table_raw (list of dict): Eingelesene Tabelle.
+        fixtures (list of tuples): Liste von (Heim, Auswärts)-Tupeln.
+        torverteilung (list): Optionale Torverteilung.
+        torgewichte_heim (list): Optionale Heimtor-Gewichte.
+        torgewichte_auswaerts (list): Optionale Auswärtstor-Gewichte.
+        max_zustaende (int): Maximale Anzahl an Ergebniskombinationen insgesamt.
+    Returns:
+        np.ndarray: Wahrscheinlichkeitsmatrix der Form (teams, plätze), Zeilen in
+        Tabellenreihenfolge, oder None, wenn der Zustandsraum zu groß ist.
+    """
+    tabelle = LeagueTable.aus_tabelle(table_raw)
+    paarungen = tabelle.paarungen_indizes(fixtures)
+    wahrscheinlichkeiten, tore_heim, tore_auswaerts = ergebnis_tabelle(
+        torverteilung, torgewichte_heim, torgewichte_auswaerts
+    )
+    delta_heim, delta_auswaerts = schluessel_deltas(tore_heim, tore_auswaerts)
+
+    # Ergebnisse mit Wahrscheinlichkeit 0 spielen keine Rolle
+    moeglich = wahrscheinlichkeiten > 0
+    wahrscheinlichkeiten = wahrscheinlichkeiten[moeglich]
+    deltas = (delta_heim[moeglich], delta_auswaerts[moeglich])
+    delta_grenzen = {
+        "heim": (deltas[0].min(), deltas[0].max()),
+        "auswaerts": (deltas[1].min(), deltas[1].max()),
+    }
+
+    basis = basis_schluessel(*tabelle.als_arrays())
+    anzahl_teams = len(tabelle)
+    spiele = [
+        (k, heim, auswaerts) for k, (heim, auswaerts) in enumerate(paarungen.tolist())
+    ]
+    verteilung = np.zeros((anzahl_teams, anzahl_teams))
+
+    # Spannweite der Endschlüssel über alle verbleibenden Spiele
+    gesamt_min, gesamt_max = _spannweiten(spiele, anzahl_teams, delta_grenzen)
+    gesamt_min += basis
+    gesamt_max += basis
+
+    alle = np.arange(anzahl_teams)
+    if (
+        sum(
+            _aufwand(i, spiele, gesamt_min, gesamt_max, len(wahrscheinlichkeiten))
+            for i in alle
+        )
+        > max_zustaende
+    ):
+        return None
+
+    for i in range(anzahl_teams):
+        andere = alle != i
+        eigene = [spiel for spiel in spiele if i in spiel[1:]]
+        uebrige = [spiel for spiel in spiele if i not in spiel[1:]]
+
+        # Spannweite der Schlüssel durch die übrigen Spiele
+        minimum, maximum = _spannweiten(uebrige, anzahl_teams, delta_grenzen)
+
+        for kombination in itertools.product(
+            range(len(wahrscheinlichkeiten)), repeat=len(eigene)
+        ):
+            schluessel = basis.copy()
+            prob = 1.0
+            for ergebnis, (_, heim, auswaerts) in zip(kombination, eigene):
+                schluessel[heim] += deltas[0][ergebnis]
+                schluessel[auswaerts] += deltas[1][ergebnis]
+                prob *= wahrscheinlichkeiten[ergebnis]
+
+            sicher_vor = andere & _vor(schluessel + minimum, alle, schluessel[i], i)
+            moeglich_vor = andere & _vor(schluessel + maximum, alle, schluessel[i], i)
+            offen = set(np.flatnonzero(moeglich_vor & ~sicher_vor).tolist())
+            relevante_spiele = [
+                spiel for spiel in uebrige if spiel[1] in offen or spiel[2] in offen
+            ]
+
+            anzahl_vor = np.ones(1)
+            for gruppen_teams, gruppen_spiele in _gruppen(offen, relevante_spiele):
+                gruppen_verteilung = _gruppen_verteilung(
+                    gruppen_teams,
+                    gruppen_spiele,
+                    schluessel,
+                    i,
+                    wahrscheinlichkeiten,
+                    deltas,
+                )
+                anzahl_vor = np.convolve(anzahl_vor, gruppen_verteilung)
+
+            versatz = int(sicher_vor.sum())
+            verteilung[i, versatz : versatz + len(anzahl_vor)] += prob * anzahl_vor
+
+    return verteilung
@@ -0,0 +1,259 @@
+"""
+Live-Aktualisierung der Platzierungswahrscheinlichkeiten während eines Spieltags.
+
+Die gezogenen Ergebnisse aller verbleibenden Spiele werden je Run aufbewahrt, zusammen
+mit den Sortierschlüsseln und Platzierungen der Endtabellen. Trifft ein echtes Ergebnis
+ein, wird es in allen Runs anstelle des gezogenen Ergebnisses eingetragen. Da die Spiele
+unabhängig voneinander gezogen werden, entspricht das genau dem Bedingen auf das echte
+Ergebnis; es werden keine Runs verworfen und es muss nichts neu simuliert werden. Neu
+gezogen wird nur, wenn die Anzahl der Runs mit aufstocken erhöht wird.
+
+Die Sortierschlüssel werden um die umgekehrte Tabellenposition erweitert, sodass es
+keinen Gleichstand mehr gibt und ein einzelner Vergleich die Reihenfolge festlegt. Bei
+einem eingetragenen Ergebnis ändern sich nur die Schlüssel von Heim- und Auswärtsteam.
+Die Platzierungen der übrigen Teams verschieben sich daher höchstens um die
+Positionswechsel dieser beiden Teams und werden ohne erneutes Sortieren angepasst.
+"""
+
+import numpy as np
+from league_table import LeagueTable
+from sim import AliasTabelle
+from sim_vectorized import (
+    STANDARD_BLOCKGROESSE,
+    basis_schluessel,
+    ergebnis_tabelle,
+    inzidenzmatrix,
+    schluessel_deltas,
+)
+
+
+def _plaetze(schluessel):
+    """
+    Berechnet aus den Sortierschlüsseln den Platz jedes Teams (0 = Platz 1).
+    Args:
+        schluessel (np.ndarray): Sortierschlüssel der Form (runs, teams).
+    Returns:
+        np.ndarray: Plätze der Form (runs, teams) als int8.
+    """
+    reihenfolge = np.argsort(-schluessel, axis=1, kind="stable")
+    plaetze = np.empty(schluessel.shape, dtype=np.int8)
+    np.put_along_axis(
+        plaetze,
+        reihenfolge,
+        np.arange(schluessel.shape[1], dtype=np.int8)[None, :],
+        axis=1,
+    )
+    return plaetze
+
+
+class LiveSimulation:
+    """
+    Simulation der verbleibenden Spiele, die auf eintreffende Ergebnisse bedingt wird.
+    """
+
+    def __init__(
+        self,
+        table_raw,
+        fixtures,
+        runs,
+        torverteilung=None,
+        torgewichte_heim=None,
+        torgewichte_auswaerts=None,
+        seed=None,
+        blockgroesse=STANDARD_BLOCKGROESSE,
+    ):
+        """
+        Args:
+            table_raw (list of dict): Eingelesene Tabelle vor dem Spieltag.
+            fixtures (list of tuples): Liste von (Heim, Auswärts)-Tupeln.
+            runs (int): Anzahl der Runs, die vorgehalten werden. Je Run werden ein Byte
+            pro Spiel (zwei bei mehr als 256 möglichen Ergebnissen) sowie neun Bytes
+            pro Team gespeichert.
+            torverteilung (list): Optionale Torverteilung für die Simulation.
+            torgewichte_heim (list): Optionale Heimtor-Gewichte.
+            torgewichte_auswaerts (list): Optionale Auswärtstor-Gewichte.
+            seed (int): Optionaler Seed.
+            blockgroesse (int): Anzahl der Runs, die gleichzeitig gezogen werden.
+        """
+        tabelle = LeagueTable.aus_tabelle(table_raw)
+        self.teams = tabelle.teams
+        self.fixtures = [tuple(paarung) for paarung in fixtures]
+        self.paarungen = tabelle.paarungen_indizes(fixtures)
+        wahrscheinlichkeiten, tore_heim, tore_auswaerts = ergebnis_tabelle(
+            torverteilung, torgewichte_heim, torgewichte_auswaerts
+        )
+        self.ergebnis_sampler = AliasTabelle(wahrscheinlichkeiten)
+        self.deltas = schluessel_deltas(tore_heim, tore_auswaerts)
+        self.basis = basis_schluessel(*tabelle.als_arrays())
+        self.inzidenz = inzidenzmatrix(
+            self.paarungen[:, 0], self.paarungen[:, 1], len(self.teams)
+        )
+        self.rng = np.random.default_rng(seed)
+        self.blockgroesse = blockgroesse
+
+        # Bei Gleichstand steht das Team weiter oben in der Tabelle vorne
+        self.reihenfolge_bonus = np.arange(len(self.teams) - 1, -1, -1, dtype=np.int64)
+
+        # Spielindex -> (Tore Heim, Tore Auswärts) der bereits eingetragenen Spiele
+        self.feste_ergebnisse = {}
+
+        anzahl_teams = len(self.teams)
+        # Kleinster Datentyp, der alle Ergebnisindizes des Rasters fasst
+        self.ergebnisse = np.empty(
+            (0, len(self.fixtures)),
+            dtype=np.min_scalar_type(len(wahrscheinlichkeiten) - 1),
+        )
+        self.schluessel = np.empty((0, anzahl_teams), dtype=np.int64)
+        self.plaetze = np.empty((0, anzahl_teams), dtype=np.int8)
+        self.zaehlmatrix = np.zeros((anzahl_teams, anzahl_teams), dtype=np.int64)
+        self.aufstocken(runs)
+
+    @property
+    def runs(self):
+        """
+        int: Anzahl der vorgehaltenen Runs.
+        """
+        return len(self.schluessel)
+
+    def verteilung(self):
+        """
+        Returns:
+            np.ndarray: Wahrscheinlichkeitsmatrix der Form (teams, plätze), Zeilen in
+            Tabellenreihenfolge.
+        """
+        return self.zaehlmatrix / self.runs
+
+    def _zaehlen(self, plaetze):
+        """
+        Zählt die Platzierungen einer Menge von Runs.
+        """
+        return np.stack(
+            [
+                np.bincount(plaetze[:, team], minlength=len(self.teams))
+                for team in range(len(self.teams))
+            ]
+        )
+
+    def _feste_deltas(self, spiel):
+        """
+        Berechnet die Schlüsseländerungen eines eingetragenen Ergebnisses.
+        """
+        tore_heim, tore_auswaerts = self.feste_ergebnisse[spiel]
+        delta_heim, delta_auswaerts = schluessel_deltas(
+            np.array([tore_heim]), np.array([tore_auswaerts])
+        )
+        return delta_heim[0], delta_auswaerts[0]
+
+    def aufstocken(self, runs):
+        """
+        Zieht weitere Runs. Bereits eingetragene Ergebnisse gelten auch für die neuen Runs.
+        Args:
+            runs (int): Anzahl der zusätzlichen Runs.
+        """
+        delta_heim, delta_auswaerts = self.deltas
+        anzahl_spiele = len(self.fixtures)
+
+        # Einmal auf die neue Größe anlegen und blockweise füllen, statt die Arrays
+        # je Block aneinanderzuhängen
+        start = self.runs
+        ende = start + runs
+        for name in ("ergebnisse", "schluessel", "plaetze"):
+            alt = getattr(self, name)
+            neu = np.empty((ende,) + alt.shape[1:], dtype=alt.dtype)
+            neu[:start] = alt
+            setattr(self, name, neu)
+
+        while start < ende:
+            block = min(self.blockgroesse, ende - start)
+            ergebnisse = self.ergebnis_sampler.ziehen((block, anzahl_spiele), self.rng)
+            aenderungen = np.concatenate(
+                (delta_heim[ergebnisse], delta_auswaerts[ergebnisse]), axis=1
+            )
+            for spiel in self.feste_ergebnisse:
+                aenderungen[:, spiel] = self._feste_deltas(spiel)[0]
+                aenderungen[:, anzahl_spiele + spiel] = self._feste_deltas(spiel)[1]
+            schluessel = (aenderungen.astype(np.float64) @ self.inzidenz).astype(
+                np.int64
+            ) + self.basis
+            schluessel = schluessel * len(self.teams) + self.reihenfolge_bonus
+            plaetze = _plaetze(schluessel)
+
+            self.ergebnisse[start : start + block] = ergebnisse
+            self.schluessel[start : start + block] = schluessel
+            self.plaetze[start : start + block] = plaetze
+            self.zaehlmatrix += self._zaehlen(plaetze)
+            start += block
+
+    def ergebnis_eintragen(self, heim, auswaerts, tore_heim, tore_auswaerts):
+        """
+        Bedingt alle Runs auf ein echtes Ergebnis. Ein bereits eingetragenes Ergebnis
+        desselben Spiels wird dabei korrigiert.
+        Args:
+            heim (str): Name des Heimteams.
+            auswaerts (str): Name des Auswärtsteams.
+            tore_heim (int): Die Tore des Heimteams.
+            tore_auswaerts (int): Die Tore des Auswärtsteams.
+        """
+        try:
+            spiel = self.fixtures.index((heim, auswaerts))
+        except ValueError:
+            raise ValueError(
+                f"Spiel {heim} - {auswaerts} ist keine verbleibende Paarung."
+            ) from None
+        h, a = self.paarungen[spiel].tolist()
+
+        # Bisherige Schlüsseländerungen des Spiels je Run
+        if spiel in self.feste_ergebnisse:
+            alt_heim, alt_auswaerts = self._feste_deltas(spiel)
+        else:
+            alt_heim = self.deltas[0][self.ergebnisse[:, spiel]]
+            alt_auswaerts = self.deltas[1][self.ergebnisse[:, spiel]]
+        self.feste_ergebnisse[spiel] = (int(tore_heim), int(tore_auswaerts))
+        neu_heim, neu_auswaerts = self._feste_deltas(spiel)
+
+        # Die übrigen Teams verschieben sich nur, wenn Heim- oder Auswärtsteam an ihnen
+        # vorbeiziehen oder hinter sie zurückfallen. In Runs, in denen sich die
+        # Schlüssel nicht ändern, heben sich die Vergleiche gegenseitig auf.
+        anzahl_teams = len(self.teams)
+        verschiebung = np.zeros(self.plaetze.shape, dtype=np.int8)
+        for team in (h, a):
+            verschiebung -= self.schluessel[:, [team]] > self.schluessel
+        self.schluessel[:, h] += (neu_heim - alt_heim) * anzahl_teams
+        self.schluessel[:, a] += (neu_auswaerts - alt_auswaerts) * anzahl_teams
+        vor_neu = {}
+        for team in (h, a):
+            vor_neu[team] = self.schluessel[:, [team]] > self.schluessel
+            verschiebung += vor_neu[team]
+        plaetze = self.plaetze + verschiebung
+
+        # Die Ordnung ist strikt: Wer nicht hinter dem Team steht, steht davor
+        for team in (h, a):
+            plaetze[:, team] = (
+                anzahl_teams - 1 - np.count_nonzero(vor_neu[team], axis=1)
+            )
+
+        self.zaehlmatrix = self._zaehlen(plaetze)
+        self.plaetze = plaetze
+
+    def ergebnisse_eintragen(self, ergebnisse):
+        """
+        Trägt mehrere Ergebnisse ein, z.B. aus normalize_results(get_matchday_results(...)).
+        Ergebnisse von Spielen, die keine verbleibende Paarung sind, werden übersprungen.
+        Args:
+            ergebnisse (list of dict): Ergebnisse mit den Schlüsseln Heim, Auswaerts,
+            Tore_Heim und Tore_Auswaerts.
+        Returns:
+            int: Anzahl der eingetragenen Ergebnisse.
+        """
+        eingetragen = 0
+        for ergebnis in ergebnisse:
+            if (ergebnis["Heim"], ergebnis["Auswaerts"]) not in self.fixtures:
+                continue
+            self.ergebnis_eintragen(
+                ergebnis["Heim"],
+                ergebnis["Auswaerts"],
+                ergebnis["Tore_Heim"],
+                ergebnis["Tore_Auswaerts"],
+            )
+            eingetragen += 1
+        return eingetragen
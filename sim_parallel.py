@@ -0,0 +1,94 @@
+"""
+Verteilt Simulationen in Shards auf mehrere Prozesse.
+
+Jeder Shard bekommt einen eigenen Zufallsstrom, der per SeedSequence aus einem
+gemeinsamen Master-Seed abgeleitet wird. Für einen festen Seed und eine feste Anzahl
+an Workern sind die Ergebnisse damit bitgenau reproduzierbar.
+"""
+
+import random
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+
+def aufteilen(runs, shards):
+    """
+    Teilt die Anzahl der Runs möglichst gleichmäßig auf die Shards auf.
+    Args:
+        runs (int): Gesamtzahl der Simulationen.
+        shards (int): Anzahl der Shards.
+    Returns:
+        list: Anzahl der Runs je Shard.
+    """
+    basis, rest = divmod(runs, shards)
+    return [basis + (1 if i < rest else 0) for i in range(shards)]
+
+
+def seed_sequenzen(seed, shards):
+    """
+    Leitet aus einem Master-Seed unabhängige Seed-Sequenzen für die Shards ab.
+    Args:
+        seed (int): Master-Seed. Bei None wird frische Entropie verwendet.
+        shards (int): Anzahl der Shards.
+    Returns:
+        list: Eine np.random.SeedSequence je Shard.
+    """
+    return np.random.SeedSequence(seed).spawn(shards)
+
+
+def python_rng(seed_sequenz):
+    """
+    Erzeugt einen random.Random-Generator aus einer Seed-Sequenz.
+    Args:
+        seed_sequenz (np.random.SeedSequence): Seed-Sequenz des Shards.
+    Returns:
+        random.Random: Zufallsgenerator für die Python-Engine.
+    """
+    return random.Random(seed_sequenz.generate_state(4).tobytes())
+
+
+def run_sharded(shard_funktion, runs, workers=1, seed=None, args=()):
+    """
+    Führt eine Shard-Funktion auf mehreren Prozessen aus.
+    Args:
+        shard_funktion (callable): Funktion mit der Signatur
+        shard_funktion(runs, seed_sequenz, *args). Muss auf Modulebene definiert sein,
+        damit sie an die Worker-Prozesse übergeben werden kann.
+        runs (int): Gesamtzahl der Simulationen.
+        workers (int): Anzahl der Prozesse (und Shards).
+        seed (int): Optionaler Master-Seed.
+        args (tuple): Weitere Argumente für die Shard-Funktion.
+    Returns:
+        list: Die Ergebnisse der Shards in fester Shard-Reihenfolge.
+    """
+    if workers < 1:
+        raise ValueError("workers muss mindestens 1 sein.")
+
+    shard_runs = aufteilen(runs, workers)
+    sequenzen = seed_sequenzen(seed, workers)
+
+    if workers == 1:
+        return [shard_funktion(shard_runs[0], sequenzen[0], *args)]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(shard_funktion, anzahl, sequenz, *args)
+            for anzahl, sequenz in zip(shard_runs, sequenzen)
+        ]
+        return [future.result() for future in futures]
+
+
+def merge_statistiken(statistiken):
+    """
+    Führt die Platzierungs-Counter mehrerer Shards zusammen.
+    Args:
+        statistiken (list of dict): Pro Shard ein dict mit einem Counter je Team.
+    Returns:
+        dict: Pro Team ein Counter mit der Summe aller Shards.
+    """
+    gesamt = {}
+    for statistik in statistiken:
+        for team, counter in statistik.items():
+            gesamt.setdefault(team, Counter()).update(counter)
+    return gesamt
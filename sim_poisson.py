@@ -0,0 +1,323 @@
+"""
+Torverteilung je Paarung aus Angriffs- und Abwehrstärken (Poisson / Dixon-Coles).
+
+Die erwarteten Tore eines Spiels sind
+    Heim:     heimvorteil * angriff[heim] * abwehr[auswaerts]
+    Auswärts: angriff[auswaerts] * abwehr[heim]
+wobei abwehr die Anfälligkeit eines Teams beschreibt (größer = mehr Gegentore). Die
+Stärken werden per Maximum-Likelihood mit dem iterativen Verfahren nach Maher
+geschätzt, das je Iteration nur einige bincount-Aufrufe über alle Spiele benötigt.
+Anschließend wird der Dixon-Coles-Parameter rho, der die Ergebnisse 0:0, 1:0, 0:1 und
+1:1 korrigiert, per Goldener-Schnitt-Suche bestimmt.
+
+Vor der Simulation wird für jede verbleibende Paarung einmal die Matrix der
+Ergebniswahrscheinlichkeiten berechnet; gezogen wird danach nur noch aus diesen Tabellen.
+"""
+
+import bisect
+import itertools
+import math
+import random
+import numpy as np
+from sim import AliasTabelle
+
+# Höchste berücksichtigte Toranzahl je Team; die Restwahrscheinlichkeit wird auf die
+# übrigen Ergebnisse verteilt
+STANDARD_MAX_TORE = 10
+
+STANDARD_MAX_ITERATIONEN = 200
+
+# Untergrenze der Stärken, damit z.B. ein Team ohne Gegentor nicht unschlagbar wird
+MIN_STAERKE = 0.05
+
+
+def _poisson(erwartung, max_tore):
+    """
+    Berechnet Poisson-Wahrscheinlichkeiten für 0..max_tore Tore.
+    Args:
+        erwartung (np.ndarray): Erwartete Tore, beliebige Form.
+        max_tore (int): Höchste Toranzahl.
+    Returns:
+        np.ndarray: Wahrscheinlichkeiten mit zusätzlicher letzter Achse der Länge
+        max_tore + 1.
+    """
+    tore = np.arange(max_tore + 1)
+    log_fakultaet = np.cumsum(np.log(np.maximum(tore, 1)))
+    erwartung = np.asarray(erwartung, dtype=np.float64)[..., None]
+    return np.exp(tore * np.log(erwartung) - erwartung - log_fakultaet)
+
+
+def _tau(tore_heim, tore_auswaerts, lambda_heim, lambda_auswaerts, rho):
+    """
+    Dixon-Coles-Korrekturfaktor für niedrige Ergebnisse (elementweise).
+    """
+    tau = np.ones(np.broadcast(tore_heim, tore_auswaerts, lambda_heim).shape)
+    tau = np.where(
+        (tore_heim == 0) & (tore_auswaerts == 0),
+        1 - lambda_heim * lambda_auswaerts * rho,
+        tau,
+    )
+    tau = np.where((tore_heim == 0) & (tore_auswaerts == 1), 1 + lambda_heim * rho, tau)
+    tau = np.where(
+        (tore_heim == 1) & (tore_auswaerts == 0), 1 + lambda_auswaerts * rho, tau
+    )
+    return np.where((tore_heim == 1) & (tore_auswaerts == 1), 1 - rho, tau)
+
+
+def _goldener_schnitt(funktion, links, rechts, iterationen=80):
+    """
+    Sucht das Maximum einer unimodalen Funktion auf einem Intervall.
+    """
+    faktor = (math.sqrt(5) - 1) / 2
+    a = rechts - faktor * (rechts - links)
+    b = links + faktor * (rechts - links)
+    wert_a, wert_b = funktion(a), funktion(b)
+    for _ in range(iterationen):
+        if wert_a < wert_b:
+            links, a, wert_a = a, b, wert_b
+            b = links + faktor * (rechts - links)
+            wert_b = funktion(b)
+        else:
+            rechts, b, wert_b = b, a, wert_a
+            a = rechts - faktor * (rechts - links)
+            wert_a = funktion(a)
+    return (links + rechts) / 2
+
+
+class PoissonModell:
+    """
+    Angriffs- und Abwehrstärken aller Teams mit Heimvorteil und Dixon-Coles-Korrektur.
+    """
+
+    __slots__ = ("teams", "team_ids", "angriff", "abwehr", "heimvorteil", "rho")
+
+    def __init__(self, teams, angriff, abwehr, heimvorteil, rho=0.0):
+        """
+        Args:
+            teams (list): Teamnamen.
+            angriff (list): Angriffsstärke je Team (Mittelwert 1).
+            abwehr (list): Abwehranfälligkeit je Team.
+            heimvorteil (float): Faktor für die erwarteten Heimtore.
+            rho (float): Dixon-Coles-Parameter (0 = unabhängige Poisson-Verteilungen).
+        """
+        self.teams = list(teams)
+        self.team_ids = {team: i for i, team in enumerate(self.teams)}
+        self.angriff = np.asarray(angriff, dtype=np.float64)
+        self.abwehr = np.asarray(abwehr, dtype=np.float64)
+        self.heimvorteil = float(heimvorteil)
+        self.rho = float(rho)
+
+    @classmethod
+    def anpassen(
+        cls,
+        ergebnisse,
+        dixon_coles=True,
+        max_iterationen=STANDARD_MAX_ITERATIONEN,
+        toleranz=1e-10,
+    ):
+        """
+        Schätzt das Modell per Maximum-Likelihood aus bisherigen Ergebnissen.
+        Args:
+            ergebnisse (list of dict): Ergebnisse im Format von normalize_results.
+            dixon_coles (bool): Ob rho geschätzt werden soll.
+            max_iterationen (int): Maximale Anzahl an Iterationen.
+            toleranz (float): Abbruch, sobald sich keine Stärke mehr um mehr ändert.
+        Returns:
+            PoissonModell: Das angepasste Modell.
+        """
+        if not ergebnisse:
+            raise ValueError("Zum Anpassen werden Ergebnisse benötigt.")
+
+        teams = sorted(
+            {e["Heim"] for e in ergebnisse} | {e["Auswaerts"] for e in ergebnisse}
+        )
+        team_ids = {team: i for i, team in enumerate(teams)}
+        heim = np.array([team_ids[e["Heim"]] for e in ergebnisse])
+        auswaerts = np.array([team_ids[e["Auswaerts"]] for e in ergebnisse])
+        tore_heim = np.array([e["Tore_Heim"] for e in ergebnisse], dtype=np.float64)
+        tore_auswaerts = np.array(
+            [e["Tore_Auswaerts"] for e in ergebnisse], dtype=np.float64
+        )
+
+        anzahl = len(teams)
+        tore = np.bincount(heim, tore_heim, anzahl) + np.bincount(
+            auswaerts, tore_auswaerts, anzahl
+        )
+        gegentore = np.bincount(heim, tore_auswaerts, anzahl) + np.bincount(
+            auswaerts, tore_heim, anzahl
+        )
+        angriff = np.ones(anzahl)
+        abwehr = np.ones(anzahl)
+        heimvorteil = max(tore_heim.sum(), 1.0) / max(tore_auswaerts.sum(), 1.0)
+
+        for _ in range(max_iterationen):
+            neu_angriff = tore / (
+                np.bincount(heim, heimvorteil * abwehr[auswaerts], anzahl)
+                + np.bincount(auswaerts, abwehr[heim], anzahl)
+            )
+            neu_angriff = np.maximum(neu_angriff / neu_angriff.mean(), MIN_STAERKE)
+            neu_abwehr = np.maximum(
+                gegentore
+                / (
+                    np.bincount(heim, neu_angriff[auswaerts], anzahl)
+                    + np.bincount(auswaerts, heimvorteil * neu_angriff[heim], anzahl)
+                ),
+                MIN_STAERKE,
+            )
+            heimvorteil = (
+                tore_heim.sum() / (neu_angriff[heim] * neu_abwehr[auswaerts]).sum()
+            )
+
+            aenderung = max(
+                np.abs(neu_angriff - angriff).max(), np.abs(neu_abwehr - abwehr).max()
+            )
+            angriff, abwehr = neu_angriff, neu_abwehr
+            if aenderung < toleranz:
+                break
+
+        modell = cls(teams, angriff, abwehr, heimvorteil)
+        if dixon_coles:
+            lambda_heim, lambda_auswaerts = modell.erwartete_tore(heim, auswaerts)
+
+            def log_likelihood(rho):
+                return np.log(
+                    _tau(tore_heim, tore_auswaerts, lambda_heim, lambda_auswaerts, rho)
+                ).sum()
+
+            # rho nur so weit zulassen, dass alle Korrekturfaktoren positiv bleiben
+            grenze_unten = max(-1 / lambda_heim.max(), -1 / lambda_auswaerts.max())
+            grenze_oben = min(1 / (lambda_heim * lambda_auswaerts).max(), 1.0)
+            spielraum = 1e-6
+            modell.rho = _goldener_schnitt(
+                log_likelihood, grenze_unten + spielraum, grenze_oben - spielraum
+            )
+        return modell
+
+    def team_id(self, team):
+        """
+        Liefert die ID eines Teams im Modell.
+        """
+        try:
+            return self.team_ids[team]
+        except KeyError:
+            raise ValueError(f"Team '{team}' ist im Modell nicht bekannt.") from None
+
+    def erwartete_tore(self, heim, auswaerts):
+        """
+        Args:
+            heim (np.ndarray): IDs der Heimteams.
+            auswaerts (np.ndarray): IDs der Auswärtsteams.
+        Returns:
+            tuple: (lambda_heim, lambda_auswaerts) je Spiel.
+        """
+        return (
+            self.heimvorteil * self.angriff[heim] * self.abwehr[auswaerts],
+            self.angriff[auswaerts] * self.abwehr[heim],
+        )
+
+    def paarungs_matrizen(self, fixtures, max_tore=STANDARD_MAX_TORE):
+        """
+        Berechnet für jede Paarung die Matrix der Ergebniswahrscheinlichkeiten.
+        Args:
+            fixtures (list of tuples): Liste von (Heim, Auswärts)-Tupeln.
+            max_tore (int): Höchste berücksichtigte Toranzahl je Team.
+        Returns:
+            np.ndarray: Wahrscheinlichkeiten der Form (spiele, max_tore + 1,
+            max_tore + 1); Eintrag [k, h, a] ist die Wahrscheinlichkeit für h:a in
+            Spiel k. Jede Matrix summiert sich zu 1.
+        """
+        heim = np.array([self.team_id(h) for h, _ in fixtures], dtype=np.intp)
+        auswaerts = np.array([self.team_id(a) for _, a in fixtures], dtype=np.intp)
+        lambda_heim, lambda_auswaerts = self.erwartete_tore(heim, auswaerts)
+
+        matrizen = (
+            _poisson(lambda_heim, max_tore)[:, :, None]
+            * _poisson(lambda_auswaerts, max_tore)[:, None, :]
+        )
+        tore = np.arange(max_tore + 1)
+        matrizen *= _tau(
+            tore[None, :, None],
+            tore[None, None, :],
+            lambda_heim[:, None, None],
+            lambda_auswaerts[:, None, None],
+            self.rho,
+        )
+        return matrizen / matrizen.sum(axis=(1, 2), keepdims=True)
+
+
+def ergebnis_raster(max_tore):
+    """
+    Liefert Heim- und Auswärtstore je Index der abgeflachten Ergebnismatrix.
+    Returns:
+        tuple: (tore_heim, tore_auswaerts) als int64-Arrays der Länge (max_tore + 1)².
+    """
+    tore = np.arange(max_tore + 1, dtype=np.int64)
+    return np.repeat(tore, len(tore)), np.tile(tore, len(tore))
+
+
+class PaarungsAliasTabelle:
+    """
+    Alias-Tabellen für viele Verteilungen gleicher Länge, z.B. eine je Paarung. Beim
+    Ziehen gehört die letzte Achse zu den Verteilungen.
+    """
+
+    __slots__ = ("wahrscheinlichkeit", "alias")
+
+    def __init__(self, gewichte):
+        """
+        Args:
+            gewichte (np.ndarray): Gewichte der Form (verteilungen, werte).
+        """
+        gewichte = np.asarray(gewichte, dtype=np.float64)
+        tabellen = [AliasTabelle(zeile) for zeile in gewichte]
+        self.wahrscheinlichkeit = np.ones(gewichte.shape)
+        self.alias = np.zeros(gewichte.shape, dtype=np.intp)
+        for i, tabelle in enumerate(tabellen):
+            self.wahrscheinlichkeit[i] = tabelle.wahrscheinlichkeit
+            self.alias[i] = tabelle.alias
+
+    def ziehen(self, groesse, rng):
+        """
+        Zieht je Verteilung Indizes.
+        Args:
+            groesse (tuple): Form des Ergebnisses, z.B. (runs, spiele); die letzte Achse
+            muss der Anzahl der Verteilungen entsprechen.
+            rng (np.random.Generator): Zufallsgenerator.
+        Returns:
+            np.ndarray: Gezogene Indizes.
+        """
+        verteilungen, anzahl = self.wahrscheinlichkeit.shape
+        zeilen = np.arange(verteilungen)
+        u = rng.random(groesse) * anzahl
+        index = np.minimum(u.astype(np.intp), anzahl - 1)
+        return np.where(
+            u - index < self.wahrscheinlichkeit[zeilen, index],
+            index,
+            self.alias[zeilen, index],
+        )
+
+
+class ErgebnisSampler:
+    """
+    Zieht einzelne Ergebnisse aus der Ergebnismatrix einer Paarung (für die
+    Python-Engine, Gegenstück zu TorSampler).
+    """
+
+    __slots__ = ("_kumuliert", "_tore")
+
+    def __init__(self, matrix):
+        """
+        Args:
+            matrix (np.ndarray): Ergebniswahrscheinlichkeiten der Form (n, n).
+        """
+        self._kumuliert = list(itertools.accumulate(np.ravel(matrix).tolist()))
+        self._tore = len(matrix)
+
+    def ziehen(self, rng=None):
+        """
+        Returns:
+            tuple: (Heimtore, Auswärtstore).
+        """
+        zufall = (rng or random).random() * self._kumuliert[-1]
+        index = min(bisect.bisect(self._kumuliert, zufall), len(self._kumuliert) - 1)
+        return divmod(index, self._tore)
@@ -0,0 +1,222 @@
+"""
+Abfragen über gespeicherte Endtabellen (siehe sim_store), ohne neu zu simulieren.
+
+Beantwortet werden gemeinsame Wahrscheinlichkeiten über alle Runs, z.B. "landet Team A
+vor Team B", "landet Team A auf Platz 1 oder 2", "steigen X und Y beide ab" oder "wie
+viele Punkte reichen mit 95% Wahrscheinlichkeit für den Klassenerhalt". Jede Abfrage ist
+eine vektorisierte Reduktion über die Spalten des Speichers.
+
+Die benötigten Spalten je Team werden beim ersten Zugriff einmal aus dem Speicher
+gelesen und ebenso wie die Ergebnisse der Abfragen zwischengespeichert, sodass
+wiederholte Abfragen nichts mehr lesen oder rechnen.
+"""
+
+import numpy as np
+from sim_store import Endtabellen
+
+
+def _plaetze(plaetze):
+    """
+    Normalisiert einen Platz oder eine Menge von Plätzen zu einem sortierten Tupel.
+    """
+    if isinstance(plaetze, (int, np.integer)):
+        return (int(plaetze),)
+    return tuple(sorted({int(platz) for platz in plaetze}))
+
+
+class SimulationsAbfrage:
+    """
+    Abfragen über die Endtabellen aller Runs einer Simulation.
+    """
+
+    def __init__(self, endtabellen):
+        """
+        Args:
+            endtabellen (Endtabellen or str): Geöffneter Speicher oder sein Verzeichnis.
+        """
+        if isinstance(endtabellen, str):
+            endtabellen = Endtabellen(endtabellen)
+        if len(endtabellen) == 0:
+            raise ValueError("Der Speicher enthält keine Runs.")
+        self.endtabellen = endtabellen
+        self.teams = endtabellen.teams
+        self.runs = len(endtabellen)
+        self._spalten = {}
+        self._team_spalten = {}
+        self._ergebnisse = {}
+
+    def _team(self, team):
+        """
+        Index eines Teams in Tabellenreihenfolge.
+        """
+        try:
+            return self.teams.index(team)
+        except ValueError as fehler:
+            raise ValueError(f"Unbekanntes Team '{team}'.") from fehler
+
+    def _team_spalte(self, name, team):
+        """
+        Spalte eines Teams über alle Runs, einmal gelesen und zwischengespeichert.
+        """
+        schluessel = (name, team)
+        if schluessel not in self._team_spalten:
+            if name not in self._spalten:
+                self._spalten[name] = self.endtabellen.spalte(name)
+            self._team_spalten[schluessel] = np.array(
+                self._spalten[name][:, self._team(team)]
+            )
+        return self._team_spalten[schluessel]
+
+    def _gecacht(self, schluessel, berechne):
+        """
+        Liefert das Ergebnis einer Abfrage aus dem Zwischenspeicher oder berechnet es.
+        """
+        if schluessel not in self._ergebnisse:
+            self._ergebnisse[schluessel] = berechne()
+        return self._ergebnisse[schluessel]
+
+    def maske_platz(self, team, plaetze):
+        """
+        Args:
+            team (str): Teamname.
+            plaetze (int or iterable): Platz oder Plätze, z.B. range(16, 19).
+        Returns:
+            np.ndarray: Je Run, ob das Team auf einem der Plätze landet.
+        """
+        tabelle = np.zeros(len(self.teams) + 1, dtype=bool)
+        tabelle[list(_plaetze(plaetze))] = True
+        return tabelle[self._team_spalte("platz", team)]
+
+    def maske_vor(self, team_a, team_b):
+        """
+        Args:
+            team_a (str): Teamname.
+            team_b (str): Teamname.
+        Returns:
+            np.ndarray: Je Run, ob Team A vor Team B landet.
+        """
+        return self._team_spalte("platz", team_a) < self._team_spalte("platz", team_b)
+
+    def wahrscheinlichkeit(self, *masken):
+        """
+        Wahrscheinlichkeit, dass alle Bedingungen gleichzeitig erfüllt sind.
+        Args:
+            *masken (np.ndarray): Boolesche Masken je Run, z.B. aus maske_platz.
+        Returns:
+            float: Anteil der Runs, in denen alle Masken zutreffen.
+        """
+        if not masken:
+            return 1.0
+        return float(np.logical_and.reduce(masken).mean())
+
+    def platz_in(self, team, plaetze):
+        """
+        Wahrscheinlichkeit, dass ein Team auf einem der Plätze landet.
+        Args:
+            team (str): Teamname.
+            plaetze (int or iterable): Platz oder Plätze, z.B. (1, 2) für den direkten
+            Aufstieg.
+        Returns:
+            float: Wahrscheinlichkeit zwischen 0 und 1.
+        """
+        plaetze = _plaetze(plaetze)
+        return self._gecacht(
+            ("platz_in", team, plaetze),
+            lambda: self.wahrscheinlichkeit(self.maske_platz(team, plaetze)),
+        )
+
+    def vor(self, team_a, team_b):
+        """
+        Wahrscheinlichkeit, dass Team A in der Endtabelle vor Team B steht.
+        Args:
+            team_a (str): Teamname.
+            team_b (str): Teamname.
+        Returns:
+            float: Wahrscheinlichkeit zwischen 0 und 1.
+        """
+        return self._gecacht(
+            ("vor", team_a, team_b),
+            lambda: self.wahrscheinlichkeit(self.maske_vor(team_a, team_b)),
+        )
+
+    def alle_in(self, teams, plaetze):
+        """
+        Wahrscheinlichkeit, dass alle Teams gleichzeitig auf einem der Plätze landen,
+        z.B. dass zwei Teams beide absteigen.
+        Args:
+            teams (iterable): Teamnamen.
+            plaetze (int or iterable): Platz oder Plätze.
+        Returns:
+            float: Wahrscheinlichkeit zwischen 0 und 1.
+        """
+        teams = tuple(sorted(set(teams)))
+        plaetze = _plaetze(plaetze)
+        return self._gecacht(
+            ("alle_in", teams, plaetze),
+            lambda: self.wahrscheinlichkeit(
+                *(self.maske_platz(team, plaetze) for team in teams)
+            ),
+        )
+
+    def punkte_fuer(self, plaetze, wahrscheinlichkeit=0.95, team=None):
+        """
+        Punktzahl, ab der ein Team mit der gegebenen Wahrscheinlichkeit auf einem der
+        Plätze landet, z.B. plaetze=range(1, 16) für den sicheren Klassenerhalt.
+        Args:
+            plaetze (int or iterable): Platz oder Plätze.
+            wahrscheinlichkeit (float): Geforderte Wahrscheinlichkeit.
+            team (str): Optional nur die Runs dieses Teams. Ohne Angabe werden alle
+            Teams gemeinsam ausgewertet.
+        Returns:
+            int: Kleinste Punktzahl p, sodass unter allen Endtabellen mit mindestens p
+            Punkten der Anteil auf den Plätzen mindestens wahrscheinlichkeit beträgt,
+            oder None, wenn keine Punktzahl das erreicht.
+        """
+        plaetze = _plaetze(plaetze)
+        return self._gecacht(
+            ("punkte_fuer", plaetze, wahrscheinlichkeit, team),
+            lambda: self._punkte_fuer(plaetze, wahrscheinlichkeit, team),
+        )
+
+    def _punkte_fuer(self, plaetze, wahrscheinlichkeit, team):
+        """
+        Berechnung von punkte_fuer über Häufigkeiten je Punktzahl.
+        """
+        teams = self.teams if team is None else [team]
+        punkte = [self._team_spalte("punkte", t) for t in teams]
+        versatz = int(min(spalte.min() for spalte in punkte))
+        # Häufigkeiten je (Punktzahl, Treffer) über alle Teams, ohne die Spalten
+        # aneinanderzuhängen
+        breite = 2 * (int(max(spalte.max() for spalte in punkte)) - versatz + 1)
+        haeufigkeiten = np.zeros(breite, dtype=np.int64)
+        for t, spalte in zip(teams, punkte):
+            haeufigkeiten += np.bincount(
+                (spalte.astype(np.intp) - versatz) * 2 + self.maske_platz(t, plaetze),
+                minlength=breite,
+            )
+        haeufigkeiten = haeufigkeiten.reshape(-1, 2)
+        gesamt, erfolgreich = haeufigkeiten.sum(axis=1), haeufigkeiten[:, 1]
+        # Kumuliert von der höchsten Punktzahl abwärts: Runs mit mindestens p Punkten
+        gesamt_ab = np.cumsum(gesamt[::-1])[::-1]
+        erfolgreich_ab = np.cumsum(erfolgreich[::-1])[::-1]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            anteil = erfolgreich_ab / gesamt_ab
+        erreicht = (anteil >= wahrscheinlichkeit) & (gesamt_ab > 0)
+        if not erreicht.any():
+            return None
+        # Kleinste Punktzahl, ab der die Bedingung für alle höheren Punktzahlen gilt
+        nicht_erreicht = np.flatnonzero(~erreicht & (gesamt_ab > 0))
+        start = 0 if len(nicht_erreicht) == 0 else nicht_erreicht[-1] + 1
+        if start >= len(gesamt):
+            return None
+        return int(start + versatz)
+
+    def verteilung(self):
+        """
+        Returns:
+            np.ndarray: Platzierungswahrscheinlichkeiten der Form (teams, plätze) wie
+            bei simulate_runs_vectorized / runs.
+        """
+        return self._gecacht(
+            ("verteilung",), lambda: self.endtabellen.zaehlmatrix() / self.runs
+        )
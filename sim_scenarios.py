@@ -0,0 +1,127 @@
+"""
+Was-wäre-wenn-Szenarien mit gemeinsamen Zufallszahlen.
+
+Ein Szenario legt die Ergebnisse einzelner verbleibender Spiele fest. Alle Szenarien
+werden auf denselben gezogenen Ergebnissen ausgewertet: Je Block wird einmal gezogen,
+die Endtabellen werden einmal berechnet und für jedes Szenario nur die Schlüssel der
+Teams mit festgelegten Spielen korrigiert. Die Kosten liegen damit nahe bei einer
+einzigen Simulation, und Unterschiede zwischen Szenarien schwanken deutlich weniger als
+bei getrennten Simulationen, weil das Zufallsrauschen der übrigen Spiele identisch ist.
+"""
+
+import numpy as np
+from league_table import LeagueTable
+from sim import AliasTabelle
+from sim_vectorized import (
+    STANDARD_BLOCKGROESSE,
+    basis_schluessel,
+    ergebnis_tabelle,
+    inzidenzmatrix,
+    platzierungen_zaehlen,
+    schluessel_aus_ergebnissen,
+    schluessel_deltas,
+)
+
+
+def szenario_korrekturen(tabelle, fixtures, szenario):
+    """
+    Übersetzt ein Szenario in Spielindizes, Team-IDs und Schlüsseländerungen.
+    Args:
+        tabelle (LeagueTable): Die Tabelle.
+        fixtures (list of tuples): Liste von (Heim, Auswärts)-Tupeln.
+        szenario (dict): {(Heim, Auswärts): (Tore Heim, Tore Auswärts)}.
+    Returns:
+        list: Pro festgelegtem Spiel ein Tupel (spiel, heim, auswaerts, delta_heim,
+        delta_auswaerts).
+    """
+    paarungen = [tuple(paarung) for paarung in fixtures]
+    korrekturen = []
+    for (heim, auswaerts), (tore_heim, tore_auswaerts) in szenario.items():
+        if (heim, auswaerts) not in paarungen:
+            raise ValueError(
+                f"Spiel {heim} - {auswaerts} ist keine verbleibende Paarung."
+            )
+        delta_heim, delta_auswaerts = schluessel_deltas(
+            np.array([tore_heim]), np.array([tore_auswaerts])
+        )
+        korrekturen.append(
+            (
+                paarungen.index((heim, auswaerts)),
+                tabelle.team_id(heim),
+                tabelle.team_id(auswaerts),
+                delta_heim[0],
+                delta_auswaerts[0],
+            )
+        )
+    return korrekturen
+
+
+def simulate_scenarios(
+    table_raw,
+    fixtures,
+    szenarien,
+    runs,
+    torverteilung=None,
+    torgewichte_heim=None,
+    torgewichte_auswaerts=None,
+    rng=None,
+    blockgroesse=STANDARD_BLOCKGROESSE,
+):
+    """
+    Simuliert mehrere Szenarien auf denselben Zufallszahlen.
+    Args:
+        table_raw (list of dict): Eingelesene Tabelle.
+        fixtures (list of tuples): Liste von (Heim, Auswärts)-Tupeln.
+        szenarien (dict): Name -> {(Heim, Auswärts): (Tore Heim, Tore Auswärts)}. Ein
+        leeres Szenario liefert die Simulation ohne festgelegte Ergebnisse.
+        runs (int): Anzahl der durchzuführenden Simulationen.
+        torverteilung (list): Optionale Torverteilung für die Simulation.
+        torgewichte_heim (list): Optionale Heimtor-Gewichte.
+        torgewichte_auswaerts (list): Optionale Auswärtstor-Gewichte.
+        rng (np.random.Generator): Optionaler Zufallsgenerator.
+        blockgroesse (int): Anzahl der Saisons, die gleichzeitig im Speicher liegen.
+    Returns:
+        dict: Name -> Zählmatrix der Form (teams, plätze), Zeilen in Tabellenreihenfolge.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+
+    tabelle = LeagueTable.aus_tabelle(table_raw)
+    paarungen = tabelle.paarungen_indizes(fixtures)
+    wahrscheinlichkeiten, tore_heim, tore_auswaerts = ergebnis_tabelle(
+        torverteilung, torgewichte_heim, torgewichte_auswaerts
+    )
+    ergebnis_sampler = AliasTabelle(wahrscheinlichkeiten)
+    delta_heim, delta_auswaerts = schluessel_deltas(tore_heim, tore_auswaerts)
+    basis = basis_schluessel(*tabelle.als_arrays())
+    inzidenz = inzidenzmatrix(paarungen[:, 0], paarungen[:, 1], len(tabelle))
+    korrekturen = {
+        name: szenario_korrekturen(tabelle, fixtures, szenario)
+        for name, szenario in szenarien.items()
+    }
+
+    zaehlung = {
+        name: np.zeros((len(tabelle), len(tabelle)), dtype=np.int64)
+        for name in szenarien
+    }
+    verbleibend = runs
+    while verbleibend > 0:
+        block = min(blockgroesse, verbleibend)
+        ergebnisse = ergebnis_sampler.ziehen((block, len(paarungen)), rng)
+        schluessel = schluessel_aus_ergebnissen(
+            basis, inzidenz, ergebnisse, (delta_heim, delta_auswaerts)
+        )
+
+        for name, spiele in korrekturen.items():
+            szenario_schluessel = schluessel.copy() if spiele else schluessel
+            # Gezogenes Ergebnis durch das festgelegte ersetzen
+            for spiel, heim, auswaerts, neu_heim, neu_auswaerts in spiele:
+                gezogen = ergebnisse[:, spiel]
+                szenario_schluessel[:, heim] += neu_heim - delta_heim[gezogen]
+                szenario_schluessel[:, auswaerts] += (
+                    neu_auswaerts - delta_auswaerts[gezogen]
+                )
+            zaehlung[name] += platzierungen_zaehlen(szenario_schluessel)
+        verbleibend -= block
+
+    return zaehlung
@@ -1,16 +1,484 @@
 """
 Simuliert die verbleibenden Spiele einer Saison für alle Teams und erstellt eine Heatmap
 der Platzierungswahrscheinlichkeiten.
+
+Die Simulation selbst (simulate_platzierungsverteilung) braucht nur numpy. pandas und die
+Plot-Bibliotheken werden erst importiert, wenn ein DataFrame oder eine Heatmap erzeugt
+wird, sodass Skripte und Worker-Prozesse, die nur simulieren, schnell starten.
 """
 
 import datetime
 from collections import Counter
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-from sim import simulate_game_realgoals, update_table
+from functools import partial
+import numpy as np
+from league_table import LeagueTable
+from sim import TorSampler
+from sim_vectorized import basis_schluessel, simulate_runs_vectorized
+from sim_tiebreak import DirekterVergleich, tiebreak_reihenfolge
+from sim_poisson import ErgebnisSampler
+from sim_parallel import run_sharded, merge_statistiken, python_rng
+from sim_exact import simulate_season_exact
+from sim_adaptive import simulate_adaptive
+from sim_cache import cache_bezeichnung, cache_schluessel, simulate_gecacht
+from sim_scenarios import simulate_scenarios
+from sim_store import EndtabellenSchreiber
 from utils import read_csv_table, read_csv_fixtures
 
+ENGINES = ("python", "numpy", "exact")
+
+# Blockgröße der adaptiven Simulation je Engine
+ADAPTIV_BLOCKGROESSE = {"python": 1_000, "numpy": 100_000}
+
+# Anzahl der Runs zwischen zwei Zwischenständen der gestreamten Simulation
+STANDARD_INTERVALL = 100_000
+
+
+def simulate_runs_python(
+    table_raw,
+    fixtures,
+    runs,
+    torverteilung=None,
+    torgewichte_heim=None,
+    torgewichte_auswaerts=None,
+    rng=None,
+    vergleich=None,
+    modell=None,
+):
+    """
+    Simuliert die verbleibenden Spiele Saison für Saison in reinem Python.
+    Args:
+        table_raw (list of dict): Eingelesene Tabelle.
+        fixtures (list of tuples): Liste von (Heim, Auswärts)-Tupeln.
+        runs (int): Anzahl der durchzuführenden Simulationen.
+        torverteilung (list): Optionale Torverteilung für die Simulation.
+        torgewichte_heim (list): Optionale Heimtor-Gewichte.
+        torgewichte_auswaerts (list): Optionale Auswärtstor-Gewichte.
+        rng (random.Random): Optionaler Zufallsgenerator.
+        vergleich (DirekterVergleich): Optionale bisherige Ergebnisse. Ist er gesetzt,
+        werden Gleichstände über den direkten Vergleich aufgelöst (siehe sim_tiebreak).
+        modell (PoissonModell): Optionales Modell der Teamstärken anstelle der
+        Torverteilung.
+    Returns:
+        dict: Pro Team ein Counter mit der Häufigkeit jeder Platzierung.
+    """
+    basis = LeagueTable.aus_tabelle(table_raw)
+    paarungen_array = basis.paarungen_indizes(fixtures)
+    paarungen = paarungen_array.tolist()
+    if modell is None:
+        sampler = TorSampler(torverteilung, torgewichte_heim, torgewichte_auswaerts)
+        sampler_je_spiel = [sampler] * len(paarungen)
+    else:
+        sampler_je_spiel = [
+            ErgebnisSampler(matrix) for matrix in modell.paarungs_matrizen(fixtures)
+        ]
+    zaehlung = [[0] * len(basis) for _ in range(len(basis))]
+    table = basis.kopie()
+
+    for _ in range(runs):
+        # Tabelle zurücksetzen
+        table.zuruecksetzen(basis)
+
+        # Spiele simulieren
+        ergebnisse = []
+        for (heim, auswaerts), sampler in zip(paarungen, sampler_je_spiel):
+            tore_heim, tore_auswaerts = sampler.ziehen(rng)
+            table.spiel_eintragen(heim, auswaerts, tore_heim, tore_auswaerts)
+            ergebnisse.append((tore_heim, tore_auswaerts))
+
+        # Tabelle sortieren, Gleichstände nur bei Bedarf auflösen
+        rangfolge = table.rangfolge()
+        if vergleich is not None and table.hat_gleichstand(rangfolge):
+            tore = np.array(ergebnisse, dtype=np.int64).reshape(1, -1, 2)
+            rangfolge = tiebreak_reihenfolge(
+                basis_schluessel(*table.als_arrays())[None],
+                paarungen_array,
+                tore[:, :, 0],
+                tore[:, :, 1],
+                vergleich,
+            )[0].tolist()
+        for platz, team_id in enumerate(rangfolge):
+            zaehlung[team_id][platz] += 1
+
+    return zaehlmatrix_zu_statistik(zaehlung, basis.teams)
+
+
+def zaehlmatrix_zu_statistik(zaehlmatrix, teams):
+    """
+    Wandelt eine Zählmatrix (teams x plätze) in die Counter-Darstellung um.
+    Args:
+        zaehlmatrix (np.ndarray): Zählmatrix, Zeilen in Reihenfolge von teams.
+        teams (list): Teamnamen.
+    Returns:
+        dict: Pro Team ein Counter mit der Häufigkeit jeder Platzierung.
+    """
+    return {
+        team: Counter(
+            {platz + 1: int(anzahl) for platz, anzahl in enumerate(zeile) if anzahl}
+        )
+        for team, zeile in zip(teams, zaehlmatrix)
+    }
+
+
+def statistik_zu_zaehlmatrix(platzierungsstatistik, teams):
+    """
+    Wandelt die Counter-Darstellung in eine Zählmatrix (teams x plätze) um.
+    Args:
+        platzierungsstatistik (dict): Pro Team ein Counter mit Platzierungen.
+        teams (list): Teamnamen in Tabellenreihenfolge.
+    Returns:
+        np.ndarray: Zählmatrix, Spalte 0 entspricht Platz 1.
+    """
+    return np.array(
+        [
+            [platzierungsstatistik[team][platz] for platz in range(1, len(teams) + 1)]
+            for team in teams
+        ],
+        dtype=np.int64,
+    )
+
+
+def simulate_block_zaehlmatrix(runs, engine, table_raw, fixtures, gewichte, rng):
+    """
+    Simuliert einen Block von Saisons und gibt die Zählmatrix zurück.
+    Args:
+        runs (int): Anzahl der Simulationen in diesem Block.
+        engine (str): "python" oder "numpy".
+        table_raw (list of dict): Eingelesene Tabelle.
+        fixtures (list of tuples): Liste von (Heim, Auswärts)-Tupeln.
+        gewichte (dict): torverteilung, torgewichte_heim, torgewichte_auswaerts und
+        optional vergleich (DirekterVergleich) und modell (PoissonModell).
+        rng: np.random.Generator (numpy) bzw. random.Random (python).
+    Returns:
+        np.ndarray: Zählmatrix der Form (teams, plätze).
+    """
+    if engine == "numpy":
+        return simulate_runs_vectorized(table_raw, fixtures, runs, rng=rng, **gewichte)
+    teams = [row["Team"] for row in table_raw]
+    return statistik_zu_zaehlmatrix(
+        simulate_runs_python(table_raw, fixtures, runs, rng=rng, **gewichte), teams
+    )
+
+
+def simulate_shard(runs, seed_sequenz, engine, table_raw, fixtures, gewichte):
+    """
+    Simuliert einen Shard mit eigenem Zufallsstrom (siehe sim_parallel.run_sharded).
+    Args:
+        runs (int): Anzahl der Simulationen in diesem Shard.
+        seed_sequenz (np.random.SeedSequence): Seed-Sequenz des Shards.
+        engine (str): "python" oder "numpy".
+        table_raw (list of dict): Eingelesene Tabelle.
+        fixtures (list of tuples): Liste von (Heim, Auswärts)-Tupeln.
+        gewichte (dict): torverteilung, torgewichte_heim, torgewichte_auswaerts und
+        optional vergleich (DirekterVergleich) und modell (PoissonModell).
+    Returns:
+        dict: Pro Team ein Counter mit der Häufigkeit jeder Platzierung.
+    """
+    if engine == "numpy":
+        zaehlmatrix = simulate_runs_vectorized(
+            table_raw,
+            fixtures,
+            runs,
+            rng=np.random.default_rng(seed_sequenz),
+            **gewichte,
+        )
+        teams = [row["Team"] for row in table_raw]
+        return zaehlmatrix_zu_statistik(zaehlmatrix, teams)
+    return simulate_runs_python(
+        table_raw, fixtures, runs, rng=python_rng(seed_sequenz), **gewichte
+    )
+
+
+def simulate_platzierungen(
+    engine, table_raw, fixtures, runs, gewichte, workers=1, seed=None
+):
+    """
+    Simuliert die verbleibenden Spiele mit der gewählten Engine.
+    Args:
+        engine (str): "python" oder "numpy".
+        table_raw (list of dict): Eingelesene Tabelle.
+        fixtures (list of tuples): Liste von (Heim, Auswärts)-Tupeln.
+        runs (int): Anzahl der durchzuführenden Simulationen.
+        gewichte (dict): torverteilung, torgewichte_heim, torgewichte_auswaerts und
+        optional vergleich (DirekterVergleich) und modell (PoissonModell).
+        workers (int): Anzahl der Prozesse, auf die die Runs verteilt werden.
+        seed (int): Optionaler Master-Seed.
+    Returns:
+        dict: Pro Team ein Counter mit der Häufigkeit jeder Platzierung.
+    """
+    if workers > 1 or seed is not None:
+        return merge_statistiken(
+            run_sharded(
+                simulate_shard,
+                runs,
+                workers=workers,
+                seed=seed,
+                args=(engine, table_raw, fixtures, gewichte),
+            )
+        )
+    if engine == "numpy":
+        zaehlmatrix = simulate_runs_vectorized(table_raw, fixtures, runs, **gewichte)
+        teams = [row["Team"] for row in table_raw]
+        return zaehlmatrix_zu_statistik(zaehlmatrix, teams)
+    return simulate_runs_python(table_raw, fixtures, runs, **gewichte)
+
+
+def simulate_season_stream(
+    table_raw,
+    fixtures,
+    runs,
+    intervall=STANDARD_INTERVALL,
+    engine="numpy",
+    torverteilung=None,
+    torgewichte_heim=None,
+    torgewichte_auswaerts=None,
+    seed=None,
+):
+    """
+    Simuliert die verbleibenden Spiele in Abschnitten und liefert nach jedem Abschnitt
+    einen kumulierten Zwischenstand. Es liegt immer nur eine Zählmatrix im Speicher,
+    unabhängig von der Gesamtzahl der Runs.
+    Args:
+        table_raw (list of dict): Eingelesene Tabelle.
+        fixtures (list of tuples): Liste von (Heim, Auswärts)-Tupeln.
+        runs (int): Gesamtzahl der Simulationen.
+        intervall (int): Anzahl der Simulationen zwischen zwei Zwischenständen.
+        engine (str): "python" oder "numpy".
+        torverteilung (list): Optionale Torverteilung für die Simulation.
+        torgewichte_heim (list): Optionale Heimtor-Gewichte.
+        torgewichte_auswaerts (list): Optionale Auswärtstor-Gewichte.
+        seed (int): Optionaler Seed.
+    Yields:
+        tuple: (runs_bisher, zaehlmatrix) mit der Anzahl der bisher simulierten Saisons
+        und einer Kopie der kumulierten Zählmatrix der Form (teams, plätze).
+    """
+    if engine not in ("python", "numpy"):
+        raise ValueError(f"Engine '{engine}' unterstützt keine gestreamte Simulation.")
+    if intervall < 1:
+        raise ValueError("Das Intervall muss mindestens 1 sein.")
+
+    gewichte = {
+        "torverteilung": torverteilung,
+        "torgewichte_heim": torgewichte_heim,
+        "torgewichte_auswaerts": torgewichte_auswaerts,
+    }
+    rng = (
+        np.random.default_rng(seed)
+        if engine == "numpy"
+        else python_rng(np.random.SeedSequence(seed))
+    )
+
+    zaehlmatrix = np.zeros((len(table_raw), len(table_raw)), dtype=np.int64)
+    runs_bisher = 0
+    while runs_bisher < runs:
+        block = min(intervall, runs - runs_bisher)
+        zaehlmatrix += simulate_block_zaehlmatrix(
+            block, engine, table_raw, fixtures, gewichte, rng
+        )
+        runs_bisher += block
+        yield runs_bisher, zaehlmatrix.copy()
+
+
+def verteilung_zu_dataframe(verteilung, teams):
+    """
+    Baut aus einer Wahrscheinlichkeitsmatrix das DataFrame der Platzierungen.
+    Args:
+        verteilung (np.ndarray): Wahrscheinlichkeiten der Form (teams, plätze), z.B.
+        zaehlmatrix / runs.
+        teams (list): Teamnamen in Reihenfolge der Zeilen.
+    Returns:
+        pd.DataFrame: Wahrscheinlichkeiten in Prozent, gerundet auf zwei Stellen
+        (Zeilen: Platz, Spalten: Teams).
+    """
+    import pandas as pd
+
+    return pd.DataFrame(
+        np.round(np.asarray(verteilung, dtype=np.float64).T * 100, 2),
+        index=range(1, len(teams) + 1),
+        columns=teams,
+    )
+
+
+def simulate_platzierungsverteilung(
+    table_raw,
+    fixtures,
+    runs=1000,
+    torverteilung=None,
+    torgewichte_heim=None,
+    torgewichte_auswaerts=None,
+    engine="python",
+    workers=1,
+    seed=None,
+    toleranz=None,
+    cache=None,
+    ergebnisse=None,
+    modell=None,
+    endtabellen=None,
+):
+    """
+    Berechnet die Platzierungswahrscheinlichkeiten aller Teams, ohne DataFrame und
+    ohne Heatmap.
+    Args:
+        table_raw (list of dict): Aktuelle Tabelle.
+        fixtures (list of tuples): Verbleibende Spielpaarungen.
+        runs, torverteilung, torgewichte_heim, torgewichte_auswaerts, engine, workers,
+        seed, toleranz, cache, ergebnisse, modell, endtabellen: Siehe
+        simulate_season_for_all_teams.
+    Returns:
+        dict: verteilung (np.ndarray der Form (teams, plätze), z.B. zaehlmatrix / runs),
+        teams (Teamnamen in Reihenfolge der Zeilen), runs (tatsächlich genutzte Runs
+        oder "exakt"), halbbreite (erreichte Genauigkeit der adaptiven Simulation oder
+        None) und gespielte_spieltage.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unbekannte Engine '{engine}', erlaubt sind: {ENGINES}")
+
+    teams = [row["Team"] for row in table_raw]
+    # Anzahl der gespielten Spieltage für später speichern
+    gespielte_spieltage = int(table_raw[0]["Spiele"])
+
+    gewichte = {
+        "torverteilung": torverteilung,
+        "torgewichte_heim": torgewichte_heim,
+        "torgewichte_auswaerts": torgewichte_auswaerts,
+    }
+
+    if ergebnisse is not None:
+        gewichte["vergleich"] = DirekterVergleich.aus_ergebnissen(
+            LeagueTable.aus_tabelle(table_raw), ergebnisse
+        )
+        if engine == "exact":
+            print("Direkter Vergleich wird nur in der Simulation berücksichtigt.")
+            engine = "numpy"
+    if modell is not None:
+        gewichte["modell"] = modell
+        if engine == "exact":
+            print("Das Modell der Teamstärken wird nur in der Simulation verwendet.")
+            engine = "numpy"
+
+    speicher = None
+    if endtabellen is not None:
+        if engine != "numpy":
+            print("Endtabellen werden nur mit der Engine 'numpy' gespeichert.")
+            engine = "numpy"
+        if workers > 1:
+            print("Endtabellen werden nur in einem Prozess gespeichert.")
+            workers = 1
+        speicher = EndtabellenSchreiber(endtabellen, teams)
+        gewichte["speicher"] = speicher
+
+    verteilung = None
+    if engine == "exact":
+        verteilung = simulate_season_exact(table_raw, fixtures, **gewichte)
+        if verteilung is None:
+            print("Zu viele mögliche Ausgänge für eine exakte Berechnung, simuliere.")
+            engine = "numpy"
+        else:
+            print("Platzierungswahrscheinlichkeiten exakt berechnet.")
+
+    # Wahrscheinlichkeiten berechnen
+    halbbreite = None
+    if verteilung is not None:
+        runs_label = "exakt"
+    elif toleranz is not None:
+        print(
+            f"Simuliere bis zu {runs} Saisons (Toleranz ±{toleranz} Prozentpunkte)..."
+        )
+        rng = (
+            np.random.default_rng(seed)
+            if engine == "numpy"
+            else python_rng(np.random.SeedSequence(seed))
+        )
+        zaehlmatrix, runs, halbbreite = simulate_adaptive(
+            partial(
+                simulate_block_zaehlmatrix,
+                engine=engine,
+                table_raw=table_raw,
+                fixtures=fixtures,
+                gewichte=gewichte,
+                rng=rng,
+            ),
+            toleranz,
+            runs,
+            ADAPTIV_BLOCKGROESSE[engine],
+        )
+        print(
+            f"{runs} Saisons simuliert, erreichte Genauigkeit: ±{halbbreite:.3f} Prozentpunkte."
+        )
+        verteilung = zaehlmatrix / runs
+        runs_label = runs
+    else:
+        print(f"Simuliere {runs} Saisons...")
+
+        def simuliere(anzahl):
+            platzierungsstatistik = simulate_platzierungen(
+                engine,
+                table_raw,
+                fixtures,
+                anzahl,
+                gewichte,
+                workers=workers,
+                seed=seed,
+            )
+            return statistik_zu_zaehlmatrix(platzierungsstatistik, teams)
+
+        if cache is None or speicher is not None:
+            zaehlmatrix = simuliere(runs)
+        else:
+            cache_modell = cache_bezeichnung(gewichte, engine, workers, seed)
+            zaehlmatrix, runs_aus_cache = simulate_gecacht(
+                cache,
+                cache_schluessel(table_raw, fixtures, gewichte, cache_modell, seed),
+                runs,
+                simuliere,
+                additiv=seed is None,
+            )
+            if runs_aus_cache:
+                print(f"{runs_aus_cache} Saisons aus dem Cache übernommen.")
+        verteilung = zaehlmatrix / runs
+        runs_label = runs
+
+    if speicher is not None:
+        speicher.close()
+        print(f"Endtabellen gespeichert: {endtabellen}")
+
+    return {
+        "verteilung": verteilung,
+        "teams": teams,
+        "runs": runs_label,
+        "halbbreite": halbbreite,
+        "gespielte_spieltage": gespielte_spieltage,
+    }
+
+
+def plot_platzierungsverteilung(ergebnis, export=False, anzeigen=True):
+    """
+    Erstellt die Heatmap zu einem Ergebnis von simulate_platzierungsverteilung. Die
+    Plot-Bibliotheken werden erst hier importiert.
+    Args:
+        ergebnis (dict): Ergebnis von simulate_platzierungsverteilung.
+        export (bool): Ob die Heatmap als PNG nach output/ exportiert werden soll.
+        anzeigen (bool): Ob die Heatmap in einem Fenster angezeigt werden soll.
+    Returns:
+        str: Pfad der exportierten Heatmap oder None.
+    """
+    from heatmap import HeatmapRenderer, heatmap_anzeigen, heatmap_titel
+
+    titel = heatmap_titel(ergebnis["gespielte_spieltage"])
+    pfad = None
+    if export:
+        timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        pfad = (
+            f"output/platzierungsprobs_nach_spieltag_{ergebnis['gespielte_spieltage']}"
+            f"_runs_{ergebnis['runs']}_{timestamp}.png"
+        )
+        HeatmapRenderer().rendern(
+            ergebnis["verteilung"], ergebnis["teams"], titel, pfad
+        )
+        print("Export abgeschlossen: PNG gespeichert.")
+    if anzeigen:
+        heatmap_anzeigen(ergebnis["verteilung"], ergebnis["teams"], titel)
+    return pfad
+
 
 def simulate_season_for_all_teams(
     tabelle_path=None,
@@ -22,6 +490,15 @@ def simulate_season_for_all_teams(
     torverteilung=None,
     torgewichte_heim=None,
     torgewichte_auswaerts=None,
+    engine="python",
+    workers=1,
+    seed=None,
+    toleranz=None,
+    cache=None,
+    ergebnisse=None,
+    modell=None,
+    endtabellen=None,
+    anzeigen=True,
 ):
     """
     Simuliert die verbleibenden Spiele einer Saison für alle Teams und erstellt eine Heatmap
@@ -36,9 +513,37 @@ def simulate_season_for_all_teams(
         torverteilung (list): Optionale Torverteilung für die Simulation.
         torgewichte_heim (list): Optionale Heimtor-Gewichte.
         torgewichte_auswaerts (list): Optionale Auswärtstor-Gewichte.
+        engine (str): "python" simuliert Saison für Saison, "numpy" simuliert
+        blockweise vektorisiert (deutlich schneller bei vielen Runs). "exact" berechnet
+        die Wahrscheinlichkeiten für die letzten Spieltage exakt und weicht auf "numpy"
+        aus, wenn der Zustandsraum zu groß ist.
+        workers (int): Anzahl der Prozesse, auf die die Runs verteilt werden.
+        seed (int): Optionaler Master-Seed. Für gleichen Seed und gleiche Anzahl an
+        Workern sind die Ergebnisse identisch.
+        toleranz (float): Optionale Zielgenauigkeit in Prozentpunkten. Ist sie gesetzt,
+        wird blockweise simuliert, bis die größte halbe Breite der 95%-Konfidenzintervalle
+        aller Wahrscheinlichkeiten darunter liegt; runs ist dann das maximale Budget.
+        cache (SimulationsCache): Optionaler Cache für die Zählmatrix. Ohne Seed werden
+        gespeicherte Ergebnisse mit weniger Runs aufgestockt (wird bei adaptiver oder
+        exakter Berechnung nicht verwendet).
+        ergebnisse (list of dict): Optionale bisherige Ergebnisse der Saison (z.B. aus
+        read_csv_results). Sind sie gesetzt, werden Gleichstände nach Punkten,
+        Tordifferenz und Toren über den direkten Vergleich und die Auswärtstore
+        aufgelöst; die exakte Berechnung wird dann durch die Simulation ersetzt.
+        modell (PoissonModell): Optionales Modell der Teamstärken (siehe sim_poisson).
+        Ist es gesetzt, wird für jede Paarung aus ihrer eigenen Ergebnismatrix gezogen,
+        statt aus torverteilung und torgewichte_*; die exakte Berechnung wird dann
+        ebenfalls durch die Simulation ersetzt.
+        endtabellen (str): Optionales Verzeichnis, in das Platz, Punkte und Tordifferenz
+        aller Teams in jedem Run geschrieben werden (siehe sim_store). Es wird dann
+        immer mit der Engine "numpy" in einem Prozess und ohne Cache simuliert.
+        anzeigen (bool): Ob die Heatmap in einem Fenster angezeigt werden soll. Ohne
+        Anzeige und ohne Export wird nichts geplottet.
+    Returns:
+        pd.DataFrame: Platzierungswahrscheinlichkeiten in Prozent (Zeilen: Platz,
+        Spalten: Teams). Bei adaptiver Simulation stehen die tatsächlich genutzten Runs
+        und die erreichte Genauigkeit in df.attrs["runs"] und df.attrs["halbbreite"].
     """
-    print(f"Simuliere {runs} Saisons...")
-
     # Falls Daten nicht direkt übergeben wurden, per CSV einlesen
     if table_raw is None:
         if tabelle_path is None:
@@ -54,88 +559,94 @@ def simulate_season_for_all_teams(
             )
         fixtures = read_csv_fixtures(spiele_path)
 
-    teams = [row["Team"] for row in table_raw]
-    platzierungsstatistik = {team: Counter() for team in teams}
-    # Anzahl der gespielten Spieltage für später speichern
-    gespielte_spieltage = int(table_raw[0]["Spiele"])
+    ergebnis = simulate_platzierungsverteilung(
+        table_raw,
+        fixtures,
+        runs=runs,
+        torverteilung=torverteilung,
+        torgewichte_heim=torgewichte_heim,
+        torgewichte_auswaerts=torgewichte_auswaerts,
+        engine=engine,
+        workers=workers,
+        seed=seed,
+        toleranz=toleranz,
+        cache=cache,
+        ergebnisse=ergebnisse,
+        modell=modell,
+        endtabellen=endtabellen,
+    )
 
-    for _ in range(runs):
-        # Tabelle aufbauen
-        table = {
-            row["Team"]: {
-                "Team": row["Team"],
-                "Spiele": int(row["Spiele"]),
-                "Siege": int(row["Siege"]),
-                "Unentschieden": int(row["Unentschieden"]),
-                "Niederlagen": int(row["Niederlagen"]),
-                "Tore": int(row["Tore"].split(":")[0]),
-                "Gegentore": int(row["Tore"].split(":")[1]),
-                "Differenz": int(row["Differenz"]),
-                "Punkte": int(row["Punkte"]),
-            }
-            for row in table_raw
-        }
+    df = verteilung_zu_dataframe(ergebnis["verteilung"], ergebnis["teams"])
+    df.attrs["runs"] = ergebnis["runs"]
+    df.attrs["halbbreite"] = ergebnis["halbbreite"]
 
-        # Spiele simulieren
-        for heim, auswaerts in fixtures:
-            tore_heim, tore_auswaerts = simulate_game_realgoals(
-                torverteilung=torverteilung,
-                torgewichte_heim=torgewichte_heim,
-                torgewichte_auswaerts=torgewichte_auswaerts,
-            )
-            update_table(table, heim, auswaerts, tore_heim, tore_auswaerts)
+    if export or anzeigen:
+        plot_platzierungsverteilung(ergebnis, export=export, anzeigen=anzeigen)
 
-        # Tabelle sortieren
-        sorted_table = sorted(
-            table.values(),
-            key=lambda x: (x["Punkte"], x["Differenz"], x["Tore"]),
-            reverse=True,
-        )
+    return df
 
-        for i, row in enumerate(sorted_table):
-            platzierungsstatistik[row["Team"]][i + 1] += 1
 
-    # Wahrscheinlichkeiten berechnen
-    df = pd.DataFrame(index=range(1, len(teams) + 1), columns=teams)
-
-    for team in teams:
-        for platz in range(1, len(teams) + 1):
-            wahrscheinlichkeit = platzierungsstatistik[team][platz] / runs * 100
-            df.at[platz, team] = round(wahrscheinlichkeit, 2)
-
-    df = df.sort_index(ascending=True)
-
-    # Heatmap erzeugen
-    plt.figure(figsize=(max(12, len(teams)), 10))
-    sns.set(font_scale=0.9)
-    ax = sns.heatmap(
-        df.astype(float),
-        annot=True,
-        fmt=".2f",
-        cmap="rocket_r",
-        linewidths=0.5,
-        vmin=0,
-        vmax=100,
-        cbar_kws={"label": "Wahrscheinlichkeit (%)"},
-    )
-    ax.set_title(
-        f"Platzierungs-Wahrscheinlichkeiten nach Spieltag {gespielte_spieltage}",
-        fontsize=16,
-    )
-    ax.set_xlabel("Team")
-    ax.set_ylabel("Platzierung")
-    plt.tight_layout()
+def simulate_scenarios_for_all_teams(
+    szenarien,
+    tabelle_path=None,
+    spiele_path=None,
+    table_raw=None,
+    fixtures=None,
+    runs=1000,
+    torverteilung=None,
+    torgewichte_heim=None,
+    torgewichte_auswaerts=None,
+    seed=None,
+):
+    """
+    Berechnet die Platzierungswahrscheinlichkeiten aller Teams für mehrere
+    Was-wäre-wenn-Szenarien auf denselben Zufallszahlen (siehe sim_scenarios).
+    Args:
+        szenarien (dict): Name -> {(Heim, Auswärts): (Tore Heim, Tore Auswärts)}, z.B.
+        {"HSV siegt": {("Hamburger SV", "1. FC Köln"): (1, 0)}, "Basis": {}}.
+        tabelle_path (str): Pfad zur CSV-Datei mit der Tabelle (optional, falls table_raw übergeben wird).
+        spiele_path (str): Pfad zur CSV-Datei mit den verbleibenden Spielen (optional, falls fixtures übergeben wird).
+        table_raw (list of dict): Bereits eingelesene Tabelle (optional).
+        fixtures (list of tuples): Bereits eingelesene Spielpaarungen (optional).
+        runs (int): Anzahl der durchzuführenden Simulationen.
+        torverteilung (list): Optionale Torverteilung für die Simulation.
+        torgewichte_heim (list): Optionale Heimtor-Gewichte.
+        torgewichte_auswaerts (list): Optionale Auswärtstor-Gewichte.
+        seed (int): Optionaler Seed.
+    Returns:
+        dict: Name -> pd.DataFrame mit Platzierungswahrscheinlichkeiten in Prozent
+        (Zeilen: Platz, Spalten: Teams).
+    """
+    if table_raw is None:
+        if tabelle_path is None:
+            raise ValueError(
+                "Entweder tabelle_path oder table_raw muss angegeben werden."
+            )
+        table_raw = read_csv_table(tabelle_path)
 
-    # Optionaler Export
-    if export:
-        timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-        plt.savefig(
-            f"output/platzierungsprobs_nach_spieltag_{gespielte_spieltage}_runs_{runs}_{timestamp}.png",
-            dpi=300,
-        )
-        print("Export abgeschlossen: PNG gespeichert.")
+    if fixtures is None:
+        if spiele_path is None:
+            raise ValueError(
+                "Entweder spiele_path oder fixtures muss angegeben werden."
+            )
+        fixtures = read_csv_fixtures(spiele_path)
 
-    plt.show()
+    teams = [row["Team"] for row in table_raw]
+    print(f"Simuliere {len(szenarien)} Szenarien mit je {runs} Saisons...")
+    zaehlung = simulate_scenarios(
+        table_raw,
+        fixtures,
+        szenarien,
+        runs,
+        torverteilung=torverteilung,
+        torgewichte_heim=torgewichte_heim,
+        torgewichte_auswaerts=torgewichte_auswaerts,
+        rng=np.random.default_rng(seed),
+    )
+    return {
+        name: verteilung_zu_dataframe(zaehlmatrix / runs, teams)
+        for name, zaehlmatrix in zaehlung.items()
+    }
 
 
 # Beispiel-Aufruf (als Skript)
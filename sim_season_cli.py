@@ -4,9 +4,151 @@ the probability of a specific team finishing in each position.
 """
 
 from collections import Counter
+from functools import partial
 import click
-from sim import simulate_game_realgoals, update_table
-from utils import read_csv_table, read_csv_fixtures
+import numpy as np
+from league_table import LeagueTable
+from sim import TorSampler
+from sim_parallel import run_sharded, python_rng
+from sim_adaptive import simulate_adaptive
+from sim_cache import (
+    SimulationsCache,
+    cache_bezeichnung,
+    cache_schluessel,
+    simulate_gecacht,
+)
+from sim_season_all import simulate_platzierungen, statistik_zu_zaehlmatrix
+from sim_tiebreak import DirekterVergleich, tiebreak_reihenfolge
+from sim_vectorized import basis_schluessel
+from utils import read_csv_table, read_csv_fixtures, read_csv_results
+
+# Blockgröße der adaptiven Simulation
+ADAPTIV_BLOCKGROESSE = 1_000
+
+
+def team_id_ohne_gross_klein(tabelle, team):
+    """
+    Sucht die ID eines Teams ohne Beachtung der Groß-/Kleinschreibung.
+    Args:
+        tabelle (LeagueTable): Die Tabelle.
+        team (str): Name des Teams.
+    Returns:
+        int: Die Team-ID.
+    """
+    for team_id, name in enumerate(tabelle.teams):
+        if name.lower() == team.lower():
+            return team_id
+    raise ValueError(f"Team '{team}' nicht in der Tabelle gefunden.")
+
+
+def simulate_team(table_raw, fixtures, team, anzahl, rng=None, vergleich=None):
+    """
+    Simuliert die verbleibenden Spiele und zählt die Platzierungen eines Teams.
+    Args:
+        table_raw (list of dict): Eingelesene Tabelle.
+        fixtures (list of tuples): Liste von (Heim, Auswärts)-Tupeln.
+        team (str): Name des Teams für die Wahrscheinlichkeitsanalyse.
+        anzahl (int): Anzahl der Simulationen.
+        rng (random.Random): Optionaler Zufallsgenerator.
+        vergleich (DirekterVergleich): Optionale bisherige Ergebnisse für die
+        Auflösung von Gleichständen (siehe sim_tiebreak).
+    Returns:
+        tuple: (platzierungsstatistik, ergebnis_counter) als Counter.
+    """
+    basis = LeagueTable.aus_tabelle(table_raw)
+    paarungen_array = basis.paarungen_indizes(fixtures)
+    paarungen = paarungen_array.tolist()
+    team_id = team_id_ohne_gross_klein(basis, team)
+    sampler = TorSampler()
+
+    platzierungsstatistik = Counter()
+    ergebnis_counter = Counter()
+    table = basis.kopie()
+
+    for _ in range(anzahl):
+        # Tabelle zurücksetzen
+        table.zuruecksetzen(basis)
+
+        # Spiele simulieren
+        ergebnisse = []
+        for heim, auswaerts in paarungen:
+            tore_heim, tore_auswaerts = sampler.ziehen(rng)
+
+            # Tabelle aktualisieren
+            table.spiel_eintragen(heim, auswaerts, tore_heim, tore_auswaerts)
+            ergebnisse.append((tore_heim, tore_auswaerts))
+
+            # Spielergebnis aus Sicht des Heimteams zählen
+            if tore_heim > tore_auswaerts:
+                ergebnis_counter["Sieg"] += 1
+            elif tore_heim < tore_auswaerts:
+                ergebnis_counter["Niederlage"] += 1
+            else:
+                ergebnis_counter["Unentschieden"] += 1
+
+        # Tabelle sortieren nach Punkte, Differenz, Tore
+        rangfolge = table.rangfolge()
+        if vergleich is not None and table.hat_gleichstand(rangfolge):
+            tore = np.array(ergebnisse, dtype=np.int64).reshape(1, -1, 2)
+            rangfolge = tiebreak_reihenfolge(
+                basis_schluessel(*table.als_arrays())[None],
+                paarungen_array,
+                tore[:, :, 0],
+                tore[:, :, 1],
+                vergleich,
+            )[0].tolist()
+        platzierungsstatistik[rangfolge.index(team_id) + 1] += 1
+
+    return platzierungsstatistik, ergebnis_counter
+
+
+def simulate_team_shard(anzahl, seed_sequenz, table_raw, fixtures, team, vergleich):
+    """
+    Simuliert einen Shard mit eigenem Zufallsstrom (siehe sim_parallel.run_sharded).
+    Args:
+        anzahl (int): Anzahl der Simulationen in diesem Shard.
+        seed_sequenz (np.random.SeedSequence): Seed-Sequenz des Shards.
+        table_raw (list of dict): Eingelesene Tabelle.
+        fixtures (list of tuples): Liste von (Heim, Auswärts)-Tupeln.
+        team (str): Name des Teams für die Wahrscheinlichkeitsanalyse.
+        vergleich (DirekterVergleich): Optionale bisherige Ergebnisse.
+    Returns:
+        tuple: (platzierungsstatistik, ergebnis_counter) als Counter.
+    """
+    return simulate_team(
+        table_raw,
+        fixtures,
+        team,
+        anzahl,
+        rng=python_rng(seed_sequenz),
+        vergleich=vergleich,
+    )
+
+
+def simulate_team_block(
+    anzahl, table_raw, fixtures, team, rng, ergebnis_counter, vergleich=None
+):
+    """
+    Simuliert einen Block für die adaptive Simulation (siehe sim_adaptive).
+    Args:
+        anzahl (int): Anzahl der Simulationen in diesem Block.
+        table_raw (list of dict): Eingelesene Tabelle.
+        fixtures (list of tuples): Liste von (Heim, Auswärts)-Tupeln.
+        team (str): Name des Teams für die Wahrscheinlichkeitsanalyse.
+        rng (random.Random): Zufallsgenerator.
+        ergebnis_counter (Counter): Wird um die Spielergebnisse des Blocks ergänzt.
+        vergleich (DirekterVergleich): Optionale bisherige Ergebnisse.
+    Returns:
+        np.ndarray: Häufigkeit jeder Platzierung, Index 0 entspricht Platz 1.
+    """
+    platzierungen, ergebnisse = simulate_team(
+        table_raw, fixtures, team, anzahl, rng, vergleich=vergleich
+    )
+    ergebnis_counter.update(ergebnisse)
+    return np.array(
+        [platzierungen[platz] for platz in range(1, len(table_raw) + 1)],
+        dtype=np.int64,
+    )
 
 
 # CLI mit Click
@@ -27,7 +169,42 @@ from utils import read_csv_table, read_csv_fixtures
     help="Name des Teams für die Wahrscheinlichkeitsanalyse",
 )
 @click.option("--anzahl", default=1000, help="Anzahl der Simulationen (Default: 1000)")
-def simulate_season(tabelle, spiele, team, anzahl):
+@click.option("--workers", default=1, help="Anzahl paralleler Prozesse (Default: 1)")
+@click.option(
+    "--seed",
+    default=None,
+    type=int,
+    help="Master-Seed für reproduzierbare Ergebnisse (optional)",
+)
+@click.option(
+    "--toleranz",
+    default=None,
+    type=float,
+    help=(
+        "Zielgenauigkeit in Prozentpunkten (optional). Simuliert blockweise, bis alle "
+        "95%-Konfidenzintervalle schmaler sind; --anzahl ist dann das Maximum."
+    ),
+)
+@click.option(
+    "--cache",
+    is_flag=True,
+    default=False,
+    help=(
+        "Platzierungen aller Teams im Simulations-Cache nachschlagen bzw. dort "
+        "ablegen (ohne Verteilung der Spielergebnisse)."
+    ),
+)
+@click.option(
+    "--ergebnisse",
+    default=None,
+    help=(
+        "Pfad zu den bisherigen Ergebnissen im CSV-Format (optional). Gleichstände "
+        "werden dann über den direkten Vergleich aufgelöst."
+    ),
+)
+def simulate_season(
+    tabelle, spiele, team, anzahl, workers, seed, toleranz, cache, ergebnisse
+):
     """
     Simuliert die verbleibenden Spiele einer Saison und berechnet die
     Platzierungswahrscheinlichkeiten für ein Team.
@@ -36,56 +213,96 @@ def simulate_season(tabelle, spiele, team, anzahl):
         spiele (str): Pfad zur CSV-Datei mit den verbleibenden Spielen.
         team (str): Name des Teams für die Wahrscheinlichkeitsanalyse.
         anzahl (int): Anzahl der Simulationen.
+        workers (int): Anzahl paralleler Prozesse.
+        seed (int): Optionaler Master-Seed.
+        toleranz (float): Optionale Zielgenauigkeit in Prozentpunkten.
+        cache (bool): Ob der Simulations-Cache verwendet werden soll.
+        ergebnisse (str): Optionaler Pfad zu den bisherigen Ergebnissen.
     """
-    print(f"Simuliere Saison für {team} mit {anzahl} Simulationen...")
+    umfang = f"bis zu {anzahl}" if toleranz is not None else anzahl
+    print(f"Simuliere Saison für {team} mit {umfang} Simulationen...")
     table_raw = read_csv_table(tabelle)
     fixtures = read_csv_fixtures(spiele)
-
-    platzierungsstatistik = Counter()
-    ergebnis_counter = Counter()
-
-    for _ in range(anzahl):
-        # Tabelle in dict-Form umwandeln
-        table = {}
-        for row in table_raw:
-            table[row["Team"]] = {
-                "Team": row["Team"],
-                "Spiele": int(row["Spiele"]),
-                "Siege": int(row["Siege"]),
-                "Unentschieden": int(row["Unentschieden"]),
-                "Niederlagen": int(row["Niederlagen"]),
-                "Tore": int(row["Tore"].split(":")[0]),
-                "Gegentore": int(row["Tore"].split(":")[1]),
-                "Differenz": int(row["Differenz"]),
-                "Punkte": int(row["Punkte"]),
-            }
-
-        # Spiele simulieren
-        for heim, auswaerts in fixtures:
-            tore_heim, tore_auswaerts = simulate_game_realgoals()
-
-            # Tabelle aktualisieren
-            update_table(table, heim, auswaerts, tore_heim, tore_auswaerts)
-
-            # Spielergebnis aus Sicht des Heimteams zählen
-            if tore_heim > tore_auswaerts:
-                ergebnis_counter["Sieg"] += 1
-            elif tore_heim < tore_auswaerts:
-                ergebnis_counter["Niederlage"] += 1
-            else:
-                ergebnis_counter["Unentschieden"] += 1
-
-        # Tabelle sortieren nach Punkte, Differenz, Tore
-        sorted_table = sorted(
-            table.values(),
-            key=lambda x: (x["Punkte"], x["Differenz"], x["Tore"]),
-            reverse=True,
+    vergleich = None
+    if ergebnisse is not None:
+        vergleich = DirekterVergleich.aus_ergebnissen(
+            LeagueTable.aus_tabelle(table_raw), read_csv_results(ergebnisse)
         )
 
-        for i, row in enumerate(sorted_table):
-            if row["Team"].lower() == team.lower():
-                platzierungsstatistik[i + 1] += 1
-                break
+    if toleranz is not None:
+        ergebnis_counter = Counter()
+        zaehlung, anzahl, halbbreite = simulate_adaptive(
+            partial(
+                simulate_team_block,
+                table_raw=table_raw,
+                fixtures=fixtures,
+                team=team,
+                rng=python_rng(np.random.SeedSequence(seed)),
+                ergebnis_counter=ergebnis_counter,
+                vergleich=vergleich,
+            ),
+            toleranz,
+            anzahl,
+            ADAPTIV_BLOCKGROESSE,
+        )
+        platzierungsstatistik = Counter(
+            {platz + 1: int(wert) for platz, wert in enumerate(zaehlung)}
+        )
+        print(
+            f"{anzahl} Simulationen durchgeführt, erreichte Genauigkeit: "
+            f"±{halbbreite:.3f} Prozentpunkte."
+        )
+    elif cache:
+        ergebnis_counter = Counter()
+        team_id = team_id_ohne_gross_klein(LeagueTable.aus_tabelle(table_raw), team)
+        teams = [row["Team"] for row in table_raw]
+        gewichte = {
+            "torverteilung": None,
+            "torgewichte_heim": None,
+            "torgewichte_auswaerts": None,
+        }
+        if vergleich is not None:
+            gewichte["vergleich"] = vergleich
+        cache_modell = cache_bezeichnung(gewichte, "numpy", workers, seed)
+        with SimulationsCache() as simulations_cache:
+            zaehlmatrix, runs_aus_cache = simulate_gecacht(
+                simulations_cache,
+                cache_schluessel(table_raw, fixtures, gewichte, cache_modell, seed),
+                anzahl,
+                lambda runs: statistik_zu_zaehlmatrix(
+                    simulate_platzierungen(
+                        "numpy",
+                        table_raw,
+                        fixtures,
+                        runs,
+                        gewichte,
+                        workers=workers,
+                        seed=seed,
+                    ),
+                    teams,
+                ),
+                additiv=seed is None,
+            )
+        print(f"{runs_aus_cache} Simulationen aus dem Cache übernommen.")
+        platzierungsstatistik = Counter(
+            {platz + 1: int(wert) for platz, wert in enumerate(zaehlmatrix[team_id])}
+        )
+    elif workers > 1 or seed is not None:
+        platzierungsstatistik = Counter()
+        ergebnis_counter = Counter()
+        for shard_platzierungen, shard_ergebnisse in run_sharded(
+            simulate_team_shard,
+            anzahl,
+            workers=workers,
+            seed=seed,
+            args=(table_raw, fixtures, team, vergleich),
+        ):
+            platzierungsstatistik.update(shard_platzierungen)
+            ergebnis_counter.update(shard_ergebnisse)
+    else:
+        platzierungsstatistik, ergebnis_counter = simulate_team(
+            table_raw, fixtures, team, anzahl, vergleich=vergleich
+        )
 
     # Ergebnisse anzeigen
     print(f"\nPlatzierungs-Wahrscheinlichkeiten für {team}:")
@@ -95,6 +312,8 @@ def simulate_season(tabelle, spiele, team, anzahl):
 
     # Verteilung der Spielergebnisse anzeigen
     total = sum(ergebnis_counter.values())
+    if not total:
+        return
     print("\nVerteilung der Spielergebnisse (aus Sicht des Heimteams):")
     for ergebnis, count in ergebnis_counter.items():
         prozent = count / total * 100
@@ -0,0 +1,248 @@
+"""
+Speicher für die Endtabellen aller simulierten Saisons.
+
+Je Run werden Platz (int8), Punkte (int16) und Tordifferenz (int16) jedes Teams in
+Tabellenreihenfolge abgelegt. Der Schreiber puffert die Runs und schreibt sie in Chunks,
+sodass nie mehr als ein Chunk im Speicher liegt.
+
+Unkomprimiert wird jede Spalte als eine fortlaufende Binärdatei geschrieben, die beim
+Lesen ohne Kopie mit np.memmap geöffnet wird; das Betriebssystem lädt nur die Seiten,
+auf die tatsächlich zugegriffen wird. Komprimiert wird jeder Chunk als eigene .npz-Datei
+abgelegt und beim Lesen chunkweise entpackt.
+
+Die Metadaten (Teams, Anzahl der Runs, Chunkgrößen) werden erst beim Schließen
+geschrieben, unvollständige Speicher werden daher beim Öffnen erkannt.
+"""
+
+import json
+import os
+import numpy as np
+
+STANDARD_CHUNK_GROESSE = 100_000
+
+# Gespeicherte Spalten und ihre Datentypen
+SPALTEN = {"platz": np.int8, "punkte": np.int16, "differenz": np.int16}
+
+META_DATEI = "meta.json"
+
+
+def _spalten_datei(verzeichnis, name):
+    """
+    Binärdatei einer Spalte im unkomprimierten Format.
+    """
+    return os.path.join(verzeichnis, f"{name}.bin")
+
+
+def _chunk_datei(verzeichnis, nummer):
+    """
+    Datei eines Chunks im komprimierten Format.
+    """
+    return os.path.join(verzeichnis, f"chunk_{nummer:05d}.npz")
+
+
+class EndtabellenSchreiber:
+    """
+    Schreibt die Endtabellen simulierter Saisons chunkweise in ein Verzeichnis.
+    """
+
+    def __init__(
+        self,
+        verzeichnis,
+        teams,
+        chunk_groesse=STANDARD_CHUNK_GROESSE,
+        komprimiert=False,
+    ):
+        """
+        Args:
+            verzeichnis (str): Zielverzeichnis. Ein bereits abgeschlossener Speicher
+            wird nicht überschrieben.
+            teams (list): Teamnamen in Tabellenreihenfolge.
+            chunk_groesse (int): Anzahl der Runs je Chunk.
+            komprimiert (bool): Ob die Chunks komprimiert werden sollen. Komprimierte
+            Speicher sind kleiner, lassen sich aber nicht per memmap öffnen.
+        """
+        if len(teams) > np.iinfo(np.int8).max:
+            raise ValueError("Zu viele Teams für die Speicherung der Plätze als int8.")
+        if chunk_groesse < 1:
+            raise ValueError("Die Chunkgröße muss mindestens 1 sein.")
+        if os.path.exists(os.path.join(verzeichnis, META_DATEI)):
+            raise FileExistsError(
+                f"Im Verzeichnis '{verzeichnis}' liegt bereits ein Speicher."
+            )
+        os.makedirs(verzeichnis, exist_ok=True)
+        self.verzeichnis = verzeichnis
+        self.teams = list(teams)
+        self.chunk_groesse = chunk_groesse
+        self.komprimiert = komprimiert
+        self.chunks = []
+        self._puffer = {name: [] for name in SPALTEN}
+        self._gepuffert = 0
+        if not komprimiert:
+            # Reste eines abgebrochenen Schreibvorgangs verwerfen
+            for name in SPALTEN:
+                open(_spalten_datei(verzeichnis, name), "wb").close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def anhaengen(self, platz, punkte, differenz):
+        """
+        Hängt einen Block von Endtabellen an.
+        Args:
+            platz (np.ndarray): Platz je Run und Team (1 = Erster), Form (runs, teams).
+            punkte (np.ndarray): Punkte je Run und Team.
+            differenz (np.ndarray): Tordifferenz je Run und Team.
+        """
+        for name, werte in (
+            ("platz", platz),
+            ("punkte", punkte),
+            ("differenz", differenz),
+        ):
+            werte = np.asarray(werte)
+            if werte.ndim != 2 or werte.shape[1] != len(self.teams):
+                raise ValueError(
+                    f"Die Spalte {name} muss die Form (runs, {len(self.teams)}) haben."
+                )
+            grenzen = np.iinfo(SPALTEN[name])
+            if werte.size and (werte.min() < grenzen.min or werte.max() > grenzen.max):
+                raise ValueError(
+                    f"Die Werte der Spalte {name} passen nicht in {grenzen.dtype}."
+                )
+            self._puffer[name].append(werte.astype(SPALTEN[name]))
+        self._gepuffert += len(platz)
+        while self._gepuffert >= self.chunk_groesse:
+            self._chunk_schreiben(self.chunk_groesse)
+
+    def _chunk_schreiben(self, groesse):
+        """
+        Schreibt die ersten groesse gepufferten Runs als einen Chunk.
+        """
+        chunk = {}
+        for name, bloecke in self._puffer.items():
+            alle = np.concatenate(bloecke) if len(bloecke) > 1 else bloecke[0]
+            chunk[name], rest = alle[:groesse], alle[groesse:]
+            self._puffer[name] = [rest] if len(rest) else []
+        if self.komprimiert:
+            np.savez_compressed(
+                _chunk_datei(self.verzeichnis, len(self.chunks)), **chunk
+            )
+        else:
+            for name, werte in chunk.items():
+                with open(_spalten_datei(self.verzeichnis, name), "ab") as datei:
+                    datei.write(np.ascontiguousarray(werte).tobytes())
+        self.chunks.append(groesse)
+        self._gepuffert -= groesse
+
+    def close(self):
+        """
+        Schreibt die restlichen Runs und die Metadaten.
+        """
+        if self._gepuffert:
+            self._chunk_schreiben(self._gepuffert)
+        meta = {
+            "teams": self.teams,
+            "runs": sum(self.chunks),
+            "chunks": self.chunks,
+            "komprimiert": self.komprimiert,
+            "spalten": {name: np.dtype(typ).name for name, typ in SPALTEN.items()},
+        }
+        ziel = os.path.join(self.verzeichnis, META_DATEI)
+        with open(f"{ziel}.tmp", "w", encoding="utf-8") as datei:
+            json.dump(meta, datei, ensure_ascii=False)
+        os.replace(f"{ziel}.tmp", ziel)
+
+
+class Endtabellen:
+    """
+    Lesezugriff auf einen mit EndtabellenSchreiber geschriebenen Speicher.
+    """
+
+    def __init__(self, verzeichnis):
+        """
+        Args:
+            verzeichnis (str): Verzeichnis des Speichers.
+        """
+        try:
+            with open(os.path.join(verzeichnis, META_DATEI), encoding="utf-8") as datei:
+                meta = json.load(datei)
+        except FileNotFoundError as fehler:
+            raise ValueError(
+                f"Im Verzeichnis '{verzeichnis}' liegt kein abgeschlossener Speicher."
+            ) from fehler
+        self.verzeichnis = verzeichnis
+        self.teams = meta["teams"]
+        self.runs = meta["runs"]
+        self.chunk_groessen = meta["chunks"]
+        self.komprimiert = meta["komprimiert"]
+
+    def __len__(self):
+        return self.runs
+
+    def spalte(self, name):
+        """
+        Liefert eine Spalte aller Runs.
+        Args:
+            name (str): "platz", "punkte" oder "differenz".
+        Returns:
+            np.ndarray: Array der Form (runs, teams). Unkomprimiert eine schreibgeschützte
+            np.memmap ohne Kopie, komprimiert ein entpacktes Array.
+        """
+        if name not in SPALTEN:
+            raise ValueError(
+                f"Unbekannte Spalte '{name}', erlaubt sind: {list(SPALTEN)}"
+            )
+        if self.komprimiert:
+            return np.concatenate(
+                [chunk[name] for chunk in self.chunks([name])]
+                or [np.empty((0, len(self.teams)), dtype=SPALTEN[name])]
+            )
+        if self.runs == 0:
+            return np.empty((0, len(self.teams)), dtype=SPALTEN[name])
+        return np.memmap(
+            _spalten_datei(self.verzeichnis, name),
+            dtype=SPALTEN[name],
+            mode="r",
+            shape=(self.runs, len(self.teams)),
+        )
+
+    def chunks(self, spalten=None):
+        """
+        Iteriert chunkweise über die gespeicherten Runs.
+        Args:
+            spalten (list): Optionale Auswahl der Spalten.
+        Yields:
+            dict: Spaltenname -> Array der Form (runs im chunk, teams).
+        """
+        spalten = list(SPALTEN) if spalten is None else spalten
+        if self.komprimiert:
+            for nummer in range(len(self.chunk_groessen)):
+                with np.load(_chunk_datei(self.verzeichnis, nummer)) as chunk:
+                    yield {name: chunk[name] for name in spalten}
+            return
+        gemappt = {name: self.spalte(name) for name in spalten}
+        start = 0
+        for groesse in self.chunk_groessen:
+            yield {
+                name: werte[start : start + groesse] for name, werte in gemappt.items()
+            }
+            start += groesse
+
+    def zaehlmatrix(self):
+        """
+        Zählt chunkweise, wie oft jedes Team auf jedem Platz gelandet ist.
+        Returns:
+            np.ndarray: Zählmatrix der Form (teams, plätze) wie bei
+            simulate_runs_vectorized.
+        """
+        anzahl_teams = len(self.teams)
+        zaehlung = np.zeros(anzahl_teams * anzahl_teams, dtype=np.int64)
+        indizes = np.arange(anzahl_teams) * anzahl_teams - 1
+        for chunk in self.chunks(["platz"]):
+            zaehlung += np.bincount(
+                (chunk["platz"].astype(np.intp) + indizes).ravel(),
+                minlength=anzahl_teams * anzahl_teams,
+            )
+        return zaehlung.reshape(anzahl_teams, anzahl_teams)
@@ -0,0 +1,163 @@
+"""
+Entscheidung bei Gleichstand nach Punkten, Tordifferenz und Toren.
+
+Nach der Spielordnung der Bundesliga entscheiden bei Gleichstand in dieser Reihenfolge:
+Punkte im direkten Vergleich, Tordifferenz im direkten Vergleich, Auswärtstore im
+direkten Vergleich und die Anzahl aller Auswärtstore. Zuerst wird wie bisher mit dem
+zusammengesetzten Schlüssel sortiert. Nur für Runs, in denen danach Teams gleichauf
+liegen, werden die Ergebnisse zwischen den Teams als paarweise Arrays aus den
+bisherigen und den simulierten Ergebnissen aufgebaut und ausgewertet. Da solche Runs
+selten sind, bleibt der Aufwand nahe an einer einfachen Sortierung.
+
+Bleiben Teams auch danach gleichauf (eigentlich Entscheidungsspiel), entscheidet die
+ursprüngliche Tabellenreihenfolge.
+"""
+
+import numpy as np
+
+# Basis des zusammengesetzten Schlüssels für den direkten Vergleich (analog zum
+# Sortierschlüssel in sim_vectorized)
+VERGLEICH_BASIS = 1 << 10
+
+
+class DirekterVergleich:
+    """
+    Paarweise Ergebnisse der bereits gespielten Spiele zwischen allen Teams.
+    """
+
+    __slots__ = ("punkte", "tore", "auswaertstore")
+
+    def __init__(self, anzahl_teams):
+        """
+        Args:
+            anzahl_teams (int): Anzahl der Teams.
+        """
+        # [i, j]: Punkte bzw. Tore von Team i gegen Team j, Auswärtstore von i bei j
+        self.punkte = np.zeros((anzahl_teams, anzahl_teams), dtype=np.int64)
+        self.tore = np.zeros((anzahl_teams, anzahl_teams), dtype=np.int64)
+        self.auswaertstore = np.zeros((anzahl_teams, anzahl_teams), dtype=np.int64)
+
+    @classmethod
+    def aus_ergebnissen(cls, tabelle, ergebnisse):
+        """
+        Baut den direkten Vergleich aus bisherigen Ergebnissen auf.
+        Args:
+            tabelle (LeagueTable): Tabelle, deren Team-IDs verwendet werden.
+            ergebnisse (list of dict): Ergebnisse im Format von normalize_results bzw.
+            read_csv_results.
+        Returns:
+            DirekterVergleich: Der direkte Vergleich.
+        """
+        vergleich = cls(len(tabelle))
+        for ergebnis in ergebnisse:
+            vergleich.spiel_eintragen(
+                tabelle.team_id(ergebnis["Heim"]),
+                tabelle.team_id(ergebnis["Auswaerts"]),
+                ergebnis["Tore_Heim"],
+                ergebnis["Tore_Auswaerts"],
+            )
+        return vergleich
+
+    def spiel_eintragen(self, heim, auswaerts, tore_heim, tore_auswaerts):
+        """
+        Trägt ein Spielergebnis ein.
+        Args:
+            heim (int): ID des Heimteams.
+            auswaerts (int): ID des Auswärtsteams.
+            tore_heim (int): Die Tore des Heimteams.
+            tore_auswaerts (int): Die Tore des Auswärtsteams.
+        """
+        self.tore[heim, auswaerts] += tore_heim
+        self.tore[auswaerts, heim] += tore_auswaerts
+        self.auswaertstore[auswaerts, heim] += tore_auswaerts
+        if tore_heim > tore_auswaerts:
+            self.punkte[heim, auswaerts] += 3
+        elif tore_heim < tore_auswaerts:
+            self.punkte[auswaerts, heim] += 3
+        else:
+            self.punkte[heim, auswaerts] += 1
+            self.punkte[auswaerts, heim] += 1
+
+
+def _paarweise(vergleich, paarungen, tore_heim, tore_auswaerts):
+    """
+    Addiert simulierte Ergebnisse zum direkten Vergleich, je Run ein eigenes Array.
+    Args:
+        vergleich (DirekterVergleich): Bisherige Ergebnisse.
+        paarungen (np.ndarray): Heim- und Auswärts-ID je Spiel, Form (spiele, 2).
+        tore_heim (np.ndarray): Simulierte Heimtore der Form (runs, spiele).
+        tore_auswaerts (np.ndarray): Simulierte Auswärtstore der Form (runs, spiele).
+    Returns:
+        tuple: (punkte, tore, auswaertstore) der Form (runs, teams, teams).
+    """
+    runs = len(tore_heim)
+    punkte = np.repeat(vergleich.punkte[None], runs, axis=0)
+    tore = np.repeat(vergleich.tore[None], runs, axis=0)
+    auswaertstore = np.repeat(vergleich.auswaertstore[None], runs, axis=0)
+
+    for spiel, (heim, auswaerts) in enumerate(paarungen.tolist()):
+        heim_tore = tore_heim[:, spiel]
+        auswaerts_tore = tore_auswaerts[:, spiel]
+        tore[:, heim, auswaerts] += heim_tore
+        tore[:, auswaerts, heim] += auswaerts_tore
+        auswaertstore[:, auswaerts, heim] += auswaerts_tore
+        punkte[:, heim, auswaerts] += np.where(
+            heim_tore > auswaerts_tore, 3, heim_tore == auswaerts_tore
+        )
+        punkte[:, auswaerts, heim] += np.where(
+            heim_tore < auswaerts_tore, 3, heim_tore == auswaerts_tore
+        )
+    return punkte, tore, auswaertstore
+
+
+def tiebreak_reihenfolge(schluessel, paarungen, tore_heim, tore_auswaerts, vergleich):
+    """
+    Sortiert die simulierten Tabellen und löst Gleichstände über den direkten Vergleich.
+    Args:
+        schluessel (np.ndarray): Sortierschlüssel (Punkte, Differenz, Tore) der Form
+        (runs, teams).
+        paarungen (np.ndarray): Heim- und Auswärts-ID je Spiel, Form (spiele, 2).
+        tore_heim (np.ndarray): Simulierte Heimtore der Form (runs, spiele).
+        tore_auswaerts (np.ndarray): Simulierte Auswärtstore der Form (runs, spiele).
+        vergleich (DirekterVergleich): Bisherige Ergebnisse.
+    Returns:
+        np.ndarray: Team-IDs je Run von Platz 1 bis zum letzten Platz, Form (runs, teams).
+    """
+    reihenfolge = np.argsort(-schluessel, axis=1, kind="stable")
+    sortiert = np.take_along_axis(schluessel, reihenfolge, axis=1)
+    gleichstand = np.flatnonzero((sortiert[:, 1:] == sortiert[:, :-1]).any(axis=1))
+    if len(gleichstand) == 0:
+        return reihenfolge
+
+    primaer = schluessel[gleichstand]
+    punkte, tore, auswaertstore = _paarweise(
+        vergleich,
+        paarungen,
+        np.asarray(tore_heim)[gleichstand],
+        np.asarray(tore_auswaerts)[gleichstand],
+    )
+
+    # Direkter Vergleich nur gegen Teams mit identischem Schlüssel
+    gleichauf = primaer[:, :, None] == primaer[:, None, :]
+    vergleich_punkte = (gleichauf * punkte).sum(axis=2)
+    vergleich_differenz = (gleichauf * (tore - tore.transpose(0, 2, 1))).sum(axis=2)
+    vergleich_auswaertstore = (gleichauf * auswaertstore).sum(axis=2)
+    auswaertstore_gesamt = auswaertstore.sum(axis=2)
+
+    sekundaer = (
+        (
+            vergleich_punkte * VERGLEICH_BASIS
+            + vergleich_differenz
+            + VERGLEICH_BASIS // 2
+        )
+        * VERGLEICH_BASIS
+        + vergleich_auswaertstore
+    ) * VERGLEICH_BASIS + auswaertstore_gesamt
+
+    # Stabil erst nach dem sekundären, dann nach dem primären Schlüssel sortieren
+    nach_sekundaer = np.argsort(-sekundaer, axis=1, kind="stable")
+    nach_primaer = np.argsort(
+        -np.take_along_axis(primaer, nach_sekundaer, axis=1), axis=1, kind="stable"
+    )
+    reihenfolge[gleichstand] = np.take_along_axis(nach_sekundaer, nach_primaer, axis=1)
+    return reihenfolge
@@ -0,0 +1,309 @@
+"""
+Vektorisierte Simulation der verbleibenden Spiele einer Saison mit NumPy.
+
+Statt jede Saison einzeln in Python durchzuspielen, werden die Ergebnisse aller Runs
+eines Blocks auf einmal als Arrays gezogen, Punkte, Differenz und Tore per Scatter-Add
+aufsummiert und die Tabellen zeilenweise sortiert.
+"""
+
+import numpy as np
+from league_table import LeagueTable
+from sim_poisson import PaarungsAliasTabelle, ergebnis_raster
+from sim_tiebreak import tiebreak_reihenfolge
+from sim import (
+    AliasTabelle,
+    STANDARD_TORVERTEILUNG,
+    STANDARD_TORGEWICHTE_HEIM,
+    STANDARD_TORGEWICHTE_AUSWAERTS,
+)
+
+# Basis des zusammengesetzten Sortierschlüssels Punkte * B² + Differenz * B + Tore.
+# Solange |Differenz| < B / 2 und 0 <= Tore < B gilt, entspricht die Sortierung nach
+# diesem Schlüssel exakt der Sortierung nach dem Tupel (Punkte, Differenz, Tore).
+SCHLUESSEL_BASIS = 1 << 12
+
+STANDARD_BLOCKGROESSE = 50_000
+
+
+def ergebnis_tabelle(
+    torverteilung=None, torgewichte_heim=None, torgewichte_auswaerts=None
+):
+    """
+    Bildet aus den Torverteilungen die Wahrscheinlichkeiten aller Spielergebnisse.
+    Heim- und Auswärtstore werden wie in simulate_game_realgoals unabhängig gezogen.
+    Args:
+        torverteilung (list): Liste der möglichen Toranzahlen eines Teams.
+        torgewichte_heim (list): Gewichtungen der Toranzahlen für Heimtore.
+        torgewichte_auswaerts (list): Gewichtungen der Toranzahlen für Auswärtstore.
+    Returns:
+        tuple: (wahrscheinlichkeiten, tore_heim, tore_auswaerts) als Arrays mit je
+        einem Eintrag pro Spielergebnis.
+    """
+    if torverteilung is None:
+        torverteilung = STANDARD_TORVERTEILUNG
+    if torgewichte_heim is None:
+        torgewichte_heim = STANDARD_TORGEWICHTE_HEIM
+    if torgewichte_auswaerts is None:
+        torgewichte_auswaerts = STANDARD_TORGEWICHTE_AUSWAERTS
+    if len(torgewichte_heim) != len(torverteilung) or len(torgewichte_auswaerts) != len(
+        torverteilung
+    ):
+        raise ValueError(
+            "Die Listen der Gewichtungen müssen die gleiche Länge wie die Torverteilung haben."
+        )
+
+    tore = np.asarray(torverteilung, dtype=np.int64)
+    gewichte_heim = np.asarray(torgewichte_heim, dtype=np.float64)
+    gewichte_auswaerts = np.asarray(torgewichte_auswaerts, dtype=np.float64)
+    gewichte_heim = gewichte_heim / gewichte_heim.sum()
+    gewichte_auswaerts = gewichte_auswaerts / gewichte_auswaerts.sum()
+
+    wahrscheinlichkeiten = np.outer(gewichte_heim, gewichte_auswaerts).ravel()
+    tore_heim = np.repeat(tore, len(tore))
+    tore_auswaerts = np.tile(tore, len(tore))
+    return wahrscheinlichkeiten, tore_heim, tore_auswaerts
+
+
+def schluessel_deltas(tore_heim, tore_auswaerts):
+    """
+    Berechnet für jedes Spielergebnis die Änderung des Sortierschlüssels von Heim- und
+    Auswärtsteam.
+    Args:
+        tore_heim (np.ndarray): Heimtore je Spielergebnis.
+        tore_auswaerts (np.ndarray): Auswärtstore je Spielergebnis.
+    Returns:
+        tuple: (delta_heim, delta_auswaerts) als int64-Arrays.
+    """
+    punkte_heim = np.where(
+        tore_heim > tore_auswaerts, 3, np.where(tore_heim == tore_auswaerts, 1, 0)
+    )
+    punkte_auswaerts = np.where(
+        tore_heim < tore_auswaerts, 3, np.where(tore_heim == tore_auswaerts, 1, 0)
+    )
+    delta_heim = (
+        punkte_heim * SCHLUESSEL_BASIS**2
+        + (tore_heim - tore_auswaerts) * SCHLUESSEL_BASIS
+        + tore_heim
+    )
+    delta_auswaerts = (
+        punkte_auswaerts * SCHLUESSEL_BASIS**2
+        + (tore_auswaerts - tore_heim) * SCHLUESSEL_BASIS
+        + tore_auswaerts
+    )
+    return delta_heim.astype(np.int64), delta_auswaerts.astype(np.int64)
+
+
+def basis_schluessel(punkte, differenz, tore):
+    """
+    Setzt den Sortierschlüssel der Ausgangstabelle zusammen.
+    Args:
+        punkte (np.ndarray): Punkte je Team.
+        differenz (np.ndarray): Tordifferenz je Team.
+        tore (np.ndarray): Erzielte Tore je Team.
+    Returns:
+        np.ndarray: Sortierschlüssel je Team (int64).
+    """
+    return punkte * SCHLUESSEL_BASIS**2 + differenz * SCHLUESSEL_BASIS + tore
+
+
+def schluessel_zerlegen(schluessel):
+    """
+    Zerlegt Sortierschlüssel wieder in Punkte, Tordifferenz und Tore.
+    Args:
+        schluessel (np.ndarray): Sortierschlüssel (siehe basis_schluessel).
+    Returns:
+        tuple: (punkte, differenz, tore) als Arrays derselben Form.
+    """
+    tore = schluessel % SCHLUESSEL_BASIS
+    rest = (schluessel - tore) // SCHLUESSEL_BASIS
+    punkte = (rest + SCHLUESSEL_BASIS // 2) // SCHLUESSEL_BASIS
+    return punkte, rest - punkte * SCHLUESSEL_BASIS, tore
+
+
+def plaetze_aus_reihenfolge(reihenfolge):
+    """
+    Kehrt die Reihenfolge der Endtabellen in den Platz jedes Teams um.
+    Args:
+        reihenfolge (np.ndarray): Team-IDs je Run von Platz 1 bis zum letzten Platz,
+        Form (runs, teams).
+    Returns:
+        np.ndarray: Platz je Run und Team (1 = Erster), Form (runs, teams).
+    """
+    plaetze = np.empty_like(reihenfolge)
+    np.put_along_axis(
+        plaetze,
+        reihenfolge,
+        np.arange(1, reihenfolge.shape[1] + 1)[np.newaxis, :],
+        axis=1,
+    )
+    return plaetze
+
+
+def platzierungen_zaehlen(schluessel):
+    """
+    Sortiert die simulierten Tabellen eines Blocks absteigend und zählt, wie oft jedes
+    Team auf jedem Platz landet. Bei Gleichstand bleibt wie bei sorted() die
+    ursprüngliche Tabellenreihenfolge erhalten.
+    Args:
+        schluessel (np.ndarray): Sortierschlüssel der Form (runs, teams).
+    Returns:
+        np.ndarray: Zählmatrix der Form (teams, plätze).
+    """
+    return reihenfolge_zaehlen(np.argsort(-schluessel, axis=1, kind="stable"))
+
+
+def reihenfolge_zaehlen(reihenfolge):
+    """
+    Zählt, wie oft jedes Team auf jedem Platz landet.
+    Args:
+        reihenfolge (np.ndarray): Team-IDs je Run von Platz 1 bis zum letzten Platz,
+        Form (runs, teams).
+    Returns:
+        np.ndarray: Zählmatrix der Form (teams, plätze).
+    """
+    anzahl_teams = reihenfolge.shape[1]
+    plaetze = np.arange(anzahl_teams)
+    zaehlung = np.bincount(
+        (reihenfolge * anzahl_teams + plaetze).ravel(),
+        minlength=anzahl_teams * anzahl_teams,
+    )
+    return zaehlung.reshape(anzahl_teams, anzahl_teams)
+
+
+def inzidenzmatrix(heim_idx, auswaerts_idx, anzahl_teams):
+    """
+    Baut die Zuordnung der Spiele zu den Teams als 0/1-Matrix auf.
+    Args:
+        heim_idx (np.ndarray): Index des Heimteams je Spiel.
+        auswaerts_idx (np.ndarray): Index des Auswärtsteams je Spiel.
+        anzahl_teams (int): Anzahl der Teams.
+    Returns:
+        np.ndarray: Matrix der Form (2 * spiele, teams); die ersten Zeilen gehören zu
+        den Heimteams, die folgenden zu den Auswärtsteams.
+    """
+    anzahl_spiele = len(heim_idx)
+    inzidenz = np.zeros((2 * anzahl_spiele, anzahl_teams), dtype=np.float64)
+    inzidenz[np.arange(anzahl_spiele), heim_idx] = 1.0
+    inzidenz[anzahl_spiele + np.arange(anzahl_spiele), auswaerts_idx] = 1.0
+    return inzidenz
+
+
+def schluessel_aus_ergebnissen(basis, inzidenz, ergebnisse, deltas):
+    """
+    Berechnet die Sortierschlüssel der Endtabellen aus gezogenen Spielergebnissen.
+    Args:
+        basis (np.ndarray): Sortierschlüssel der Ausgangstabelle je Team.
+        inzidenz (np.ndarray): Zuordnung der Spiele zu den Teams (siehe inzidenzmatrix).
+        ergebnisse (np.ndarray): Index des Spielergebnisses der Form (runs, spiele).
+        deltas (tuple): (delta_heim, delta_auswaerts) je Spielergebnis.
+    Returns:
+        np.ndarray: Sortierschlüssel der Endtabellen der Form (runs, teams).
+    """
+    delta_heim, delta_auswaerts = deltas
+
+    # Scatter-Add als Matrixprodukt mit der 0/1-Inzidenzmatrix. Alle Werte sind ganze
+    # Zahlen deutlich unter 2**53 und werden daher in float64 exakt summiert.
+    aenderungen = np.concatenate(
+        (delta_heim[ergebnisse], delta_auswaerts[ergebnisse]), axis=1
+    ).astype(np.float64)
+    return (aenderungen @ inzidenz).astype(np.int64) + basis
+
+
+def simulate_block(basis, inzidenz, ergebnis_sampler, deltas, runs, rng):
+    """
+    Simuliert einen Block von Saisons auf einmal.
+    Args:
+        basis (np.ndarray): Sortierschlüssel der Ausgangstabelle je Team.
+        inzidenz (np.ndarray): Zuordnung der Spiele zu den Teams (siehe inzidenzmatrix).
+        ergebnis_sampler (AliasTabelle): Alias-Tabelle der Spielergebnisse.
+        deltas (tuple): (delta_heim, delta_auswaerts) je Spielergebnis.
+        runs (int): Anzahl der Saisons in diesem Block.
+        rng (np.random.Generator): Zufallsgenerator.
+    Returns:
+        np.ndarray: Sortierschlüssel der Endtabellen der Form (runs, teams).
+    """
+    anzahl_spiele = inzidenz.shape[0] // 2
+    ergebnisse = ergebnis_sampler.ziehen((runs, anzahl_spiele), rng)
+    return schluessel_aus_ergebnissen(basis, inzidenz, ergebnisse, deltas)
+
+
+def simulate_runs_vectorized(
+    table_raw,
+    fixtures,
+    runs,
+    torverteilung=None,
+    torgewichte_heim=None,
+    torgewichte_auswaerts=None,
+    rng=None,
+    blockgroesse=STANDARD_BLOCKGROESSE,
+    vergleich=None,
+    modell=None,
+    speicher=None,
+):
+    """
+    Simuliert die verbleibenden Spiele blockweise mit NumPy und zählt die Platzierungen.
+    Args:
+        table_raw (list of dict): Eingelesene Tabelle.
+        fixtures (list of tuples): Liste von (Heim, Auswärts)-Tupeln.
+        runs (int): Anzahl der durchzuführenden Simulationen.
+        torverteilung (list): Optionale Torverteilung für die Simulation.
+        torgewichte_heim (list): Optionale Heimtor-Gewichte.
+        torgewichte_auswaerts (list): Optionale Auswärtstor-Gewichte.
+        rng (np.random.Generator): Optionaler Zufallsgenerator.
+        blockgroesse (int): Anzahl der Saisons, die gleichzeitig im Speicher liegen.
+        vergleich (DirekterVergleich): Optionale bisherige Ergebnisse. Ist er gesetzt,
+        werden Gleichstände über den direkten Vergleich aufgelöst (siehe sim_tiebreak).
+        modell (PoissonModell): Optionales Modell der Teamstärken. Ist es gesetzt, wird
+        für jede Paarung aus ihrer eigenen Ergebnismatrix gezogen und die Torverteilung
+        samt Gewichten ignoriert.
+        speicher (EndtabellenSchreiber): Optionaler Speicher, an den Platz, Punkte und
+        Tordifferenz jedes Teams in jedem Run angehängt werden (siehe sim_store).
+    Returns:
+        np.ndarray: Zählmatrix der Form (teams, plätze); Zeilen in Tabellenreihenfolge,
+        Spalte 0 entspricht Platz 1.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+
+    tabelle = LeagueTable.aus_tabelle(table_raw)
+    paarungen = tabelle.paarungen_indizes(fixtures)
+    heim_idx, auswaerts_idx = paarungen[:, 0], paarungen[:, 1]
+    if modell is None:
+        wahrscheinlichkeiten, tore_heim, tore_auswaerts = ergebnis_tabelle(
+            torverteilung, torgewichte_heim, torgewichte_auswaerts
+        )
+        ergebnis_sampler = AliasTabelle(wahrscheinlichkeiten)
+    else:
+        matrizen = modell.paarungs_matrizen(fixtures)
+        ergebnis_sampler = PaarungsAliasTabelle(matrizen.reshape(len(fixtures), -1))
+        tore_heim, tore_auswaerts = ergebnis_raster(matrizen.shape[1] - 1)
+    deltas = schluessel_deltas(tore_heim, tore_auswaerts)
+    basis = basis_schluessel(*tabelle.als_arrays())
+    inzidenz = inzidenzmatrix(heim_idx, auswaerts_idx, len(tabelle))
+
+    zaehlmatrix = np.zeros((len(tabelle), len(tabelle)), dtype=np.int64)
+    verbleibend = runs
+    while verbleibend > 0:
+        block = min(blockgroesse, verbleibend)
+        if vergleich is None:
+            schluessel = simulate_block(
+                basis, inzidenz, ergebnis_sampler, deltas, block, rng
+            )
+            reihenfolge = np.argsort(-schluessel, axis=1, kind="stable")
+        else:
+            ergebnisse = ergebnis_sampler.ziehen((block, len(paarungen)), rng)
+            schluessel = schluessel_aus_ergebnissen(basis, inzidenz, ergebnisse, deltas)
+            reihenfolge = tiebreak_reihenfolge(
+                schluessel,
+                paarungen,
+                tore_heim[ergebnisse],
+                tore_auswaerts[ergebnisse],
+                vergleich,
+            )
+        zaehlmatrix += reihenfolge_zaehlen(reihenfolge)
+        if speicher is not None:
+            punkte, differenz, _ = schluessel_zerlegen(schluessel)
+            speicher.anhaengen(plaetze_aus_reihenfolge(reihenfolge), punkte, differenz)
+        verbleibend -= block
+
+    return zaehlmatrix
@@ -0,0 +1,56 @@
+"""
+Shared test data: a small example league and saved kicker.de pages.
+"""
+
+from tests.kicker_server import matchday_page, table_page
+
+
+def make_row(team, tore, differenz, punkte):
+    """
+    Build a table row in the format returned by read_csv_table.
+    """
+    return {
+        "Team": team,
+        "Spiele": "33",
+        "Siege": "0",
+        "Unentschieden": "0",
+        "Niederlagen": "0",
+        "Tore": tore,
+        "Differenz": str(differenz),
+        "Punkte": str(punkte),
+    }
+
+
+TABLE = [
+    make_row("Team A", "50:30", 20, 60),
+    make_row("Team B", "45:30", 15, 59),
+    make_row("Team C", "40:40", 0, 40),
+    make_row("Team D", "30:40", -10, 40),
+]
+FIXTURES = [("Team B", "Team A"), ("Team C", "Team D")]
+
+# Heimteams gewinnen immer 1:0
+HEIMSIEG = {
+    "torverteilung": [0, 1],
+    "torgewichte_heim": [0.0, 1.0],
+    "torgewichte_auswaerts": [1.0, 0.0],
+}
+TEAMS = [row["Team"] for row in TABLE]
+
+PAGES = {
+    "/liga/tabelle": table_page(
+        [
+            ("Team A (M)", 2, 2, 0, 0, "5:1", 4, 6),
+            ("Team B", 2, 1, 0, 1, "3:3", 0, 3),
+        ]
+    ),
+    "/liga/spieltag/2024-25/1": matchday_page(
+        [("Team A", "Team B", 3, 0), ("Team C", "Team D", 1, 1)]
+    ),
+    "/liga/spieltag/2024-25/2": matchday_page(
+        [("Team B", "Team C", 2, 1), ("Team D", "Team A", 0, 2)]
+    ),
+    "/liga/spieltag/2024-25/3": matchday_page(
+        [("Team A", "Team C"), ("Team B", "Team D")]
+    ),
+}
@@ -0,0 +1,143 @@
+"""
+Local stand-in for kicker.de that serves saved pages, for scraping tests without network.
+"""
+
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def table_page(rows):
+    """
+    Build a table page with the structure of kicker.de.
+    Args:
+        rows (list of tuple): (Team, Spiele, Siege, Unentschieden, Niederlagen, Tore,
+        Differenz, Punkte) per team in table order.
+    Returns:
+        str: The HTML page.
+    """
+    body = []
+    for platz, (team, *werte) in enumerate(rows, start=1):
+        zellen = "".join(f"<td>{wert}</td>" for wert in werte)
+        body.append(
+            f"<tr><td>{platz}</td><td></td><td></td>"
+            f'<td><span class="kick__table--show-desktop">{team}</span></td>'
+            f"{zellen}</tr>"
+        )
+    return (
+        "<html><body><table class="
+        '"kick__table kick__table--ranking kick__table--alternate '
+        'kick__table--resptabelle">'
+        f"<thead><tr><th>Pl.</th></tr></thead><tbody>{''.join(body)}</tbody>"
+        "</table></body></html>"
+    )
+
+
+def matchday_page(games):
+    """
+    Build a matchday page with the structure of kicker.de.
+    Args:
+        games (list of tuple): (Heim, Auswärts) for upcoming games or
+        (Heim, Auswärts, Tore Heim, Tore Auswärts) for played ones.
+    Returns:
+        str: The HTML page.
+    """
+    cells = []
+    for heim, auswaerts, *tore in games:
+        teams = "".join(
+            '<a class="kick__v100-gameCell__team">'
+            f'<div class="kick__v100-gameCell__team__name">{team}</div></a>'
+            for team in (heim, auswaerts)
+        )
+        scores = "".join(
+            f'<div class="kick__v100-scoreBoard__scoreHolder__score">{tor}</div>'
+            for tor in tore
+        )
+        cells.append(
+            '<div class="kick__v100-gameList__gameRow__gameCell">'
+            f"{teams}{scores}</div>"
+        )
+    return (
+        '<html><body><main class="kick__data-grid__main">'
+        '<div class="kick__v100-gameList kick__module-margin">'
+        f"{''.join(cells)}</div></main></body></html>"
+    )
+
+
+class KickerServer:
+    """
+    Threaded HTTP server on localhost that serves pages from a dictionary.
+    """
+
+    def __init__(self, pages, failures=None):
+        """
+        Args:
+            pages (dict): Path -> HTML. Unknown paths answer with 404.
+            failures (dict): Optional path -> number of 503 answers before the page is
+            served.
+        Pages carry an ETag and conditional requests for unchanged pages get a 304.
+        """
+        self.pages = pages
+        self.failures = dict(failures or {})
+        self.requests = []
+        self.lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            """
+            Serves the pages of the enclosing server and records every request.
+            """
+
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):  # pylint: disable=invalid-name
+                """
+                Answer with the page, a 304 for a matching ETag, a pending 503 or a 404.
+                """
+                with server.lock:
+                    server.requests.append(self.path)
+                    failing = server.failures.get(self.path, 0)
+                    if failing:
+                        server.failures[self.path] = failing - 1
+                if failing:
+                    self._send(503, b"")
+                elif self.path in server.pages:
+                    body = server.pages[self.path].encode("utf-8")
+                    etag = f'"{hashlib.md5(body).hexdigest()}"'
+                    if self.headers.get("If-None-Match") == etag:
+                        self._send(304, b"", etag)
+                    else:
+                        self._send(200, body, etag)
+                else:
+                    self._send(404, b"")
+
+            def _send(self, status, body, etag=None):
+                """
+                Send a response with an optional ETag.
+                """
+                self.send_response(status)
+                if etag:
+                    self.send_header("ETag", etag)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                """
+                Keep the test output free of request logs.
+                """
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(
+            target=self.httpd.serve_forever, args=(0.05,), daemon=True
+        )
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
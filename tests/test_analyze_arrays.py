@@ -0,0 +1,98 @@
+"""
+Tests for the vectorized goal analysis.
+"""
+
+import numpy as np
+from analyze_arrays import (
+    analysieren,
+    simulationsgewichte,
+    spalten_aus_ergebnissen,
+    tor_obergrenze,
+)
+from analyze_matchdays import analyze_goals_separated, berechne_gewichte
+from results_archive import ErgebnisArchiv
+from sim_vectorized import simulate_runs_vectorized
+from utils import read_csv_result_columns, read_csv_results
+from tests.daten import FIXTURES, TABLE
+
+DATEIPFAD = "data/ergebnisse_spieltag_1_bis_29.csv"
+
+
+def test_matches_counter_analysis():
+    """
+    With the previous five buckets the weights equal those of berechne_gewichte.
+    """
+    ergebnisse = read_csv_results(DATEIPFAD)
+    heimtore, auswaertstore, verteilung = analyze_goals_separated(ergebnisse)
+    analyse = analysieren(read_csv_result_columns(DATEIPFAD), max_tore=4)
+
+    assert analyse["torverteilung"] == [0, 1, 2, 3, 4], "Five buckets."
+    assert np.allclose(
+        analyse["gewichte_heim"][0], berechne_gewichte(heimtore)
+    ), "Home weights should match berechne_gewichte."
+    assert np.allclose(
+        analyse["gewichte_auswaerts"][0], berechne_gewichte(auswaertstore)
+    ), "Away weights should match berechne_gewichte."
+    assert analyse["ergebnisse"][0].tolist() == [
+        verteilung["Sieg"],
+        verteilung["Unentschieden"],
+        verteilung["Niederlage"],
+    ], "W/D/L counts should match analyze_goals_separated."
+
+
+def test_groups_and_data_driven_buckets():
+    """
+    Leagues, seasons and matchday windows are counted in one pass, and the bucket
+    range follows the data.
+    """
+    ergebnisse = read_csv_results(DATEIPFAD)
+    with ErgebnisArchiv(":memory:") as archiv:
+        for liga, saison in (("a", "2022-23"), ("a", "2023-24"), ("b", "2023-24")):
+            archiv.importieren(
+                liga,
+                saison,
+                [
+                    {
+                        "Spieltag": e["Spieltag"],
+                        "Ergebnisse": [
+                            [
+                                e["Heim"],
+                                e["Auswaerts"],
+                                e["Tore_Heim"],
+                                9 * (liga == "b"),
+                            ]
+                        ],
+                    }
+                    for e in ergebnisse
+                ],
+            )
+        spalten = archiv.spalten()
+
+    analyse = analysieren(spalten, spieltag_fenster=[(1, 10), (11, 29)], abdeckung=1)
+    hinrunde = [e for e in ergebnisse if e["Spieltag"] <= 10]
+    heimtore = analyze_goals_separated(hinrunde)[0]
+    gruppe = analyse["schluessel"].index(("a", "2023-24", (1, 10)))
+
+    assert len(analyse["schluessel"]) == 6, "Two windows for three league seasons."
+    assert analyse["torverteilung"] == list(range(10)), "Nine away goals in league b."
+    assert analyse["heimtore"][gruppe].tolist() == [
+        heimtore[tore] for tore in range(10)
+    ], "Home goals of one group should match the Counter analysis."
+    assert tor_obergrenze(np.array([0] * 98 + [1, 7])) == 1, "Rare tails are pooled."
+    assert spalten_aus_ergebnissen(ergebnisse)["tore_heim"].tolist() == [
+        e["Tore_Heim"] for e in ergebnisse
+    ], "Columns from result dictionaries keep the game order."
+
+
+def test_weights_feed_the_simulation():
+    """
+    The output can be passed to the simulation engines unchanged.
+    """
+    analyse = analysieren(read_csv_result_columns(DATEIPFAD), abdeckung=1)
+    gewichte = simulationsgewichte(analyse)
+    zaehlmatrix = simulate_runs_vectorized(
+        TABLE, FIXTURES, 200, rng=np.random.default_rng(0), **gewichte
+    )
+
+    assert len(gewichte["torverteilung"]) == len(gewichte["torgewichte_heim"]), "Sizes."
+    assert zaehlmatrix.sum() == 200 * len(TABLE), "Every run places every team."
@@ -0,0 +1,64 @@
+"""
+Tests for the columnar .npz storage of tables, fixtures and results.
+"""
+
+import numpy as np
+import pytest
+from utils import (
+    convert_csv_to_npz,
+    read_csv_fixtures,
+    read_csv_results,
+    read_csv_table,
+    read_npz_fixtures,
+    read_npz_result_columns,
+    read_npz_results,
+    read_npz_table,
+    write_npz_results,
+)
+
+DATA = "data"
+
+
+def test_converters_round_trip(tmp_path):
+    """
+    Converted CSVs load back to exactly what the CSV readers return.
+    """
+    paare = [
+        ("zweite_liga_tabelle_2025-04-20_16-18-22", read_csv_table, read_npz_table),
+        (
+            "paarungen_ab_spieltag_31_2025-04-20_16-18-23",
+            read_csv_fixtures,
+            read_npz_fixtures,
+        ),
+        ("ergebnisse_spieltag_1_bis_29", read_csv_results, read_npz_results),
+    ]
+    for name, read_csv, read_npz in paare:
+        ziel = convert_csv_to_npz(f"{DATA}/{name}.csv", str(tmp_path / f"{name}.npz"))
+        assert read_npz(ziel) == read_csv(
+            f"{DATA}/{name}.csv"
+        ), f"Round trip of {name}."
+
+    with pytest.raises(ValueError):
+        read_npz_table(str(tmp_path / "ergebnisse_spieltag_1_bis_29.npz"))
+
+
+def test_result_columns_are_compact(tmp_path):
+    """
+    Results are stored with integer team IDs, int8 goals and an optional season.
+    """
+    ergebnisse = read_csv_results(f"{DATA}/ergebnisse_spieltag_1_bis_29.csv")
+    archiv = [
+        dict(e, Saison=saison) for saison in ("2023-24", "2024-25") for e in ergebnisse
+    ]
+    pfad = str(tmp_path / "archiv.npz")
+    write_npz_results(pfad, archiv)
+    spalten = read_npz_result_columns(pfad)
+
+    assert spalten["tore_heim"].dtype == np.int8, "Goals should be int8."
+    assert spalten["heim"].dtype == np.int16, "Teams should be integer IDs."
+    assert len(spalten["teams"]) == 18, "Each team name is stored once."
+    assert spalten["saisons"].tolist() == ["2023-24", "2024-25"], "Seasons."
+    assert read_npz_results(pfad) == archiv, "Seasons survive the round trip."
+
+    with pytest.raises(ValueError):
+        write_npz_results(pfad, [dict(ergebnisse[0], Tore_Heim=200)])
@@ -0,0 +1,64 @@
+"""
+Tests for the streaming CSV parser of fixture and result cells.
+"""
+
+import ast
+import csv
+import pytest
+from utils import (
+    iter_csv_results,
+    parse_list_cell,
+    read_csv_fixtures,
+    read_csv_result_columns,
+    read_csv_results,
+)
+
+ERGEBNISSE = "data/ergebnisse_spieltag_1_bis_29.csv"
+
+
+def test_parse_list_cell_matches_literal_eval():
+    """
+    The fast path gives the same entries as ast.literal_eval, including names with
+    apostrophes, and unusual cells fall back to it.
+    """
+    with open(ERGEBNISSE, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            erwartet = [tuple(e) for e in ast.literal_eval(row["Ergebnisse"])]
+            assert parse_list_cell(row["Ergebnisse"], 4) == erwartet, "Same entries."
+
+    zelle = repr([["Borussia M'gladbach", "1. FC Köln"], ["A, B", "C"]])
+    assert parse_list_cell(zelle, 2) == [
+        ("Borussia M'gladbach", "1. FC Köln"),
+        ("A, B", "C"),
+    ], "Quotes and commas inside names."
+    assert parse_list_cell("[['A', 'B', 1, 2]]", 4) == [
+        ("A", "B", "1", "2")
+    ], "Unquoted numbers fall back to literal_eval."
+    assert parse_list_cell("[]", 2) == [], "Empty cell."
+    with pytest.raises(ValueError):
+        parse_list_cell("[['A', 'B', 'C']]", 2)
+
+
+def test_readers_keep_their_formats():
+    """
+    The wrappers return the same structures as before, and the column reader agrees.
+    """
+    ergebnisse = read_csv_results(ERGEBNISSE)
+    spalten = read_csv_result_columns(ERGEBNISSE)
+    teams = spalten["teams"].tolist()
+
+    assert ergebnisse[0] == {
+        "Spieltag": 1,
+        "Heim": "1. FC Köln",
+        "Auswaerts": "Hamburger SV",
+        "Tore_Heim": 1,
+        "Tore_Auswaerts": 2,
+    }, "Normalized result format."
+    assert len(ergebnisse) == len(list(iter_csv_results(ERGEBNISSE))) == 261, "Games."
+    assert [teams[i] for i in spalten["heim"].tolist()] == [
+        e["Heim"] for e in ergebnisse
+    ], "Columns use the same order."
+    assert read_csv_fixtures("data/paarungen_spieltag_30.csv")[0] == (
+        "SV Elversberg",
+        "Fortuna Düsseldorf",
+    ), "Fixture tuples."
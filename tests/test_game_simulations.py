@@ -2,8 +2,19 @@
 Tests for the game simulations module.
 """
 
+import random
+import numpy as np
+import pytest
+
 # Import the functions to be tested from the folder one level above
-from sim import simulate_game_realgoals, simulate_game_randint
+from sim import (
+    simulate_game_realgoals,
+    simulate_game_randint,
+    TorSampler,
+    STANDARD_TORVERTEILUNG,
+    STANDARD_TORGEWICHTE_HEIM,
+    STANDARD_TORGEWICHTE_AUSWAERTS,
+)
 
 
 def test_simulate_game_realgoals_default():
@@ -65,3 +76,45 @@ def test_simulate_game_randint():
     ), "Away goals out of expected range."
     assert isinstance(home_goals, int), "Home goals should be an integer."
     assert isinstance(away_goals, int), "Away goals should be an integer."
+
+
+def test_tor_sampler_matches_random_choices():
+    """
+    Test that single draws reproduce random.choices for the same random state.
+    """
+    rng_choices = random.Random(5)
+    rng_sampler = random.Random(5)
+    sampler = TorSampler()
+
+    for _ in range(1000):
+        expected = (
+            rng_choices.choices(
+                STANDARD_TORVERTEILUNG, weights=STANDARD_TORGEWICHTE_HEIM, k=1
+            )[0],
+            rng_choices.choices(
+                STANDARD_TORVERTEILUNG, weights=STANDARD_TORGEWICHTE_AUSWAERTS, k=1
+            )[0],
+        )
+        assert sampler.ziehen(rng_sampler) == expected, "Draws should match."
+
+
+def test_tor_sampler_bulk():
+    """
+    Test the bulk draws of the TorSampler against the goal weights.
+    """
+    sampler = TorSampler([0, 1, 2], [0.5, 0.0, 0.5], [0.2, 0.3, 0.5])
+    home_goals, away_goals = sampler.ziehen_bulk((1000, 100), np.random.default_rng(0))
+
+    assert home_goals.shape == (1000, 100), "Bulk draws should have the given shape."
+    assert not (home_goals == 1).any(), "Goals with weight 0 should never be drawn."
+    assert (
+        abs((away_goals == 2).mean() - 0.5) < 0.01
+    ), "Bulk draws should follow the weights."
+
+
+def test_tor_sampler_invalid_weights():
+    """
+    Test that weights of the wrong length are rejected up front.
+    """
+    with pytest.raises(ValueError):
+        TorSampler([0, 1, 2], [0.5, 0.5], None)
@@ -0,0 +1,88 @@
+"""
+Tests for the headless heatmap rendering.
+"""
+
+import os
+import numpy as np
+import pytest
+from heatmap import (
+    MANIFEST,
+    HeatmapRenderer,
+    heatmap_titel,
+    heatmaps_rendern,
+    verteilung_laden,
+    verteilung_speichern,
+)
+from tests.daten import TEAMS
+
+DPI = 20
+
+
+def auftrag(tmp_path, name, verteilung):
+    """
+    Build a rendering job for the four-team example.
+    """
+    return {
+        "verteilung": verteilung,
+        "teams": TEAMS,
+        "titel": heatmap_titel(33),
+        "pfad": str(tmp_path / f"{name}.png"),
+    }
+
+
+def test_unchanged_heatmaps_are_skipped(tmp_path):
+    """
+    A second run renders nothing; a changed matrix re-renders only its heatmap.
+    """
+    auftraege = [
+        auftrag(tmp_path, name, np.eye(4) if name == "a" else np.full((4, 4), 0.25))
+        for name in ("a", "b", "c")
+    ]
+    erste = heatmaps_rendern(auftraege, dpi=DPI)
+    zweite = heatmaps_rendern(auftraege, dpi=DPI)
+    auftraege[1]["verteilung"] = np.eye(4)[::-1]
+    dritte = heatmaps_rendern(auftraege, dpi=DPI)
+
+    assert len(erste) == 3, "All heatmaps should be rendered the first time."
+    assert all(os.path.getsize(a["pfad"]) > 0 for a in auftraege), "PNGs exist."
+    assert os.path.exists(tmp_path / MANIFEST), "The manifest should be written."
+    assert zweite == [], "Unchanged heatmaps should be skipped."
+    assert dritte == [auftraege[1]["pfad"]], "Only the changed heatmap is rendered."
+
+
+def test_renderer_reuses_figure(tmp_path):
+    """
+    Heatmaps with the same number of teams share one figure; texts are updated and
+    the layout follows the seaborn heatmap.
+    """
+    renderer = HeatmapRenderer(dpi=DPI)
+    figur = renderer.rendern(np.eye(4), TEAMS, "erste", str(tmp_path / "a.png"))
+    zweite = renderer.rendern(
+        np.full((4, 4), 0.25), TEAMS, "zweite", str(tmp_path / "b.png")
+    )
+    ax = figur.axes[0]
+
+    assert zweite is figur, "The figure should be reused."
+    assert ax.texts[0].get_text() == "25.00", "Annotations show the new values."
+    assert ax.get_title() == "zweite", "The title should be updated."
+    assert ax.texts[0].get_fontsize() == pytest.approx(10.8), "Notebook context * 0.9."
+    assert ax.get_xticklabels()[0].get_rotation() == 90, "Team names are vertical."
+    assert ax.get_yticklabels()[0].get_rotation() == 0, "Places are horizontal."
+
+
+def test_parallel_rendering_from_files(tmp_path):
+    """
+    Worker processes render jobs loaded from saved probability matrices.
+    """
+    auftraege = []
+    for nummer in range(3):
+        eingabe = str(tmp_path / f"verteilung_{nummer}.npz")
+        verteilung_speichern(eingabe, np.roll(np.eye(4), nummer, axis=1), TEAMS, "t")
+        geladen = verteilung_laden(eingabe)
+        geladen["pfad"] = str(tmp_path / "png" / f"{nummer}.png")
+        auftraege.append(geladen)
+
+    gerendert = heatmaps_rendern(auftraege, workers=2, dpi=DPI)
+
+    assert sorted(gerendert) == sorted(a["pfad"] for a in auftraege), "All rendered."
+    assert auftraege[0]["teams"] == TEAMS, "Team names survive the round trip."
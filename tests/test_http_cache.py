@@ -0,0 +1,62 @@
+"""
+Tests for the on-disk page cache.
+"""
+
+from http_cache import PageCache
+from kicker_client import KickerClient
+from scrape_league import get_fixtures, get_matchday_results
+from tests.kicker_server import KickerServer, matchday_page
+from tests.daten import PAGES
+
+
+def client_for(server, cache):
+    """
+    Build a client for the local server without rate limit.
+    """
+    return KickerClient(base_url=server.url, requests_per_second=None, cache=cache)
+
+
+def test_finished_matchdays_are_immutable(tmp_path):
+    """
+    Finished matchdays are fetched once; upcoming ones are revalidated with a 304.
+    """
+    pages = dict(PAGES)
+    with KickerServer(pages) as server:
+        with client_for(server, PageCache(str(tmp_path), ttl=0)) as client:
+            erste = get_matchday_results(1, 2, league="liga", client=client)
+            get_fixtures(3, league="liga", end_matchday=3, client=client)
+        angefragt = len(server.requests)
+
+        with client_for(server, PageCache(str(tmp_path), ttl=0)) as client:
+            zweite = get_matchday_results(1, 2, league="liga", client=client)
+            fixtures = get_fixtures(3, league="liga", end_matchday=3, client=client)
+
+            # A changed upcoming page is picked up on revalidation
+            pages["/liga/spieltag/2024-25/3"] = matchday_page([("Team A", "Team D")])
+            geaendert = get_fixtures(3, league="liga", end_matchday=3, client=client)
+
+    assert angefragt == 3, "Each page should be fetched once."
+    assert zweite == erste, "Cached results should be identical."
+    assert server.requests[3:] == [
+        "/liga/spieltag/2024-25/3",
+        "/liga/spieltag/2024-25/3",
+    ], "Only the upcoming matchday should be revalidated."
+    assert fixtures[0]["Paarungen"][0] == ["Team A", "Team C"], "304 serves cache."
+    assert geaendert[0]["Paarungen"] == [["Team A", "Team D"]], "Changes are seen."
+
+
+def test_ttl_and_offline_mode(tmp_path):
+    """
+    Within the TTL and in offline mode no request is made at all.
+    """
+    path = "/liga/spieltag/2024-25/3"
+    with KickerServer(PAGES) as server:
+        with client_for(server, PageCache(str(tmp_path), ttl=3600)) as client:
+            assert client.get(path) == PAGES[path], "First fetch from the server."
+            assert client.get(path) == PAGES[path], "Second fetch within the TTL."
+        assert server.requests == [path], "The TTL should avoid a second request."
+
+    offline = PageCache(str(tmp_path), ttl=0, offline=True)
+    with KickerClient(base_url="http://127.0.0.1:9", cache=offline) as client:
+        assert client.get(path) == PAGES[path], "Offline mode serves cached pages."
+        assert client.get("/liga/tabelle") is None, "Uncached pages are missing."
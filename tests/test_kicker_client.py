@@ -0,0 +1,66 @@
+"""
+Tests for the pooled kicker.de client against a local stand-in server.
+"""
+
+import time
+from kicker_client import KickerClient, RateLimiter
+from scrape_league import get_current_table, get_fixtures, get_matchday_results
+from tests.kicker_server import KickerServer
+from tests.daten import PAGES
+
+
+def test_scrapers_through_local_server():
+    """
+    The scrapers parse pages served by the local stand-in and keep matchday order.
+    """
+    with KickerServer(PAGES) as server, KickerClient(
+        base_url=server.url, requests_per_second=None
+    ) as client:
+        table = get_current_table(league="liga", client=client)
+        results = get_matchday_results(1, 2, league="liga", client=client)
+        fixtures = get_fixtures(3, 4, league="liga", client=client)
+
+    assert [row["Team"] for row in table] == ["Team A", "Team B"], "Table teams."
+    assert table[0]["Punkte"] == "6", "Table values should be parsed."
+    assert [r["Spieltag"] for r in results] == [1, 2], "Results keep matchday order."
+    assert results[1]["Ergebnisse"][1] == ["Team D", "Team A", "0", "2"], "Scores."
+    assert fixtures == [
+        {"Spieltag": 3, "Paarungen": [["Team A", "Team C"], ["Team B", "Team D"]]}
+    ], "Missing matchday 4 (404) should be skipped."
+
+
+def test_retries_transient_failures():
+    """
+    A page that fails with 503 is retried until it is served; giving up returns None.
+    """
+    path = "/liga/spieltag/2024-25/1"
+    with KickerServer(PAGES, failures={path: 2}) as server:
+        with KickerClient(
+            base_url=server.url, backoff=0.01, requests_per_second=None
+        ) as client:
+            assert client.get(path) == PAGES[path], "Third attempt should succeed."
+            assert server.requests.count(path) == 3, "Two retries were needed."
+
+        server.failures[path] = 5
+        with KickerClient(
+            base_url=server.url, retries=1, backoff=0.01, requests_per_second=None
+        ) as client:
+            assert client.get(path) is None, "Client should give up after retries."
+
+
+def test_rate_limit_and_concurrency():
+    """
+    The rate limiter spaces out requests and get_many keeps the order of the paths.
+    """
+    limiter = RateLimiter(50)
+    start = time.monotonic()
+    for _ in range(6):
+        limiter.wait()
+    assert time.monotonic() - start >= 5 / 50 * 0.9, "Requests should be spaced out."
+
+    paths = [f"/liga/spieltag/2024-25/{matchday}" for matchday in (3, 1, 2)]
+    with KickerServer(PAGES) as server, KickerClient(
+        base_url=server.url, max_concurrency=3, requests_per_second=None
+    ) as client:
+        pages = client.get_many(paths)
+    assert pages == [PAGES[path] for path in paths], "Order of paths is kept."
@@ -0,0 +1,80 @@
+"""
+Tests for the LeagueTable representation.
+"""
+
+import pytest
+from league_table import LeagueTable
+from sim import update_table
+from utils import read_csv_table
+from tests.daten import FIXTURES, TABLE
+
+
+def test_unknown_fixture_team_is_rejected():
+    """
+    Fixtures with team names missing from the table raise a ValueError.
+    """
+    tabelle = LeagueTable.aus_tabelle(TABLE)
+    with pytest.raises(ValueError, match="Team X"):
+        tabelle.paarungen_indizes([("Team A", "Team X")])
+
+
+def test_fixture_indices_use_table_order():
+    """
+    Team IDs correspond to the row order of the table.
+    """
+    tabelle = LeagueTable.aus_tabelle(TABLE)
+    paarungen = tabelle.paarungen_indizes(FIXTURES)
+    assert paarungen.tolist() == [[1, 0], [2, 3]], "IDs should follow table order"
+
+
+def test_copy_and_reset_are_independent():
+    """
+    Changes to a copy do not leak into the base table and a reset restores it.
+    """
+    basis = LeagueTable.aus_tabelle(TABLE)
+    kopie = basis.kopie()
+    kopie.spiel_eintragen(1, 0, 2, 0)
+    assert basis.punkte == [60, 59, 40, 40], "Base table must stay unchanged"
+    assert kopie.punkte == [60, 62, 40, 40], "Copy should contain the result"
+
+    kopie.zuruecksetzen(basis)
+    assert kopie.punkte == basis.punkte, "Reset should restore the base points"
+    assert kopie.tore == basis.tore, "Reset should restore the base goals"
+
+
+def test_matches_update_table():
+    """
+    Entering results by ID yields the same ranking as update_table on dicts.
+    """
+    table_raw = read_csv_table("data/zweite_liga_tabelle_2025-04-20_16-18-22.csv")
+    tabelle = LeagueTable.aus_tabelle(table_raw)
+    table = {
+        row["Team"]: {
+            "Punkte": int(row["Punkte"]),
+            "Tore": int(row["Tore"].split(":")[0]),
+            "Gegentore": int(row["Tore"].split(":")[1]),
+            "Spiele": int(row["Spiele"]),
+            "Siege": int(row["Siege"]),
+            "Unentschieden": int(row["Unentschieden"]),
+            "Niederlagen": int(row["Niederlagen"]),
+        }
+        for row in table_raw
+    }
+    teams = tabelle.teams
+    for k, (heim, auswaerts) in enumerate(zip(teams, reversed(teams))):
+        tore = (k % 3, (k * 2) % 4)
+        update_table(table, heim, auswaerts, *tore)
+        tabelle.spiel_eintragen(
+            tabelle.team_id(heim), tabelle.team_id(auswaerts), *tore
+        )
+
+    erwartet = sorted(
+        table,
+        key=lambda t: (
+            table[t]["Punkte"],
+            table[t]["Tore"] - table[t]["Gegentore"],
+            table[t]["Tore"],
+        ),
+        reverse=True,
+    )
+    assert [teams[i] for i in tabelle.rangfolge()] == erwartet, "Rankings differ"
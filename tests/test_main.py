@@ -0,0 +1,39 @@
+"""
+Tests for the engine selection of main.py.
+"""
+
+import pytest
+from main import engine_options
+from sim_season_all import simulate_platzierungsverteilung
+from tests.daten import FIXTURES, HEIMSIEG, TABLE
+
+RESULTS = [
+    {"Heim": "Team A", "Auswaerts": "Team B", "Tore_Heim": 1, "Tore_Auswaerts": 0}
+]
+
+
+def test_exact_engine_is_reachable_without_tiebreak():
+    """
+    Without head-to-head tiebreaks no results are passed, so the exact engine runs.
+    """
+    optionen = engine_options("exact", False, "realgoals", RESULTS)
+    ergebnis = simulate_platzierungsverteilung(
+        TABLE, FIXTURES, runs=10, **optionen, **HEIMSIEG
+    )
+
+    assert optionen["ergebnisse"] is None, "No results without tiebreak."
+    assert ergebnis["runs"] == "exakt", "The exact engine should be used."
+
+
+def test_tiebreak_passes_results_and_rejects_exact():
+    """
+    With tiebreaks the results are passed to the simulation; the exact engine and
+    team-strength models are rejected for it instead of silently simulating.
+    """
+    optionen = engine_options("numpy", True, "realgoals", RESULTS)
+
+    assert optionen == {"engine": "numpy", "ergebnisse": RESULTS}, "Results passed."
+    with pytest.raises(ValueError):
+        engine_options("exact", True, "realgoals", RESULTS)
+    with pytest.raises(ValueError):
+        engine_options("exact", False, "poisson", RESULTS)
@@ -0,0 +1,85 @@
+"""
+Tests for the targeted kicker.de parsers.
+"""
+
+from scrape_league import (
+    final_scores,
+    find_region,
+    pairings,
+    parse_fixtures,
+    parse_matchday,
+    parse_results,
+    parse_table,
+    results_from_matchdays,
+)
+from tests.kicker_server import matchday_page
+from tests.daten import PAGES
+
+PADDING = "<script>var daten = '<main>';</script>" + "<div><p>Werbung</p></div>" * 50
+
+
+def padded(html):
+    """
+    Surround the data of a page with unrelated markup like on kicker.de.
+    """
+    return html.replace("<body>", f"<head>{PADDING}</head><body>{PADDING}")
+
+
+def test_targeted_parsing_matches_full_document():
+    """
+    Parsing only the data region gives the same result as parsing the whole page.
+    """
+    table = padded(PAGES["/liga/tabelle"])
+    played = padded(PAGES["/liga/spieltag/2024-25/1"])
+    upcoming = padded(PAGES["/liga/spieltag/2024-25/3"])
+
+    for backend in ("html.parser", "lxml"):
+        assert parse_table(table, backend) == parse_table(
+            table, backend, targeted=False
+        ), "Table should not depend on targeted parsing."
+        assert parse_results(played, backend) == (
+            [["Team A", "Team B", "3", "0"], ["Team C", "Team D", "1", "1"]],
+            2,
+        ), "Results and number of games."
+        assert parse_results(upcoming, backend) == ([], 2), "No scores yet."
+        assert parse_fixtures(upcoming, backend) == parse_fixtures(
+            upcoming, backend, targeted=False
+        ), "Fixtures should not depend on targeted parsing."
+
+
+def test_missing_region_and_fallback():
+    """
+    Pages without data give None and unexpected markup falls back to the full page.
+    """
+    assert (
+        parse_table("<html><body><p>Wartung</p></body></html>") is None
+    ), "A page without table gives None."
+    assert parse_fixtures("<html></html>") is None, "A page without games gives None."
+
+    # Closing tag missing: the cut fails and the whole document is parsed
+    html = '<main class="kick__data-grid__main"><div>Spiel</div>'
+    assert (
+        find_region(html, "main", "kick__data-grid__main") is not None
+    ), "The full document should be parsed as a fallback."
+
+
+def test_single_pass_matchday_status():
+    """
+    One parse yields pairings, scores and status; the old formats are views of it.
+    """
+    html = matchday_page([("Team A", "Team B", 2, 0), ("Team C", "Team D")])
+    live = html.replace(
+        '<div class="kick__v100-gameList__gameRow__gameCell">',
+        '<div class="kick__v100-gameList__gameRow__gameCell">'
+        '<span class="kick__v100-scoreBoard--live"></span>',
+    )
+    games = parse_matchday(html)
+
+    assert [game["Status"] for game in games] == ["beendet", "geplant"], "Status."
+    assert games[1]["Tore_Heim"] is None, "Scheduled games have no score."
+    assert parse_fixtures(html) == pairings(games), "Fixtures are a view."
+    assert parse_results(html) == (final_scores(games), 2), "Results are a view."
+    assert parse_matchday(live)[0]["Status"] == "live", "Live marker is detected."
+    assert results_from_matchdays(
+        [{"Spieltag": 5, "Spiele": parse_matchday(live)}]
+    ) == [{"Spieltag": 5, "Ergebnisse": []}], "Live games are not final results."
@@ -0,0 +1,103 @@
+"""
+Tests for the SQLite archive of historical results.
+"""
+
+from analyze_matchdays import analyze_goals_separated
+from kicker_client import KickerClient
+from results_archive import ErgebnisArchiv
+from utils import normalize_results, read_csv_results
+from tests.daten import PAGES
+from tests.kicker_server import KickerServer
+
+ERGEBNISSE_ROH = [
+    {"Spieltag": 1, "Ergebnisse": [["A", "B", 2, 0], ["C", "D", 1, 1]]},
+    {"Spieltag": 2, "Ergebnisse": [["B", "C", 0, 3], ["D", "A", 2, 1]]},
+]
+
+
+def test_ingest_is_idempotent():
+    """
+    Importing the same matchdays again adds nothing; corrected scores are updated.
+    """
+    with ErgebnisArchiv(":memory:") as archiv:
+        assert archiv.importieren("liga", "2023-24", ERGEBNISSE_ROH) == 4, "New."
+        assert archiv.importieren("liga", "2023-24", ERGEBNISSE_ROH) == 0, "Repeat."
+
+        korrigiert = [{"Spieltag": 2, "Ergebnisse": [["B", "C", 1, 3]]}]
+        assert archiv.importieren("liga", "2023-24", korrigiert) == 1, "Correction."
+        ergebnisse = archiv.ergebnisse("liga", "2023-24")
+
+    assert len(ergebnisse) == 4, "No game should be duplicated."
+    assert ergebnisse[2]["Tore_Heim"] == 1, "The corrected score should be stored."
+
+
+def test_queries_match_in_memory_analysis():
+    """
+    Goal counts and results from the archive match the in-memory analysis.
+    """
+    csv_ergebnisse = read_csv_results("data/ergebnisse_spieltag_1_bis_29.csv")
+    with ErgebnisArchiv(":memory:") as archiv:
+        for saison in ("2022-23", "2023-24"):
+            archiv.importieren(
+                "2-bundesliga",
+                saison,
+                [
+                    {
+                        "Spieltag": e["Spieltag"],
+                        "Ergebnisse": [
+                            [
+                                e["Heim"],
+                                e["Auswaerts"],
+                                e["Tore_Heim"],
+                                e["Tore_Auswaerts"],
+                            ]
+                        ],
+                    }
+                    for e in csv_ergebnisse
+                ],
+            )
+        archiv.importieren("liga", "2023-24", ERGEBNISSE_ROH)
+
+        zaehler = archiv.torhaeufigkeiten("2-bundesliga", ["2022-23", "2023-24"])
+        fenster = archiv.ergebnisse("2-bundesliga", "2023-24", 5, 10)
+        team = archiv.ergebnisse("liga", team="A")
+        saisons = archiv.saisons("2-bundesliga")
+
+    erwartet = analyze_goals_separated(csv_ergebnisse + csv_ergebnisse)
+    assert zaehler == erwartet, "Counts should match analyze_goals_separated."
+    assert [
+        {k: e[k] for k in ("Spieltag", "Heim", "Auswaerts", "Tore_Heim")}
+        for e in fenster
+    ] == [
+        {k: e[k] for k in ("Spieltag", "Heim", "Auswaerts", "Tore_Heim")}
+        for e in csv_ergebnisse
+        if 5 <= e["Spieltag"] <= 10
+    ], "The matchday window should return the games in order."
+    assert [e["Spieltag"] for e in team] == [1, 2], "Both games of team A."
+    assert saisons == ["2022-23", "2023-24"], "Seasons of the league."
+
+
+def test_update_fetches_only_open_matchdays(tmp_path):
+    """
+    Finished matchdays are fetched once; the upcoming one is fetched on every update.
+    """
+    pfad = str(tmp_path / "archiv.sqlite")
+    with KickerServer(PAGES) as server:
+        with KickerClient(base_url=server.url, requests_per_second=None) as client:
+            with ErgebnisArchiv(pfad) as archiv:
+                neu = archiv.aktualisieren("liga", "2024-25", 3, client=client)
+            with ErgebnisArchiv(pfad) as archiv:
+                erneut = archiv.aktualisieren("liga", "2024-25", 3, client=client)
+                fehlend = archiv.fehlende_spieltage("liga", "2024-25", 3)
+                ergebnisse = archiv.ergebnisse("liga")
+
+    assert neu == 4 and erneut == 0, "Games should be imported exactly once."
+    assert fehlend == [3], "Only the upcoming matchday should be missing."
+    assert server.requests.count("/liga/spieltag/2024-25/1") == 1, "Fetched once."
+    assert server.requests.count("/liga/spieltag/2024-25/3") == 2, "Refetched."
+    assert (
+        normalize_results(
+            [{"Spieltag": 1, "Ergebnisse": [["Team A", "Team B", 3, 0]]}]
+        )[0].items()
+        <= ergebnisse[0].items()
+    ), "Results in normalize_results format."
@@ -0,0 +1,303 @@
+"""
+Tests for the season simulation engines.
+"""
+
+import itertools
+import os
+import subprocess
+import sys
+import numpy as np
+import pytest
+from sim_parallel import aufteilen, merge_statistiken, run_sharded
+from sim_season_all import (
+    plot_platzierungsverteilung,
+    simulate_platzierungsverteilung,
+    simulate_runs_python,
+    simulate_season_for_all_teams,
+    simulate_season_stream,
+    simulate_shard,
+    verteilung_zu_dataframe,
+)
+from sim_exact import simulate_season_exact
+from sim_adaptive import simulate_adaptive, wilson_halbbreite
+from sim_vectorized import simulate_runs_vectorized
+from tests.daten import FIXTURES, HEIMSIEG, TABLE, make_row
+
+
+def test_simulate_runs_vectorized_counts():
+    """
+    Every team gets exactly one place per run and every place is taken once per run.
+    """
+    counts = simulate_runs_vectorized(
+        TABLE, FIXTURES, 1234, rng=np.random.default_rng(0), blockgroesse=500
+    )
+
+    assert counts.shape == (4, 4), "Count matrix should be teams x places."
+    assert (counts.sum(axis=0) == 1234).all(), "Each place must be taken once per run."
+    assert (counts.sum(axis=1) == 1234).all(), "Each team must be placed once per run."
+
+
+def test_simulate_runs_vectorized_deterministic_outcome():
+    """
+    With fixed results the vectorized engine must reproduce the Python ranking.
+    """
+    counts = simulate_runs_vectorized(TABLE, FIXTURES, 10, **HEIMSIEG)
+    python_counts = simulate_runs_python(TABLE, FIXTURES, 10, **HEIMSIEG)
+
+    # B: 62, A: 60, C: 43 (Diff +1), D: 40
+    assert counts[1, 0] == 10, "Team B should finish first."
+    assert counts[0, 1] == 10, "Team A should finish second."
+    for i, row in enumerate(TABLE):
+        for platz in range(4):
+            assert (
+                counts[i, platz] == python_counts[row["Team"]][platz + 1]
+            ), "Engines should agree on fixed results."
+
+
+def test_simulate_runs_vectorized_ties_keep_table_order():
+    """
+    Teams that are completely level keep their original table order.
+    """
+    table = [dict(row) for row in TABLE[2:]]
+    table[1].update({"Tore": "40:40", "Differenz": "0"})
+    counts = simulate_runs_vectorized(table, [], 5)
+
+    assert counts[0, 0] == 5, "The first team in the table should stay in front."
+    assert counts[1, 1] == 5, "The second team in the table should stay behind."
+
+
+def test_aufteilen():
+    """
+    Runs are split as evenly as possible without losing any.
+    """
+    assert aufteilen(10, 3) == [4, 3, 3], "Runs should be split evenly."
+    assert sum(aufteilen(1_000_001, 32)) == 1_000_001, "No runs should be lost."
+
+
+def test_run_sharded_reproducible():
+    """
+    The same seed and worker count yield identical results for both engines.
+    """
+    gewichte = {
+        "torverteilung": None,
+        "torgewichte_heim": None,
+        "torgewichte_auswaerts": None,
+    }
+    for engine in ("python", "numpy"):
+        ergebnisse = [
+            merge_statistiken(
+                run_sharded(
+                    simulate_shard,
+                    300,
+                    workers=2,
+                    seed=42,
+                    args=(engine, TABLE, FIXTURES, gewichte),
+                )
+            )
+            for _ in range(2)
+        ]
+
+        assert ergebnisse[0] == ergebnisse[1], "Seeded results should be identical."
+        assert (
+            sum(ergebnisse[0]["Team A"].values()) == 300
+        ), "All shards should be merged."
+
+
+def test_simulate_season_exact_matches_enumeration():
+    """
+    The exact engine agrees with a brute-force enumeration of all results.
+    """
+    torverteilung = [0, 1, 2]
+    gewichte_heim = [0.3, 0.5, 0.2]
+    gewichte_auswaerts = [0.5, 0.3, 0.2]
+    table = TABLE[:2] + [make_row("Team C", "40:40", 0, 58), TABLE[3]]
+    fixtures = FIXTURES + [("Team A", "Team C")]
+
+    erwartet = np.zeros((4, 4))
+    ergebnisse = list(itertools.product(range(3), range(3)))
+    for kombination in itertools.product(ergebnisse, repeat=len(fixtures)):
+        prob = 1.0
+        stand = {
+            row["Team"]: [int(row["Punkte"]), int(row["Differenz"]), 0] for row in table
+        }
+        for row in table:
+            stand[row["Team"]][2] = int(row["Tore"].split(":")[0])
+        for (heim, auswaerts), (h, a) in zip(fixtures, kombination):
+            prob *= gewichte_heim[h] * gewichte_auswaerts[a]
+            punkte = (3, 0) if h > a else (0, 3) if h < a else (1, 1)
+            for team, p, eigene, gegner in (
+                (heim, punkte[0], h, a),
+                (auswaerts, punkte[1], a, h),
+            ):
+                stand[team][0] += p
+                stand[team][1] += eigene - gegner
+                stand[team][2] += eigene
+        reihenfolge = sorted(
+            range(4), key=lambda i: tuple(stand[table[i]["Team"]]), reverse=True
+        )
+        for platz, i in enumerate(reihenfolge):
+            erwartet[i, platz] += prob
+
+    verteilung = simulate_season_exact(
+        table, fixtures, torverteilung, gewichte_heim, gewichte_auswaerts
+    )
+
+    assert np.allclose(verteilung, erwartet), "Exact distribution is wrong."
+
+
+def test_simulate_season_exact_too_large():
+    """
+    The exact engine gives up when the state space exceeds the limit.
+    """
+    assert (
+        simulate_season_exact(TABLE, FIXTURES, max_zustaende=10) is None
+    ), "Exact engine should return None for large state spaces."
+
+
+def test_wilson_halbbreite():
+    """
+    The Wilson half-width shrinks with more runs and stays positive at 0 %.
+    """
+    breiten = wilson_halbbreite(np.array([0, 500]), 1000)
+
+    assert breiten[0] > 0, "Half-width should be positive for a share of 0."
+    assert abs(breiten[1] - 1.96 * np.sqrt(0.25 / 1000)) < 1e-3, "Wrong half-width."
+    assert (
+        wilson_halbbreite(np.array([5000]), 10000)[0] < breiten[1]
+    ), "Half-width should shrink with more runs."
+
+
+def test_simulate_adaptive_stops_early():
+    """
+    Adaptive simulation stops once the tolerance is met and respects the budget.
+    """
+    rng = np.random.default_rng(0)
+
+    def simuliere_block(runs):
+        return simulate_runs_vectorized(TABLE, FIXTURES, runs, rng=rng)
+
+    zaehlung, runs, halbbreite = simulate_adaptive(
+        simuliere_block, toleranz=1.0, max_runs=1_000_000, blockgroesse=5_000
+    )
+    assert runs < 1_000_000, "Simulation should stop before the budget is used up."
+    assert halbbreite <= 1.0, "Achieved precision should meet the tolerance."
+    assert zaehlung.sum() == 4 * runs, "Counts should cover all runs."
+
+    _, runs, halbbreite = simulate_adaptive(
+        simuliere_block, toleranz=0.001, max_runs=12_000, blockgroesse=5_000
+    )
+    assert runs == 12_000, "Simulation should stop at the run budget."
+    assert halbbreite > 0.001, "Precision should be reported even if not met."
+
+
+def test_simulate_adaptive_rejects_empty_budget():
+    """
+    Without a run budget there would be no counts, so the call is rejected.
+    """
+    with pytest.raises(ValueError):
+        simulate_adaptive(lambda runs: None, toleranz=1.0, max_runs=0, blockgroesse=5)
+    with pytest.raises(ValueError):
+        simulate_adaptive(lambda runs: None, toleranz=1.0, max_runs=5, blockgroesse=0)
+
+
+def test_simulate_season_stream_snapshots():
+    """
+    The stream yields cumulative snapshots that add up to the requested runs.
+    """
+    for engine in ("python", "numpy"):
+        snapshots = list(
+            simulate_season_stream(
+                TABLE, FIXTURES, 2_500, intervall=1_000, engine=engine, seed=1
+            )
+        )
+
+        assert [runs for runs, _ in snapshots] == [
+            1_000,
+            2_000,
+            2_500,
+        ], "Snapshots should be taken every interval."
+        for runs, zaehlmatrix in snapshots:
+            assert (
+                zaehlmatrix.sum(axis=1) == runs
+            ).all(), "Snapshots should be cumulative."
+        assert (
+            snapshots[1][1] >= snapshots[0][1]
+        ).all(), "Snapshots must not share or lose counts."
+
+
+def test_verteilung_zu_dataframe():
+    """
+    The DataFrame has places as rows, teams as columns and percentages as values.
+    """
+    df = verteilung_zu_dataframe(
+        np.array([[2 / 3, 1 / 3], [1 / 3, 2 / 3]]), ["Team A", "Team B"]
+    )
+
+    assert list(df.index) == [1, 2], "Rows should be the places."
+    assert list(df.columns) == ["Team A", "Team B"], "Columns should be the teams."
+    assert df.at[1, "Team A"] == 66.67, "Values should be rounded percentages."
+    assert df.at[1, "Team B"] == 33.33, "The matrix should be transposed."
+
+
+def test_simulation_path_imports_no_plotting_libraries():
+    """
+    Importing the simulation and archive modules loads neither pandas nor the plotting
+    libraries nor the scraper dependencies.
+    """
+    ausgabe = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, sim_season_all, sim_queries, results_archive, analyze_arrays;"
+            "print(' '.join(m for m in ('pandas', 'matplotlib', 'seaborn', 'requests',"
+            " 'bs4') if m in sys.modules))",
+        ],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+
+    assert ausgabe.strip() == "", f"Heavy modules imported: {ausgabe.strip()}"
+
+
+def test_simulate_platzierungsverteilung_without_plot(tmp_path, monkeypatch):
+    """
+    The pure simulation returns the probability matrix; the wrapper builds the same
+    DataFrame and only plots when asked to.
+    """
+    monkeypatch.chdir(tmp_path)
+    ergebnis = simulate_platzierungsverteilung(
+        TABLE, FIXTURES, runs=50, engine="numpy", seed=0, **HEIMSIEG
+    )
+    df = simulate_season_for_all_teams(
+        table_raw=TABLE,
+        fixtures=FIXTURES,
+        runs=50,
+        engine="numpy",
+        seed=0,
+        anzeigen=False,
+        **HEIMSIEG,
+    )
+
+    assert ergebnis["teams"] == [row["Team"] for row in TABLE], "Rows are the teams."
+    assert np.array_equal(
+        ergebnis["verteilung"], np.eye(4)[[1, 0, 2, 3]]
+    ), "Team B overtakes Team A and Team C stays ahead of Team D."
+    assert ergebnis["runs"] == 50 and ergebnis["gespielte_spieltage"] == 33, "Meta."
+    assert df.at[1, "Team B"] == 100.0, "The wrapper returns the same probabilities."
+    assert not os.path.exists(tmp_path / "output"), "Nothing should be plotted."
+
+
+def test_plot_platzierungsverteilung_exports_headless(tmp_path, monkeypatch):
+    """
+    Exporting without showing renders the PNG without opening a window.
+    """
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("output")
+    ergebnis = simulate_platzierungsverteilung(TABLE, FIXTURES, runs=10, **HEIMSIEG)
+
+    pfad = plot_platzierungsverteilung(ergebnis, export=True, anzeigen=False)
+
+    assert pfad.startswith("output/platzierungsprobs_nach_spieltag_33_runs_10_"), pfad
+    assert os.path.getsize(pfad) > 0, "The heatmap should be written."
@@ -0,0 +1,105 @@
+"""
+Tests for the persistent simulation cache.
+"""
+
+import numpy as np
+from sim_cache import (
+    SimulationsCache,
+    cache_bezeichnung,
+    cache_schluessel,
+    simulate_gecacht,
+)
+from sim_poisson import PoissonModell
+from tests.daten import FIXTURES, TABLE
+
+GEWICHTE = {
+    "torverteilung": [0, 1, 2],
+    "torgewichte_heim": [2, 5, 3],
+    "torgewichte_auswaerts": [4, 4, 2],
+}
+
+
+def zaehler(aufrufe):
+    """
+    Build a fake simulation that records the requested runs.
+    """
+
+    def simuliere(runs):
+        aufrufe.append(runs)
+        return np.full((4, 4), runs // 4, dtype=np.int64)
+
+    return simuliere
+
+
+def test_cache_schluessel_normalizes_inputs():
+    """
+    Equivalent weights share a key while other inputs change it.
+    """
+    schluessel = cache_schluessel(TABLE, FIXTURES, GEWICHTE, "realgoals")
+    relativ = dict(GEWICHTE, torgewichte_heim=[0.2, 0.5, 0.3])
+
+    assert schluessel == cache_schluessel(
+        TABLE, FIXTURES, relativ, "realgoals"
+    ), "Relative and absolute weights should give the same key."
+    assert schluessel != cache_schluessel(
+        TABLE, FIXTURES[:1], GEWICHTE, "realgoals"
+    ), "Different fixtures should give a different key."
+    assert schluessel != cache_schluessel(
+        TABLE, FIXTURES, GEWICHTE, "realgoals", seed=1
+    ), "A seed should give a different key."
+
+
+def test_simulate_gecacht_hit_and_top_up(tmp_path):
+    """
+    A repeated request is served from the cache and a larger one only simulates the
+    missing runs.
+    """
+    aufrufe = []
+    with SimulationsCache(str(tmp_path / "cache.sqlite")) as cache:
+        erste, _ = simulate_gecacht(cache, "a", 400, zaehler(aufrufe))
+        zweite, aus_cache = simulate_gecacht(cache, "a", 400, zaehler(aufrufe))
+        assert aufrufe == [400], "A hit must not simulate again."
+        assert aus_cache == 400, "All runs should come from the cache."
+        assert (erste == zweite).all(), "The cached matrix should be returned."
+
+        dritte, aus_cache = simulate_gecacht(cache, "a", 1000, zaehler(aufrufe))
+        assert aufrufe == [400, 600], "Only the missing runs should be simulated."
+        assert aus_cache == 400, "The cached runs should be reused."
+        assert (dritte == 250).all(), "Cached and new counts should be added."
+
+        simulate_gecacht(cache, "b", 400, zaehler(aufrufe), additiv=False)
+        simulate_gecacht(cache, "b", 800, zaehler(aufrufe), additiv=False)
+        assert aufrufe[-1] == 800, "Seeded requests should not be topped up."
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    """
+    The cache stays within its size limit and evicts the oldest entry first.
+    """
+    groesse = np.zeros((4, 4), dtype=np.int64).nbytes
+    with SimulationsCache(str(tmp_path / "cache.sqlite"), max_bytes=2 * groesse) as c:
+        for schluessel in ("a", "b"):
+            c.speichern(schluessel, 4, np.zeros((4, 4), dtype=np.int64))
+        c.laden("a", 4)
+        c.speichern("c", 4, np.zeros((4, 4), dtype=np.int64))
+
+        assert c.laden("a", 4) is not None, "Recently used entries should stay."
+        assert c.laden("b", 4) is None, "The least recently used entry should go."
+        assert c.laden("c", 4) is not None, "The new entry should be stored."
+
+
+def test_cache_bezeichnung_names_the_scoreline_model():
+    """
+    Without a seed all engines share one label; a team-strength model gets its own.
+    """
+    modell = PoissonModell.anpassen(
+        [{"Heim": "Team A", "Auswaerts": "Team B", "Tore_Heim": 2, "Tore_Auswaerts": 1}]
+    )
+
+    assert cache_bezeichnung(GEWICHTE, "python", 1) == cache_bezeichnung(
+        GEWICHTE, "numpy", 4
+    ), "Unseeded runs of all engines share cache entries."
+    assert cache_bezeichnung(GEWICHTE, "numpy", 4, seed=1) == "realgoals-numpy-4"
+    assert (
+        cache_bezeichnung(dict(GEWICHTE, modell=modell), "numpy", 1) == "poisson"
+    ), "A team-strength model should not be labelled realgoals."
@@ -0,0 +1,113 @@
+"""
+Tests for the incrementally updated Elo ratings.
+"""
+
+import numpy as np
+import pytest
+from sim_elo import EloBewertung
+
+
+def spiel(spieltag, heim, auswaerts, tore_heim, tore_auswaerts):
+    """
+    Build a result in the format returned by normalize_results.
+    """
+    return {
+        "Spieltag": spieltag,
+        "Heim": heim,
+        "Auswaerts": auswaerts,
+        "Tore_Heim": tore_heim,
+        "Tore_Auswaerts": tore_auswaerts,
+    }
+
+
+ERGEBNISSE = [
+    spiel(1, "Team A", "Team B", 3, 0),
+    spiel(1, "Team C", "Team D", 1, 1),
+    spiel(2, "Team B", "Team C", 1, 2),
+    spiel(2, "Team D", "Team A", 0, 1),
+]
+
+
+def test_updates_are_incremental_and_zero_sum():
+    """
+    Winners gain what losers lose and already ingested matchdays are skipped.
+    """
+    elo = EloBewertung(halbwertszeit=None)
+
+    assert elo.ergebnisse_eintragen(ERGEBNISSE[:2], "2024-25") == 2, "Matchday 1."
+    assert elo.bewertung("Team A") > elo.bewertung("Team B"), "Winner gains rating."
+    assert elo.ergebnisse_eintragen(ERGEBNISSE, "2024-25") == 2, "Only matchday 2."
+    assert elo.ergebnisse_eintragen(ERGEBNISSE, "2024-25") == 0, "Nothing new."
+    assert elo.ergebnisse_eintragen(ERGEBNISSE, "2023-24") == 0, "Older season."
+    assert elo.spieltag == 2 and elo.spiele == 4, "State should track the ingest."
+    assert sum(elo.bewertungen.values()) == pytest.approx(
+        4 * elo.startwert
+    ), "Elo updates should be zero-sum."
+
+
+def test_partial_matchday_is_completed():
+    """
+    The remaining games of a partly played matchday are ingested later, giving the same
+    ratings as ingesting the full matchday at once.
+    """
+    teilweise = EloBewertung(halbwertszeit=1)
+    teilweise.ergebnisse_eintragen(ERGEBNISSE[:3], "2024-25")
+    nachgetragen = teilweise.ergebnisse_eintragen(ERGEBNISSE, "2024-25")
+    komplett = EloBewertung(halbwertszeit=1)
+    komplett.ergebnisse_eintragen(ERGEBNISSE, "2024-25")
+
+    assert nachgetragen == 1, "Only the missing game of matchday 2 is new."
+    assert teilweise.spiele == 4, "All games should be counted."
+    assert teilweise.bewertungen == pytest.approx(
+        komplett.bewertungen
+    ), "Completing a matchday should match ingesting it at once."
+
+
+def test_decay_and_persistence(tmp_path):
+    """
+    Ratings regress to the mean over time and survive a round trip to disk.
+    """
+    elo = EloBewertung(halbwertszeit=1)
+    elo.ergebnisse_eintragen(ERGEBNISSE[:2], "2024-25")
+    abstand = elo.bewertung("Team A") - elo.startwert
+    elo.ergebnisse_eintragen([spiel(3, "Team B", "Team D", 0, 0)], "2024-25")
+
+    assert elo.bewertung("Team A") - elo.startwert == pytest.approx(
+        abstand / 4
+    ), "Two matchdays with a half-life of one should quarter the gap."
+
+    pfad = tmp_path / "elo" / "liga.json"
+    elo.speichern(str(pfad))
+    geladen = EloBewertung.laden(str(pfad))
+    assert geladen.als_dict() == elo.als_dict(), "Round trip should be lossless."
+    assert (
+        len(EloBewertung.laden(str(tmp_path / "fehlt.json"))) == 0
+    ), "A missing file should give empty ratings."
+
+
+def test_model_maps_ratings_to_scorelines():
+    """
+    Higher rated teams get more expected goals and the scoreline matrices are
+    distributions.
+    """
+    elo = EloBewertung()
+    with pytest.raises(ValueError):
+        elo.als_modell()
+    elo.ergebnisse_eintragen(ERGEBNISSE, "2024-25")
+    modell = elo.als_modell(["Team A", "Team B", "Team C", "Team D", "Aufsteiger"])
+
+    heim, auswaerts = modell.erwartete_tore(
+        modell.team_id("Team A"), modell.team_id("Team B")
+    )
+    assert heim > auswaerts, "Team A should be favoured at home."
+    gleich_heim, gleich_auswaerts = modell.erwartete_tore(
+        modell.team_id("Aufsteiger"), modell.team_id("Aufsteiger")
+    )
+    assert gleich_heim / gleich_auswaerts == pytest.approx(
+        (3 + 1 + 1 + 0) / (0 + 1 + 2 + 1)
+    ), "Equal ratings should only differ by the observed home advantage."
+
+    matrizen = modell.paarungs_matrizen(
+        [("Team A", "Team B"), ("Aufsteiger", "Team C")]
+    )
+    assert np.allclose(matrizen.sum(axis=(1, 2)), 1), "Matrices should sum to 1."
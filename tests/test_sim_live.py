@@ -0,0 +1,97 @@
+"""
+Tests for the live-update simulation.
+"""
+
+import numpy as np
+import pytest
+from sim_live import LiveSimulation, _plaetze
+from sim_vectorized import simulate_runs_vectorized
+from tests.daten import FIXTURES, HEIMSIEG, TABLE
+
+
+def test_incremental_update_matches_full_ranking():
+    """
+    Entering and correcting results gives the same places as sorting from scratch.
+    """
+    live = LiveSimulation(TABLE, FIXTURES, 2_000, seed=0)
+    live.ergebnis_eintragen("Team B", "Team A", 2, 2)
+    live.ergebnis_eintragen("Team C", "Team D", 0, 3)
+    live.ergebnis_eintragen("Team B", "Team A", 1, 0)
+
+    assert (
+        live.plaetze == _plaetze(live.schluessel)
+    ).all(), "Incremental places differ from a full ranking."
+    assert (
+        live.zaehlmatrix == (live.plaetze[:, :, None] == np.arange(4)).sum(axis=0)
+    ).all(), "Count matrix is out of sync with the places."
+
+
+def test_conditioning_on_all_results():
+    """
+    Once all results are known every run ends with the real final table.
+    """
+    live = LiveSimulation(TABLE, FIXTURES, 1_000, seed=0)
+    eingetragen = live.ergebnisse_eintragen(
+        [
+            {
+                "Heim": "Team B",
+                "Auswaerts": "Team A",
+                "Tore_Heim": 1,
+                "Tore_Auswaerts": 0,
+            },
+            {
+                "Heim": "Team C",
+                "Auswaerts": "Team D",
+                "Tore_Heim": 1,
+                "Tore_Auswaerts": 0,
+            },
+            {
+                "Heim": "Team X",
+                "Auswaerts": "Team Y",
+                "Tore_Heim": 3,
+                "Tore_Auswaerts": 0,
+            },
+        ]
+    )
+    live.aufstocken(500)
+    erwartet = simulate_runs_vectorized(TABLE, FIXTURES, 1_500, **HEIMSIEG)
+
+    assert eingetragen == 2, "Results of other fixtures should be skipped."
+    assert live.runs == 1_500, "Topping up should add runs."
+    assert (
+        live.zaehlmatrix == erwartet
+    ).all(), "Known results should hold in all runs, including new ones."
+
+
+def test_large_scoreline_grid_is_not_truncated():
+    """
+    With more than 256 possible scorelines the stored indices keep their values, so
+    entering results removes the drawn scorelines correctly.
+    """
+    gewichte = [1 / 17] * 17
+    live = LiveSimulation(
+        TABLE,
+        FIXTURES,
+        2_000,
+        torverteilung=range(17),
+        torgewichte_heim=gewichte,
+        torgewichte_auswaerts=gewichte,
+        seed=0,
+    )
+    assert live.ergebnisse.max() > 255, "Indices beyond one byte should be drawn."
+
+    live.ergebnis_eintragen("Team B", "Team A", 1, 0)
+    live.ergebnis_eintragen("Team C", "Team D", 1, 0)
+    erwartet = simulate_runs_vectorized(TABLE, FIXTURES, 2_000, **HEIMSIEG)
+
+    assert (live.zaehlmatrix == erwartet).all(), "Every run ends with the real table."
+
+
+def test_unknown_fixture_is_rejected():
+    """
+    Results for fixtures that are not remaining raise a ValueError.
+    """
+    live = LiveSimulation(TABLE, FIXTURES, 10, seed=0)
+    with pytest.raises(ValueError):
+        live.ergebnis_eintragen("Team A", "Team B", 1, 0)
+    assert np.isclose(live.verteilung().sum(), 4), "Each team should sum to 100 %."
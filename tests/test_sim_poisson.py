@@ -0,0 +1,100 @@
+"""
+Tests for the Poisson/Dixon-Coles team-strength model.
+"""
+
+import numpy as np
+import pytest
+from sim_poisson import PaarungsAliasTabelle, PoissonModell, ergebnis_raster
+from sim_season_all import simulate_runs_python
+from sim_vectorized import simulate_runs_vectorized
+from tests.daten import FIXTURES, TABLE
+
+
+def make_results():
+    """
+    Build a double round robin in which Team A beats everyone clearly.
+    """
+    teams = ["Team A", "Team B", "Team C", "Team D"]
+    ergebnisse = []
+    for heim in teams:
+        for auswaerts in teams:
+            if heim == auswaerts:
+                continue
+            if heim == "Team A":
+                tore = (3, 0)
+            elif auswaerts == "Team A":
+                tore = (0, 2)
+            else:
+                tore = (1, 1)
+            ergebnisse.append(
+                {
+                    "Heim": heim,
+                    "Auswaerts": auswaerts,
+                    "Tore_Heim": tore[0],
+                    "Tore_Auswaerts": tore[1],
+                }
+            )
+    return ergebnisse
+
+
+def test_fit_recovers_team_strengths():
+    """
+    The dominant team gets the strongest attack and defence and every scoreline
+    matrix is a probability distribution.
+    """
+    modell = PoissonModell.anpassen(make_results())
+
+    assert np.argmax(modell.angriff) == modell.team_id("Team A"), "Strongest attack."
+    assert np.argmin(modell.abwehr) == modell.team_id("Team A"), "Strongest defence."
+    heim, auswaerts = modell.erwartete_tore(
+        modell.team_id("Team A"), modell.team_id("Team B")
+    )
+    assert heim > auswaerts, "Team A should be expected to outscore Team B."
+
+    matrizen = modell.paarungs_matrizen(FIXTURES)
+    assert matrizen.shape == (len(FIXTURES), 11, 11), "One matrix per fixture."
+    assert np.allclose(matrizen.sum(axis=(1, 2)), 1), "Matrices should sum to 1."
+    assert (matrizen >= 0).all(), "Probabilities should not be negative."
+
+    with pytest.raises(ValueError):
+        modell.team_id("Unbekannt")
+
+
+def test_alias_table_per_fixture_matches_matrices():
+    """
+    Draws from the per-fixture alias tables follow the scoreline matrices.
+    """
+    modell = PoissonModell.anpassen(make_results())
+    matrizen = modell.paarungs_matrizen(FIXTURES, max_tore=5)
+    sampler = PaarungsAliasTabelle(matrizen.reshape(len(FIXTURES), -1))
+    gezogen = sampler.ziehen((200_000, len(FIXTURES)), np.random.default_rng(3))
+
+    for spiel, matrix in enumerate(matrizen):
+        haeufigkeit = np.bincount(gezogen[:, spiel], minlength=36) / len(gezogen)
+        assert np.allclose(
+            haeufigkeit, matrix.ravel(), atol=0.005
+        ), "Frequencies should match the fixture's matrix."
+
+    tore_heim, tore_auswaerts = ergebnis_raster(5)
+    assert (tore_heim[7], tore_auswaerts[7]) == (1, 1), "Raster is row-major."
+
+
+def test_engines_accept_model():
+    """
+    Both simulation engines draw from the model and count every run once per team.
+    """
+    modell = PoissonModell.anpassen(make_results())
+
+    zaehlmatrix = simulate_runs_vectorized(
+        TABLE, FIXTURES, 5_000, rng=np.random.default_rng(1), modell=modell
+    )
+    statistik = simulate_runs_python(
+        TABLE, FIXTURES, 2_000, rng=np.random.default_rng(1), modell=modell
+    )
+
+    assert (
+        zaehlmatrix.sum(axis=1) == 5_000
+    ).all(), "Each team needs one place per run."
+    assert all(
+        sum(counter.values()) == 2_000 for counter in statistik.values()
+    ), "Each team needs one place per run."
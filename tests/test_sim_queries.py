@@ -0,0 +1,69 @@
+"""
+Tests for the queries over stored final tables.
+"""
+
+import numpy as np
+import pytest
+from sim_queries import SimulationsAbfrage
+from sim_store import EndtabellenSchreiber
+from sim_vectorized import simulate_runs_vectorized
+from tests.daten import FIXTURES, TABLE, TEAMS
+
+
+@pytest.fixture(name="abfrage")
+def fixture_abfrage(tmp_path):
+    """
+    Queries over 2000 stored runs of the four-team example.
+    """
+    verzeichnis = str(tmp_path / "endtabellen")
+    with EndtabellenSchreiber(verzeichnis, TEAMS) as speicher:
+        simulate_runs_vectorized(
+            TABLE, FIXTURES, 2000, rng=np.random.default_rng(2), speicher=speicher
+        )
+    return SimulationsAbfrage(verzeichnis)
+
+
+def test_probabilities_match_direct_reductions(abfrage):
+    """
+    Marginal, pairwise and joint probabilities match reductions on the raw columns.
+    """
+    platz = np.asarray(abfrage.endtabellen.spalte("platz"))
+
+    assert np.allclose(
+        abfrage.verteilung()[:, 0], [abfrage.platz_in(t, 1) for t in TEAMS]
+    ), "Marginals should match the count matrix."
+    assert abfrage.vor("Team B", "Team A") == pytest.approx(
+        np.mean(platz[:, 1] < platz[:, 0])
+    ), "Team B above Team A."
+    assert abfrage.alle_in(["Team C", "Team D"], (3, 4)) == pytest.approx(
+        np.mean(np.isin(platz[:, 2], (3, 4)) & np.isin(platz[:, 3], (3, 4)))
+    ), "Both teams in the bottom two."
+    assert abfrage.platz_in("Team A", range(1, 5)) == 1.0, "Every team is placed."
+    with pytest.raises(ValueError):
+        abfrage.platz_in("Team Z", 1)
+
+
+def test_points_for_safety(abfrage):
+    """
+    The returned points secure the places with the requested probability, one point
+    less does not.
+    """
+    punkte = np.asarray(abfrage.endtabellen.spalte("punkte")).ravel()
+    oben = np.asarray(abfrage.endtabellen.spalte("platz")).ravel() <= 2
+    grenze = abfrage.punkte_fuer((1, 2), 0.95)
+
+    assert np.mean(oben[punkte >= grenze]) >= 0.95, "Safe from the threshold on."
+    assert np.mean(oben[punkte >= grenze - 1]) < 0.95, "Not safe one point below."
+    assert abfrage.punkte_fuer(1, 1.0, team="Team D") is None, "Team D cannot win."
+
+
+def test_repeated_queries_are_cached(abfrage):
+    """
+    Repeated queries are answered from the cache without reading the store again.
+    """
+    erste = abfrage.vor("Team C", "Team D")
+    abfrage.endtabellen = None
+    assert abfrage.vor("Team C", "Team D") == erste, "Served from the cache."
+    assert abfrage.platz_in("Team C", [2, 1]) == abfrage.platz_in(
+        "Team C", (1, 2)
+    ), "Place sets are normalized, and the team columns are cached."
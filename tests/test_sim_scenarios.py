@@ -0,0 +1,49 @@
+"""
+Tests for the what-if scenario engine.
+"""
+
+import numpy as np
+import pytest
+from sim_scenarios import simulate_scenarios
+from sim_vectorized import simulate_runs_vectorized
+from tests.daten import FIXTURES, HEIMSIEG, TABLE
+
+
+def test_scenarios_share_random_numbers():
+    """
+    The empty scenario reproduces a plain simulation with the same seed and fixed
+    results only change the teams involved.
+    """
+    zaehlung = simulate_scenarios(
+        TABLE,
+        FIXTURES,
+        {
+            "Basis": {},
+            "A siegt": {("Team B", "Team A"): (0, 3)},
+            "Alles fest": {("Team B", "Team A"): (1, 0), ("Team C", "Team D"): (1, 0)},
+        },
+        2_000,
+        rng=np.random.default_rng(7),
+        blockgroesse=700,
+    )
+    erwartet = simulate_runs_vectorized(
+        TABLE, FIXTURES, 2_000, rng=np.random.default_rng(7), blockgroesse=700
+    )
+
+    assert (zaehlung["Basis"] == erwartet).all(), "Draws should be shared."
+    assert zaehlung["A siegt"][0, 0] == 2_000, "Team A should always finish first."
+    assert (
+        zaehlung["A siegt"][2:] == erwartet[2:]
+    ).all(), "Teams C and D should see the same random results in every scenario."
+    assert (
+        zaehlung["Alles fest"]
+        == simulate_runs_vectorized(TABLE, FIXTURES, 2_000, **HEIMSIEG)
+    ).all(), "Fully fixed scenarios should be deterministic."
+
+
+def test_unknown_scenario_fixture_is_rejected():
+    """
+    Scenarios may only fix remaining fixtures.
+    """
+    with pytest.raises(ValueError):
+        simulate_scenarios(TABLE, FIXTURES, {"X": {("Team A", "Team B"): (1, 0)}}, 10)
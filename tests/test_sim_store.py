@@ -0,0 +1,90 @@
+"""
+Tests for the memory-mapped store of simulated final tables.
+"""
+
+import numpy as np
+import pytest
+from sim_store import Endtabellen, EndtabellenSchreiber
+from sim_vectorized import (
+    basis_schluessel,
+    schluessel_zerlegen,
+    simulate_runs_vectorized,
+)
+from tests.daten import FIXTURES, TABLE, TEAMS
+
+
+@pytest.mark.parametrize("komprimiert", [False, True])
+def test_roundtrip_in_chunks(tmp_path, komprimiert):
+    """
+    Blocks are written in fixed-size chunks and read back unchanged.
+    """
+    rng = np.random.default_rng(0)
+    plaetze = np.argsort(rng.random((25, 4)), axis=1) + 1
+    punkte = rng.integers(30, 90, size=(25, 4))
+    differenz = rng.integers(-40, 40, size=(25, 4))
+    verzeichnis = str(tmp_path / "endtabellen")
+    with EndtabellenSchreiber(
+        verzeichnis, TEAMS, chunk_groesse=10, komprimiert=komprimiert
+    ) as speicher:
+        for start in range(0, 25, 7):
+            speicher.anhaengen(
+                plaetze[start : start + 7],
+                punkte[start : start + 7],
+                differenz[start : start + 7],
+            )
+
+    endtabellen = Endtabellen(verzeichnis)
+    platz = endtabellen.spalte("platz")
+
+    assert endtabellen.chunk_groessen == [10, 10, 5], "Chunks of the given size."
+    assert isinstance(platz, np.memmap) != komprimiert, "Memory-mapped if uncompressed."
+    assert platz.dtype == np.int8, "Places are stored as int8."
+    assert np.array_equal(platz, plaetze), "Places should round-trip."
+    assert np.array_equal(endtabellen.spalte("punkte"), punkte), "Points round-trip."
+    assert np.array_equal(
+        np.concatenate([c["differenz"] for c in endtabellen.chunks(["differenz"])]),
+        differenz,
+    ), "Chunks should concatenate to the full column."
+    with pytest.raises(FileExistsError):
+        EndtabellenSchreiber(verzeichnis, TEAMS)
+
+
+def test_store_matches_simulation(tmp_path):
+    """
+    The stored final tables reproduce the counts and the points of the simulation.
+    """
+    verzeichnis = str(tmp_path / "endtabellen")
+    with EndtabellenSchreiber(verzeichnis, TEAMS, chunk_groesse=300) as speicher:
+        zaehlmatrix = simulate_runs_vectorized(
+            TABLE,
+            FIXTURES,
+            1000,
+            rng=np.random.default_rng(1),
+            blockgroesse=128,
+            speicher=speicher,
+        )
+    endtabellen = Endtabellen(verzeichnis)
+    punkte = endtabellen.spalte("punkte")
+    differenz = endtabellen.spalte("differenz")
+
+    assert len(endtabellen) == 1000, "Every run should be stored."
+    assert np.array_equal(endtabellen.zaehlmatrix(), zaehlmatrix), "Same counts."
+    assert set(np.unique(punkte[:, 0] - 60)) <= {0, 1, 3}, "One game for Team A."
+    assert np.all(
+        differenz.sum(axis=1) == sum(int(r["Differenz"]) for r in TABLE)
+    ), "Goal differences of one run should sum to the initial total."
+
+
+def test_schluessel_zerlegen_negative_difference():
+    """
+    Sort keys decompose into points, goal difference and goals, also for negative
+    differences.
+    """
+    punkte = np.array([0, 40, 90])
+    differenz = np.array([-30, 0, 55])
+    tore = np.array([10, 0, 99])
+    zerlegt = schluessel_zerlegen(basis_schluessel(punkte, differenz, tore))
+
+    assert all(
+        np.array_equal(a, b) for a, b in zip(zerlegt, (punkte, differenz, tore))
+    ), "Decomposition should invert basis_schluessel."
@@ -0,0 +1,91 @@
+"""
+Tests for the head-to-head tie-break.
+"""
+
+import numpy as np
+from league_table import LeagueTable
+from sim_season_all import simulate_runs_python
+from sim_tiebreak import DirekterVergleich, tiebreak_reihenfolge
+from sim_vectorized import simulate_runs_vectorized
+from tests.daten import FIXTURES, TABLE, make_row
+
+# Team C und Team D liegen nach einem 1:1 komplett gleichauf
+GLEICHSTAND = [
+    make_row("Team A", "50:30", 20, 60),
+    make_row("Team B", "45:30", 15, 59),
+    make_row("Team C", "40:40", 0, 39),
+    make_row("Team D", "40:40", 0, 39),
+]
+UNENTSCHIEDEN = {
+    "torverteilung": [1],
+    "torgewichte_heim": [1.0],
+    "torgewichte_auswaerts": [1.0],
+}
+
+
+def ergebnis(heim, auswaerts, tore_heim, tore_auswaerts):
+    """
+    Build a result in the format returned by normalize_results.
+    """
+    return {
+        "Spieltag": 1,
+        "Heim": heim,
+        "Auswaerts": auswaerts,
+        "Tore_Heim": tore_heim,
+        "Tore_Auswaerts": tore_auswaerts,
+    }
+
+
+def test_head_to_head_decides_tied_teams():
+    """
+    Team D wins the head-to-head and finishes ahead of Team C in both engines.
+    """
+    vergleich = DirekterVergleich.aus_ergebnissen(
+        LeagueTable.aus_tabelle(GLEICHSTAND), [ergebnis("Team C", "Team D", 0, 2)]
+    )
+    zaehlung = simulate_runs_vectorized(
+        GLEICHSTAND, FIXTURES, 20, vergleich=vergleich, **UNENTSCHIEDEN
+    )
+    python = simulate_runs_python(
+        GLEICHSTAND, FIXTURES, 20, vergleich=vergleich, **UNENTSCHIEDEN
+    )
+
+    assert zaehlung[3, 2] == 20, "Team D should be third in the numpy engine."
+    assert python["Team D"][3] == 20, "Team D should be third in the Python engine."
+    assert (
+        simulate_runs_vectorized(GLEICHSTAND, FIXTURES, 20, **UNENTSCHIEDEN)[2, 2] == 20
+    ), "Without head-to-head data the table order decides."
+
+
+def test_away_goals_decide_level_head_to_head():
+    """
+    With level head-to-head points and difference the away goals decide.
+    """
+    tabelle = LeagueTable.aus_tabelle(GLEICHSTAND)
+    vergleich = DirekterVergleich.aus_ergebnissen(
+        tabelle,
+        [ergebnis("Team C", "Team D", 2, 3), ergebnis("Team D", "Team C", 1, 2)],
+    )
+    schluessel = np.array([[4, 3, 1, 1]])
+    reihenfolge = tiebreak_reihenfolge(
+        schluessel,
+        np.empty((0, 2), dtype=np.int64),
+        np.empty((1, 0)),
+        np.empty((1, 0)),
+        vergleich,
+    )
+
+    assert reihenfolge.tolist() == [[0, 1, 3, 2]], "Team D scored more away goals."
+
+
+def test_no_ties_leave_ranking_unchanged():
+    """
+    Runs without ties are ranked exactly like the plain composite key.
+    """
+    vergleich = DirekterVergleich(len(TABLE))
+    ohne = simulate_runs_vectorized(TABLE, FIXTURES, 500, rng=np.random.default_rng(3))
+    mit = simulate_runs_vectorized(
+        TABLE, FIXTURES, 500, rng=np.random.default_rng(3), vergleich=vergleich
+    )
+
+    assert (ohne == mit).all(), "An empty head-to-head must not change the result."
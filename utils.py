@@ -6,6 +6,13 @@ import os
 import csv
 import datetime
 import ast
+import re
+import sys
+import numpy as np
+
+# Ein String in Python-Darstellung, wie er in den Zellen von Paarungen und Ergebnissen
+# steht: 'Name' oder "Name" (wenn der Name ein Apostroph enthält)
+_STRING_MUSTER = re.compile(r"'([^'\\]*)'|\"([^\"\\]*)\"")
 
 
 def export_data(data, filename_prefix):
@@ -78,6 +85,126 @@ def extract_pairings_from_fixture_data(fixture_data):
     return pairings
 
 
+def parse_list_cell(zelle, breite):
+    """
+    Zerlegt eine Zelle der Form "[['a', 'b'], ['c', 'd']]" ohne ast.literal_eval in
+    Tupel fester Breite. Teamnamen werden interniert, sodass jeder Name nur einmal im
+    Speicher liegt. Zellen mit Escape-Sequenzen oder unerwarteter Struktur werden mit
+    ast.literal_eval gelesen.
+    Args:
+        zelle (str): Der Inhalt der Zelle.
+        breite (int): Anzahl der Werte je Eintrag (2 für Paarungen, 4 für Ergebnisse).
+    Returns:
+        list: Liste von Tupeln aus Strings.
+    Raises:
+        ValueError, SyntaxError: Wenn die Zelle auch für ast.literal_eval ungültig ist
+        oder Einträge eine andere Breite haben.
+    """
+    werte = [
+        sys.intern(einfach or doppelt)
+        for einfach, doppelt in _STRING_MUSTER.findall(zelle)
+    ]
+    eintraege = len(werte) // breite
+    if (
+        "\\" in zelle
+        or len(werte) % breite
+        or zelle.count("[") != eintraege + 1
+        or zelle.count(",") != len(werte) - 1
+    ):
+        eintraege = [tuple(map(str, eintrag)) for eintrag in ast.literal_eval(zelle)]
+        if any(len(eintrag) != breite for eintrag in eintraege):
+            raise ValueError(f"Einträge mit {breite} Werten erwartet: {zelle}")
+        return eintraege
+    return [tuple(werte[i : i + breite]) for i in range(0, len(werte), breite)]
+
+
+def iter_csv_fixtures(filepath):
+    """
+    Liest eine CSV-Datei mit Spielpaarungen zeilenweise ein.
+    Args:
+        filepath (str): Der Pfad zur CSV-Datei.
+    Yields:
+        tuple: (Spieltag, Heim, Auswärts) je Spiel; Spieltag ist None, wenn er fehlt.
+    """
+    with open(filepath, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            pairings_str = row.get("Paarungen")
+            spieltag = row.get("Spieltag")
+            if not pairings_str:
+                continue
+            try:
+                pairings = parse_list_cell(pairings_str, 2)
+            except (ValueError, SyntaxError):
+                print(f"Fehler beim Parsen von Paarungen: {pairings_str}")
+                continue
+            spieltag = int(spieltag) if spieltag and spieltag.isdigit() else None
+            for heim, auswaerts in pairings:
+                yield spieltag, heim.strip(), auswaerts.strip()
+
+
+def iter_csv_results(filepath):
+    """
+    Liest eine CSV-Datei mit Spielergebnissen zeilenweise ein.
+    Args:
+        filepath (str): Der Pfad zur CSV-Datei.
+    Yields:
+        tuple: (Spieltag, Heim, Auswärts, Tore Heim, Tore Auswärts) je Spiel.
+    """
+    with open(filepath, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            spieltag = int(row["Spieltag"])
+            for heim, auswaerts, tore_heim, tore_auswaerts in parse_list_cell(
+                row["Ergebnisse"], 4
+            ):
+                yield spieltag, heim, auswaerts, int(tore_heim), int(tore_auswaerts)
+
+
+def read_csv_result_columns(filepath):
+    """
+    Liest eine CSV-Datei mit Spielergebnissen direkt in Spalten ein, im selben Format
+    wie read_npz_result_columns.
+    Args:
+        filepath (str): Der Pfad zur CSV-Datei.
+    Returns:
+        dict: Arrays saison, spieltag, heim, auswaerts, tore_heim und tore_auswaerts
+        je Spiel sowie teams und saisons für die Übersetzung der IDs in Namen.
+    """
+    teams = {}
+    spieltage, heim, auswaerts, tore = [], [], [], []
+    for spiel in iter_csv_results(filepath):
+        spieltage.append(spiel[0])
+        heim.append(teams.setdefault(spiel[1], len(teams)))
+        auswaerts.append(teams.setdefault(spiel[2], len(teams)))
+        tore.append(spiel[3:])
+    tore = np.array(tore, dtype=np.int8).reshape(-1, 2)
+    return {
+        "saison": np.zeros(len(spieltage), dtype=np.int16),
+        "spieltag": np.array(spieltage, dtype=np.int16),
+        "heim": np.array(heim, dtype=np.int16),
+        "auswaerts": np.array(auswaerts, dtype=np.int16),
+        "tore_heim": tore[:, 0],
+        "tore_auswaerts": tore[:, 1],
+        "teams": namen_array(teams),
+        "saisons": np.array([""], dtype=np.str_),
+    }
+
+
+def read_csv_fixture_data(filepath):
+    """
+    Liest eine CSV-Datei mit Spielpaarungen ein und behält die Spieltage bei.
+    Args:
+        filepath (str): Der Pfad zur CSV-Datei.
+    Returns:
+        list: Liste von Dictionaries mit Spieltag und Paarungen wie bei get_fixtures.
+    """
+    fixture_data = []
+    for spieltag, heim, auswaerts in iter_csv_fixtures(filepath):
+        if not fixture_data or fixture_data[-1]["Spieltag"] != spieltag:
+            fixture_data.append({"Spieltag": spieltag, "Paarungen": []})
+        fixture_data[-1]["Paarungen"].append([heim, auswaerts])
+    return fixture_data
+
+
 def read_csv_fixtures(filepath):
     """
     Liest eine CSV-Datei mit Spielpaarungen ein und gibt eine Liste von Tuplen zurück.
@@ -86,29 +213,7 @@ def read_csv_fixtures(filepath):
     Returns:
         list: Eine Liste von (Heim, Auswärts)-Tuplen.
     """
-    fixture_data = []
-    with open(filepath, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            pairings_str = row.get("Paarungen")
-            spieltag = row.get("Spieltag")
-            if pairings_str:
-                try:
-                    pairings = ast.literal_eval(pairings_str)
-                    fixture_data.append(
-                        {
-                            "Spieltag": (
-                                int(spieltag)
-                                if spieltag and spieltag.isdigit()
-                                else None
-                            ),
-                            "Paarungen": pairings,
-                        }
-                    )
-                except (ValueError, SyntaxError):
-                    print(f"Fehler beim Parsen von Paarungen: {pairings_str}")
-
-    return extract_pairings_from_fixture_data(fixture_data)
+    return [(heim, auswaerts) for _, heim, auswaerts in iter_csv_fixtures(filepath)]
 
 
 def normalize_results(results_raw):
@@ -125,7 +230,7 @@ def normalize_results(results_raw):
         spieltag = int(row["Spieltag"])
         # Prüfen, ob "Ergebnisse" ein String ist (CSV) oder schon als Liste vorliegt (Scraper)
         spiele = (
-            ast.literal_eval(row["Ergebnisse"])
+            parse_list_cell(row["Ergebnisse"], 4)
             if isinstance(row["Ergebnisse"], str)
             else row["Ergebnisse"]
         )
@@ -153,8 +258,269 @@ def read_csv_results(filepath):
     Returns:
         list of dict: Eine Liste mit Dictionaries für jedes Spiel.
     """
-    with open(filepath, mode="r", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        raw_results = list(reader)
+    return [
+        {
+            "Spieltag": spieltag,
+            "Heim": heim,
+            "Auswaerts": auswaerts,
+            "Tore_Heim": tore_heim,
+            "Tore_Auswaerts": tore_auswaerts,
+        }
+        for spieltag, heim, auswaerts, tore_heim, tore_auswaerts in iter_csv_results(
+            filepath
+        )
+    ]
+
+
+# Spalten der Tabelle im Spaltenformat (.npz), in der Reihenfolge von read_csv_table
+NPZ_TABELLEN_SPALTEN = (
+    "Spiele",
+    "Siege",
+    "Unentschieden",
+    "Niederlagen",
+    "Tore",
+    "Gegentore",
+    "Differenz",
+    "Punkte",
+)
+
+
+def _ids(verzeichnis, namen):
+    """
+    Übersetzt Namen (z.B. Teams) in IDs und ergänzt unbekannte Namen am Ende.
+    Args:
+        verzeichnis (dict): Name -> ID, wird erweitert.
+        namen (iterable): Die Namen.
+    Returns:
+        np.ndarray: Die IDs als int16.
+    """
+    return np.array(
+        [verzeichnis.setdefault(name, len(verzeichnis)) for name in namen],
+        dtype=np.int16,
+    )
+
+
+def namen_array(verzeichnis):
+    """
+    Wandelt das Dictionary Name -> ID in ein Unicode-Array in ID-Reihenfolge um.
+    """
+    return np.array(sorted(verzeichnis, key=verzeichnis.get), dtype=np.str_).reshape(-1)
+
+
+def _npz_laden(filepath, art):
+    """
+    Lädt eine .npz-Datei und prüft, ob sie die erwartete Art von Daten enthält.
+    """
+    with np.load(filepath, allow_pickle=False) as daten:
+        spalten = {name: daten[name] for name in daten.files}
+    if str(spalten.get("art")) != art:
+        raise ValueError(f"{filepath} enthält keine Daten der Art '{art}'.")
+    return spalten
+
+
+def write_npz_table(filepath, table_raw):
+    """
+    Speichert eine Tabelle im Spaltenformat.
+    Args:
+        filepath (str): Zielpfad der .npz-Datei.
+        table_raw (list of dict): Tabelle im Format von read_csv_table.
+    """
+    tore = [row["Tore"].split(":") for row in table_raw]
+    werte = {
+        "Spiele": [row["Spiele"] for row in table_raw],
+        "Siege": [row["Siege"] for row in table_raw],
+        "Unentschieden": [row["Unentschieden"] for row in table_raw],
+        "Niederlagen": [row["Niederlagen"] for row in table_raw],
+        "Tore": [t[0] for t in tore],
+        "Gegentore": [t[1] for t in tore],
+        "Differenz": [row["Differenz"] for row in table_raw],
+        "Punkte": [row["Punkte"] for row in table_raw],
+    }
+    np.savez_compressed(
+        filepath,
+        art=np.array("tabelle"),
+        teams=np.array([row["Team"] for row in table_raw], dtype=np.str_),
+        **{
+            name.lower(): np.array(werte[name], dtype=np.int16)
+            for name in NPZ_TABELLEN_SPALTEN
+        },
+    )
+
+
+def read_npz_table(filepath):
+    """
+    Liest eine Tabelle im Spaltenformat ein.
+    Args:
+        filepath (str): Der Pfad zur .npz-Datei.
+    Returns:
+        list: Eine Liste von Dictionaries im Format von read_csv_table.
+    """
+    spalten = _npz_laden(filepath, "tabelle")
+    werte = {name: spalten[name.lower()].tolist() for name in NPZ_TABELLEN_SPALTEN}
+    return [
+        {
+            "Platz": str(i + 1),
+            "Team": team,
+            "Spiele": str(werte["Spiele"][i]),
+            "Siege": str(werte["Siege"][i]),
+            "Unentschieden": str(werte["Unentschieden"][i]),
+            "Niederlagen": str(werte["Niederlagen"][i]),
+            "Tore": f"{werte['Tore'][i]}:{werte['Gegentore'][i]}",
+            "Differenz": str(werte["Differenz"][i]),
+            "Punkte": str(werte["Punkte"][i]),
+        }
+        for i, team in enumerate(spalten["teams"].tolist())
+    ]
+
+
+def write_npz_fixtures(filepath, fixture_data):
+    """
+    Speichert Spielpaarungen im Spaltenformat.
+    Args:
+        filepath (str): Zielpfad der .npz-Datei.
+        fixture_data (list): Liste von Dictionaries mit Spieltag und Paarungen, wie
+        von get_fixtures geliefert.
+    """
+    teams = {}
+    spieltage, heim, auswaerts = [], [], []
+    for spieltag in fixture_data:
+        for match in spieltag.get("Paarungen", []):
+            spieltage.append(spieltag["Spieltag"])
+            heim.append(match[0].strip())
+            auswaerts.append(match[1].strip())
+    np.savez_compressed(
+        filepath,
+        art=np.array("paarungen"),
+        spieltag=np.array(spieltage, dtype=np.int16),
+        heim=_ids(teams, heim),
+        auswaerts=_ids(teams, auswaerts),
+        teams=namen_array(teams),
+    )
+
+
+def read_npz_fixtures(filepath):
+    """
+    Liest Spielpaarungen im Spaltenformat ein.
+    Args:
+        filepath (str): Der Pfad zur .npz-Datei.
+    Returns:
+        list: Eine Liste von (Heim, Auswärts)-Tuplen wie bei read_csv_fixtures.
+    """
+    spalten = _npz_laden(filepath, "paarungen")
+    teams = spalten["teams"].tolist()
+    return [
+        (teams[heim], teams[auswaerts])
+        for heim, auswaerts in zip(
+            spalten["heim"].tolist(), spalten["auswaerts"].tolist()
+        )
+    ]
+
+
+def write_npz_results(filepath, results, saison=None):
+    """
+    Speichert Spielergebnisse im Spaltenformat mit Tor-Spalten als int8.
+    Args:
+        filepath (str): Zielpfad der .npz-Datei.
+        results (list of dict): Ergebnisse im Format von normalize_results. Für ein
+        Archiv mehrerer Saisons kann jedes Ergebnis einen Schlüssel "Saison" haben.
+        saison (str): Saison für Ergebnisse ohne eigenen Schlüssel "Saison".
+    """
+    tore = np.array(
+        [(r["Tore_Heim"], r["Tore_Auswaerts"]) for r in results], dtype=np.int64
+    ).reshape(-1, 2)
+    if tore.size and (tore.min() < 0 or tore.max() > np.iinfo(np.int8).max):
+        raise ValueError("Torzahlen müssen zwischen 0 und 127 liegen.")
+    teams, saisons = {}, {}
+    np.savez_compressed(
+        filepath,
+        art=np.array("ergebnisse"),
+        saison=_ids(saisons, (r.get("Saison", saison) or "" for r in results)),
+        spieltag=np.array([r["Spieltag"] for r in results], dtype=np.int16),
+        heim=_ids(teams, (r["Heim"] for r in results)),
+        auswaerts=_ids(teams, (r["Auswaerts"] for r in results)),
+        tore_heim=tore[:, 0].astype(np.int8),
+        tore_auswaerts=tore[:, 1].astype(np.int8),
+        teams=namen_array(teams),
+        saisons=namen_array(saisons),
+    )
+
+
+def read_npz_result_columns(filepath):
+    """
+    Liest Spielergebnisse im Spaltenformat als Arrays ein, ohne ein Dictionary je
+    Spiel anzulegen.
+    Args:
+        filepath (str): Der Pfad zur .npz-Datei.
+    Returns:
+        dict: Arrays saison, spieltag, heim, auswaerts, tore_heim und tore_auswaerts
+        je Spiel sowie teams und saisons für die Übersetzung der IDs in Namen.
+    """
+    spalten = _npz_laden(filepath, "ergebnisse")
+    del spalten["art"]
+    return spalten
+
+
+def read_npz_results(filepath):
+    """
+    Liest Spielergebnisse im Spaltenformat ein.
+    Args:
+        filepath (str): Der Pfad zur .npz-Datei.
+    Returns:
+        list of dict: Ergebnisse im Format von read_csv_results. Bei einem Archiv
+        mehrerer Saisons enthält jedes Ergebnis zusätzlich den Schlüssel "Saison".
+    """
+    spalten = read_npz_result_columns(filepath)
+    teams = spalten["teams"].tolist()
+    saisons = spalten["saisons"].tolist()
+    mit_saison = saisons != [""]
+    ergebnisse = []
+    for saison, spieltag, heim, auswaerts, tore_heim, tore_auswaerts in zip(
+        *(
+            spalten[name].tolist()
+            for name in (
+                "saison",
+                "spieltag",
+                "heim",
+                "auswaerts",
+                "tore_heim",
+                "tore_auswaerts",
+            )
+        )
+    ):
+        ergebnis = {
+            "Spieltag": spieltag,
+            "Heim": teams[heim],
+            "Auswaerts": teams[auswaerts],
+            "Tore_Heim": tore_heim,
+            "Tore_Auswaerts": tore_auswaerts,
+        }
+        if mit_saison:
+            ergebnis["Saison"] = saisons[saison]
+        ergebnisse.append(ergebnis)
+    return ergebnisse
+
+
+def convert_csv_to_npz(filepath, target=None, saison=None):
+    """
+    Wandelt eine exportierte CSV-Datei (Tabelle, Paarungen oder Ergebnisse) in das
+    Spaltenformat um. Die Art wird an den Spalten erkannt.
+    Args:
+        filepath (str): Der Pfad zur CSV-Datei.
+        target (str): Zielpfad. Standardmäßig derselbe Pfad mit der Endung .npz.
+        saison (str): Optionale Saison für Ergebnisse.
+    Returns:
+        str: Der Pfad der geschriebenen .npz-Datei.
+    """
+    target = target or os.path.splitext(filepath)[0] + ".npz"
+    with open(filepath, newline="", encoding="utf-8") as f:
+        spalten = next(csv.reader(f), [])
 
-    return normalize_results(raw_results)
+    if "Ergebnisse" in spalten:
+        write_npz_results(target, read_csv_results(filepath), saison)
+    elif "Paarungen" in spalten:
+        write_npz_fixtures(target, read_csv_fixture_data(filepath))
+    elif "Team" in spalten:
+        write_npz_table(target, read_csv_table(filepath))
+    else:
+        raise ValueError(f"Unbekanntes CSV-Format: {filepath}")
+    return target